@@ -0,0 +1,3 @@
+"""
+The benchmark suite of the tui package and the game scenes. Run `python -m benchmarks --help` for usage.
+"""
@@ -0,0 +1,86 @@
+"""
+Runs the benchmark suite.
+Usage: python -m benchmarks [--json=PATH] [--repeat=N] [--backend=styles|list|array|spans|numpy]
+                            [--shared-cache=N] [--filter=TEXT]
+       python -m benchmarks --verify [--filter=TEXT]
+"""
+
+import json
+import platform
+import sys
+
+from benchmarks.runner import run, verify
+from benchmarks.workloads import WORKLOADS
+from tui import RichFormatText
+from tui.controls.__rft_backends import BACKENDS
+
+
+def main(**kwargs):
+    if '--help' in kwargs:
+        print(__doc__.strip())
+        print('  --json=PATH       Writes the results as JSON to PATH, or to stdout if PATH is -.')
+        print('  --repeat=N        Number of timed runs of each workload (default 3).')
+        print('  --backend=NAME    Storage backend of RichFormatText (default ' + RichFormatText.default_backend + ').')
+        print('  --shared-cache=N  Size of the rendered line cache shared by all RichFormatText objects (default 0).')
+        print('  --filter=TEXT     Runs only the workloads whose names contain TEXT.')
+        print('  --verify          Checks that every backend writes byte-identical frames to the \'list\' backend.')
+        return
+
+    if '--backend' in kwargs:
+        if kwargs['--backend'] not in BACKENDS:
+            raise ValueError(f'Unknown backend: {kwargs["--backend"]}')
+        RichFormatText.default_backend = kwargs['--backend']
+    RichFormatText.shared_cache_size = int(kwargs.get('--shared-cache', 0))
+    repeat = int(kwargs.get('--repeat', 3))
+    workloads = {name: workload for name, workload in WORKLOADS.items() if kwargs.get('--filter', '') in name}
+
+    if '--verify' in kwargs:
+        verify_backends(workloads)
+        return
+
+    results = run(workloads, repeat)
+
+    json_path = kwargs.get('--json')
+    if json_path != '-':
+        print(f'{"workload":<32}{"best s":>10}{"frames":>8}{"KiB out":>10}{"peak KiB":>10}')
+        for name, result in results.items():
+            print(f'{name:<32}{result["best_seconds"]:>10.4f}{result["frames_emitted"]:>8}'
+                  f'{result["bytes_emitted"] / 1024:>10.1f}{result["tracemalloc_peak_kib"]:>10.1f}')
+    if json_path is not None:
+        document = json.dumps({
+            'python': platform.python_version(),
+            'backend': RichFormatText.default_backend,
+            'repeat': repeat,
+            'shared_cache_size': RichFormatText.shared_cache_size,
+            'workloads': results,
+        }, indent=2, sort_keys=True)
+        if json_path == '-':
+            print(document)
+        else:
+            with open(json_path, 'w') as file:
+                file.write(document + '\n')
+
+
+def verify_backends(workloads: dict[str, callable]):
+    """
+    Compares the frames written with every backend against the frames written with the 'list' backend, i.e. the
+    golden frames, and exits with status 1 if any differs.
+    """
+    if BACKENDS['numpy'] is BACKENDS['styles']:
+        print('NumPy is not installed, the \'numpy\' backend falls back to \'styles\'.')
+    mismatches = 0
+    for name, digests in verify(workloads, list(BACKENDS)).items():
+        golden = digests.get('list')
+        differing = [backend for backend, digest in digests.items() if digest != golden]
+        mismatches += len(differing)
+        print(f'{name:<32}{"ok" if len(differing) == 0 else "DIFFERS: " + ", ".join(differing)}')
+    if mismatches > 0:
+        sys.exit(1)
+
+
+args = dict()
+for i in range(1, len(sys.argv)):
+    arg = sys.argv[i].split('=')[0]
+    value = sys.argv[i].split('=')[1] if '=' in sys.argv[i] else ''
+    args[arg] = value
+main(**args)
@@ -0,0 +1,245 @@
+"""
+Contains the harness that runs workloads headless and measures them.
+"""
+
+import builtins
+import contextlib
+import functools
+import hashlib
+import io
+import os
+import random
+import statistics
+import tempfile
+import time
+import tracemalloc
+
+import speed_slide
+from speed_slide.__game_consts import _Constants as Constants
+from speed_slide.random_streams import RandomStreams, set_random_streams
+from tui import Scene, Screen, RichFormatText
+from tui.controls.__rft_backends import BACKENDS
+from tui.frame_scheduler import FrameScheduler
+from tui.frame_writer import FrameWriter
+
+
+class Bench(object):
+    """
+    The environment of a workload: a headless screen writing to a null sink, scripted input, no sleeping, and the
+    latencies of the operations being measured.
+    """
+
+    # operations timed at every call, as (owner, attribute, name of the operation)
+    TIMED_OPERATIONS = (
+        (RichFormatText, 'render', 'RichFormatText.render'),
+        (RichFormatText, 'copy_from', 'RichFormatText.copy_from'),
+        (RichFormatText, 'set_format', 'RichFormatText.set_format'),
+        (RichFormatText, '__setitem__', 'RichFormatText.__setitem__'),
+        (Scene, 'render', 'Scene.render'),
+        (Screen, 'print_scene', 'Screen.print_scene'),
+        (Screen, 'transition_into_scene', 'Screen.transition_into_scene'),
+    )
+
+    def __init__(self, null_fd: int):
+        self.frame_writer = FrameWriter(fd=null_fd)
+        self.screen = Screen(Constants.SCREEN_WIDTH, Constants.SCREEN_HEIGHT, frame_writer=self.frame_writer,
+                             frame_scheduler=FrameScheduler())
+        self.samples: dict[str, list[float]] = {}
+        self.inputs: callable = lambda: ''
+
+    def record(self, operation: str, seconds: float):
+        """
+        Records the latency of an operation.
+        """
+        self.samples.setdefault(operation, []).append(seconds)
+
+    @contextlib.contextmanager
+    def measure(self, operation: str):
+        """
+        Measures the latency of the code in the with block as an operation.
+        """
+        start = time.perf_counter()
+        yield
+        self.record(operation, time.perf_counter() - start)
+
+    def timed_frames(self, transition: callable) -> callable:
+        """
+        Wraps a transition generator function, so that generating each frame is measured as 'transition.frame'.
+        """
+        def inner_timed_frames(from_scene: Scene, to_scene: Scene):
+            frames = iter(transition(from_scene, to_scene))
+            while True:
+                start = time.perf_counter()
+                frame = next(frames, None)
+                self.record('transition.frame', time.perf_counter() - start)
+                if frame is None:
+                    return
+                yield frame
+
+        return inner_timed_frames
+
+    def emit(self, rft: RichFormatText):
+        """
+        Writes a RichFormatText as a frame of its own, so that verify() compares it.
+        """
+        self.screen.frame_writer.begin_frame()
+        self.screen.frame_writer.write(str(rft))
+        self.screen.frame_writer.end_frame()
+
+    def set_inputs(self, inputs):
+        """
+        Sets the answers to input(), either as a list of strings or as a function that returns the next answer.
+        """
+        if callable(inputs):
+            self.inputs = inputs
+        else:
+            answers = iter(inputs)
+            self.inputs = lambda: next(answers)
+
+    @contextlib.contextmanager
+    def patched(self, timed: bool):
+        """
+        Patches the environment for running a workload: no sleeping, no frame dropping, scripted input, output to
+        nowhere, and if timed, the latencies of TIMED_OPERATIONS.
+        """
+        originals = [(time, 'sleep', time.sleep), (builtins, 'input', builtins.input),
+                     (Constants, 'ANIMATION_SECONDS_PER_FRAME', Constants.ANIMATION_SECONDS_PER_FRAME),
+                     (Constants, 'TARGET_FPS', Constants.TARGET_FPS), (Constants, 'DEBUG', Constants.DEBUG),
+                     (FrameScheduler.default, 'target_fps', FrameScheduler.default.target_fps)]
+        time.sleep = lambda seconds: None
+        Constants.ANIMATION_SECONDS_PER_FRAME = 0 # every frame of every animation is rendered
+        Constants.TARGET_FPS = FrameScheduler.default.target_fps = None
+        builtins.input = lambda prompt='': self.inputs()
+        if timed:
+            for owner, attribute, operation in Bench.TIMED_OPERATIONS:
+                originals.append((owner, attribute, getattr(owner, attribute)))
+                setattr(owner, attribute, self.__timed(getattr(owner, attribute), operation))
+        try:
+            with contextlib.redirect_stdout(io.StringIO()): # prompts printed by safe_input()
+                yield
+        finally:
+            for owner, attribute, original in reversed(originals):
+                setattr(owner, attribute, original)
+
+    def __timed(self, func: callable, operation: str) -> callable:
+        @functools.wraps(func)
+        def inner_timed(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self.record(operation, time.perf_counter() - start)
+
+        return inner_timed
+
+
+def __reset(seed: int):
+    """
+    Seeds the random module and the random streams of the game, empties the shared line cache of RichFormatText, and
+    drops the screen of the game, so that no run sees the frames of the run before.
+    """
+    speed_slide.set_screen(None)
+    random.seed(seed)
+    set_random_streams(RandomStreams(seed))
+    RichFormatText.clear_shared_cache()
+
+
+def run(workloads: dict[str, callable], repeat: int = 3, seed: int = 0) -> dict:
+    """
+    Runs workloads and measures them.
+    Each workload is run `repeat` times with its operations timed, then once more under tracemalloc.
+    :param workloads: The workloads by name. A workload is a function that takes a Bench.
+    :param repeat: The number of timed runs of each workload.
+    :param seed: The seed of the random module and of the random streams of the game before every run. The shared line
+                 cache of RichFormatText is also emptied before every run.
+    :return: The results by workload name, see summarise().
+    """
+    results = {}
+    null_fd = os.open(os.devnull, os.O_WRONLY)
+    try:
+        for name, workload in workloads.items():
+            samples: dict[str, list[float]] = {}
+            seconds = []
+            bytes_emitted = frames_emitted = 0
+            for _ in range(repeat):
+                __reset(seed)
+                bench = Bench(null_fd)
+                with bench.patched(timed=True):
+                    start = time.perf_counter()
+                    workload(bench)
+                    seconds.append(time.perf_counter() - start)
+                for operation, latencies in bench.samples.items():
+                    samples.setdefault(operation, []).extend(latencies)
+                bytes_emitted, frames_emitted = bench.screen.bytes_written_total, bench.screen.frames_written
+
+            __reset(seed)
+            bench = Bench(null_fd)
+            with bench.patched(timed=False):
+                tracemalloc.start()
+                workload(bench)
+                current, peak = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+
+            results[name] = summarise(seconds, samples, bytes_emitted, frames_emitted, current, peak)
+    finally:
+        os.close(null_fd)
+    return results
+
+
+def verify(workloads: dict[str, callable], backends: list[str], seed: int = 0) -> dict[str, dict[str, str]]:
+    """
+    Runs workloads once with each storage backend of RichFormatText, and digests all the frames each run writes.
+    The frames must be byte-identical whatever the backend, i.e. all digests of a workload must be equal.
+    :param workloads: The workloads by name. A workload named '<name>.<backend>' uses that backend, so it is compared
+                      with '<name>' of the other backends and run only once.
+    :param backends: The backends to compare.
+    :param seed: The seed of the random module and of the random streams of the game before every run.
+    :return: The SHA-256 digests of the frames by workload name (without backend) and backend.
+    """
+    digests = {}
+    default_backend = RichFormatText.default_backend
+    try:
+        for name, workload in workloads.items():
+            prefix, _, suffix = name.rpartition('.')
+            if suffix in BACKENDS:
+                runs = [(prefix, suffix)] if suffix in backends else []
+            else:
+                runs = [(name, backend) for backend in backends]
+
+            for group, backend in runs:
+                RichFormatText.default_backend = backend
+                __reset(seed)
+                with tempfile.TemporaryFile() as file:
+                    bench = Bench(file.fileno())
+                    with bench.patched(timed=False):
+                        workload(bench)
+                    file.seek(0)
+                    digests.setdefault(group, {})[backend] = hashlib.sha256(file.read()).hexdigest()
+    finally:
+        RichFormatText.default_backend = default_backend
+    return digests
+
+
+def summarise(seconds: list[float], samples: dict[str, list[float]], bytes_emitted: int, frames_emitted: int,
+              retained_bytes: int, peak_bytes: int) -> dict:
+    """
+    Summarises the measurements of a workload. Times are in microseconds, apart from the total time of a run.
+    """
+    operations = {}
+    for operation, latencies in sorted(samples.items()):
+        latencies = sorted(latencies)
+        operations[operation] = {
+            'count': len(latencies),
+            'mean_us': round(statistics.fmean(latencies) * 1e6, 1),
+            'p50_us': round(latencies[len(latencies) // 2] * 1e6, 1),
+            'p95_us': round(latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))] * 1e6, 1),
+            'max_us': round(latencies[-1] * 1e6, 1),
+        }
+    return {
+        'best_seconds': round(min(seconds), 6),
+        'bytes_emitted': bytes_emitted,
+        'frames_emitted': frames_emitted,
+        'tracemalloc_peak_kib': round(peak_bytes / 1024, 1),
+        'tracemalloc_retained_kib': round(retained_bytes / 1024, 1),
+        'operations': operations,
+    }
@@ -0,0 +1,238 @@
+"""
+Contains the representative workloads of the benchmark suite. Every workload takes a Bench.
+"""
+
+import speed_slide
+from benchmarks.runner import Bench
+from speed_slide.__game_consts import _Constants as Constants
+from speed_slide.game_scenes import MainGameScene, MainGameMenuScene, HelpScene
+from speed_slide.game_board import GameBoard
+import speed_slide.board_encoding as board_encoding
+from speed_slide.solver import Solver
+from speed_slide.puzzle_generator import generate
+from speed_slide.simulation import POLICIES, play_game
+from tui import RichFormatText, transitions
+from tui.controls.__rft_backends import BACKENDS
+from tui.render_targets import FrameRecorder
+import random
+
+
+WORKLOADS: dict[str, callable] = {}
+
+
+def workload(name: str) -> callable:
+    """
+    Registers a workload under a name.
+    """
+    def inner_workload(func: callable) -> callable:
+        WORKLOADS[name] = func
+        return func
+
+    return inner_workload
+
+
+def __rft_operations(backend: str) -> callable:
+    def inner_rft_operations(bench: Bench):
+        rft = RichFormatText.create_by_size(110, 30, '*', backend=backend)
+        rft.set_random_colours_to_all()
+        overlay = RichFormatText.create_by_size(60, 20, backend=backend)
+        for _ in range(20):
+            rft.render()
+            rft.copy_from(overlay, 5, 25)
+            for y in range(30):
+                rft.set_format(y, slice(10, 50), 31, 44)
+                rft[y] = rft[y]
+        bench.emit(rft)
+
+    return inner_rft_operations
+
+for __backend in BACKENDS:
+    workload(f'rft.{__backend}')(__rft_operations(__backend))
+
+
+def __blit(backend: str, width: int, height: int, repeat: int) -> callable:
+    def inner_blit(bench: Bench):
+        # a canvas, and layers of the same size that are opaque, transparent, and transparent with an opaque window
+        canvas = RichFormatText.create_by_size(width, height, '.', backend=backend)
+        canvas.set_random_colours_to_all()
+        for y in range(0, height, 2):
+            canvas.set_format(y, slice(None), background=40 + y % 8)
+        opaque = RichFormatText.create_by_size(width, height, 'o', backend=backend)
+        transparent = RichFormatText.create_by_size(width, height, 't', backend=backend)
+        mixed = RichFormatText.create_by_size(width, height, 'm', backend=backend)
+        for y in range(height):
+            opaque.set_format(y, slice(None), 37, 44)
+            transparent.set_format(y, slice(None), 31)
+            mixed.set_format(y, slice(width // 5, width - width // 5), 30,
+                             47 if height // 6 <= y < height - height // 6 else None)
+        for _ in range(repeat):
+            for name, layer in (('opaque', opaque), ('transparent', transparent), ('mixed', mixed)):
+                with bench.measure(f'blit.{name}'):
+                    canvas.copy_from(layer)
+                bench.emit(canvas)
+            with bench.measure('blit.unblended'):
+                canvas.copy_from(mixed, blend_background=False)
+            bench.emit(canvas)
+
+    return inner_blit
+
+for __backend in BACKENDS:
+    workload(f'blit.{__backend}')(__blit(__backend, 110, 30, 50))
+for __backend in BACKENDS:
+    workload(f'blit_large.{__backend}')(__blit(__backend, 440, 120, 10))
+
+
+def __main_game(difficulty: int, moves: int) -> callable:
+    def inner_main_game(bench: Bench):
+        scene = MainGameScene(difficulty, 1)
+        bench.screen.transition_into_scene(scene)
+        made_moves = 0
+
+        def next_move() -> str:
+            # slides the first block listed in the footer, e.g. 'You may slide the following blocks:\n  02 04 -- --'
+            nonlocal made_moves
+            made_moves += 1
+            if made_moves > moves:
+                return '/quit'
+            footer = scene.get_control('dw_main').get_control('lbl_footer').text
+            return next(str(int(block)) for block in footer.split('\n')[1].split() if block.isnumeric())
+
+        bench.set_inputs(next_move)
+        bench.screen.play_scene()
+
+    return inner_main_game
+
+for __difficulty in range(3, 7):
+    workload(f'scene.main_game.d{__difficulty}')(__main_game(__difficulty, 20))
+
+
+def __board(size: int, batches: int) -> callable:
+    def inner_board(bench: Bench):
+        # slides blocks next to the empty block in batches of 1000, as shuffles and solvers do
+        board = GameBoard(size)
+        for batch in range(batches):
+            with bench.measure('GameBoard.slide x1000'):
+                for i in range(1000):
+                    board.slide(board.adjacent[(batch + i) % len(board.adjacent)])
+        bench.emit(RichFormatText(' '.join(str(tile) for tile in board.tiles)))
+
+    return inner_board
+
+for __size in range(3, 7):
+    workload(f'board.d{__size}')(__board(__size, 50))
+
+
+def __state_keys(representation: str, size: int, batches: int) -> callable:
+    def inner_state_keys(bench: Bench):
+        # a random walk that remembers every board it has visited, as replay deduplication and searches do
+        board = GameBoard(size)
+        cells = {(index % size, index // size): tile for index, tile in enumerate(board.tiles)} # the former dict form
+        key, empty = board.key, board.empty_index
+        visited = set()
+        for _ in range(batches):
+            with bench.measure('state_key.slide_and_visit x1000'):
+                for _ in range(1000):
+                    number = random.choice(board.adjacent)
+                    index = board.positions[number]
+                    board.slide(number)
+                    if representation == 'dict':
+                        cells[(index % size, index // size)], cells[(empty % size, empty // size)] = 0, number
+                        visited.add(frozenset(cells.items()))
+                    elif representation == 'tuple':
+                        visited.add(tuple(board.tiles))
+                    else:
+                        key = board_encoding.slide(key, size, empty, index)
+                        visited.add(key)
+                    empty = index
+        bench.emit(RichFormatText(f'{len(visited)} boards visited'))
+
+    return inner_state_keys
+
+for __representation in ('dict', 'tuple', 'packed'):
+    workload(f'state_key.{__representation}')(__state_keys(__representation, 4, 20))
+
+
+def __solver(size: int, boards: int) -> callable:
+    def inner_solver(bench: Bench):
+        # boards shuffled the way MainGameScene shuffles them, by size ** 3 random slides
+        solver = Solver(size)
+        for _ in range(boards):
+            board = GameBoard(size)
+            for _ in range(size ** 3):
+                board.slide(random.choice(board.adjacent))
+            with bench.measure('Solver.solve'):
+                solution = solver.solve(board)
+            bench.emit(RichFormatText(' '.join(str(move) for move in solution.moves)))
+
+    return inner_solver
+
+for __size in range(3, 6): # 6x6 boards take seconds each
+    workload(f'solver.d{__size}')(__solver(__size, 5))
+
+
+def __puzzle(size: int, puzzles: int) -> callable:
+    def inner_puzzle(bench: Bench):
+        for _ in range(puzzles):
+            with bench.measure('generate'):
+                puzzle = generate(size)
+            bench.emit(RichFormatText(' '.join(str(tile) for tile in puzzle.tiles)))
+
+    return inner_puzzle
+
+for __size in range(3, 6): # 6x6 puzzles take up to seconds each
+    workload(f'puzzle.d{__size}')(__puzzle(__size, 5))
+
+
+def __simulation(policy: str, games: int) -> callable:
+    def inner_simulation(bench: Bench):
+        # whole games of at most 3 levels, on puzzles generated for every level as in the game
+        for game in range(games):
+            with bench.measure('play_game'):
+                score, levels, difficulty = play_game(POLICIES[policy], random.getrandbits(64), 3)
+            bench.emit(RichFormatText(f'{score} {levels} {difficulty}'))
+
+    return inner_simulation
+
+for __policy in ('random', 'greedy'):
+    workload(f'simulation.{__policy}')(__simulation(__policy, 100))
+
+
+@workload('scene.help')
+def __help(bench: Bench):
+    bench.screen.transition_into_scene(HelpScene())
+    bench.set_inputs(['n', 'n', 'n', 'n', 'n', 'p', 'p', 'x', 'q'])
+    bench.screen.play_scene()
+
+
+@workload('scene.main_menu')
+def __main_menu(bench: Bench):
+    bench.screen.transition_into_scene(MainGameMenuScene())
+    bench.set_inputs(['x', '', 'H'])
+    bench.screen.play_scene()
+
+
+def __transition(transition: callable) -> callable:
+    def inner_transition(bench: Bench):
+        bench.screen.transition_into_scene(MainGameMenuScene())
+        bench.screen.transition_into_scene(MainGameScene(4, 1), bench.timed_frames(transition), 0)
+
+    return inner_transition
+
+for __transition_func in transitions.get_all(200):
+    workload(f'transition.{__transition_func.__qualname__.split(".")[0]}')(__transition(__transition_func))
+
+
+@workload('session')
+def __session(bench: Bench):
+    # a whole game in debug mode: the help, the about page, and three levels passed, repeated and surrendered
+    answers = iter(['x', '', 'H', 'n', 'n', 'p', 'n', 'n', 'n', 'q', 'A', '', 'N', 'abc', '', '99', '', '/pass-b', '',
+                    '/pass-a', '', '/surrender', '', 'Q'])
+    bench.set_inputs(lambda: next(answers, 'Q'))
+
+    recorder = FrameRecorder(None, Constants.SCREEN_WIDTH, Constants.SCREEN_HEIGHT + 2, target=bench.frame_writer)
+    bench.screen.frame_writer = recorder
+    speed_slide.set_screen(bench.screen) # the game renders on the fresh screen of this run
+    speed_slide.main(**{'--debug': ''})
+    for _, seconds_building, seconds_presenting, _ in recorder.frame_stats:
+        bench.record('frame.build', seconds_building)
+        bench.record('frame.present', seconds_presenting)
@@ -7,6 +7,8 @@ class _Constants:
     ### Sort items alphabetically ###
     ANIMATION_SECONDS_PER_FRAME = 0.02
     DEBUG = False
+    HINT_MAX_NODES = 100000 # nodes the solver may expand for a hint, see speed_slide.solver
     SCREEN_HEIGHT = 30
     SCREEN_WIDTH = 110
+    TARGET_FPS = 50 # maximum frames per second of animations, see FrameScheduler
     VERSION_STRING = '1.2.1 Build 241026'
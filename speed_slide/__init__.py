@@ -1,10 +1,41 @@
 from tui import Screen
+from tui.screen import OutputModes
+from tui.frame_scheduler import FrameScheduler
+from tui.render_targets import NullTarget, FrameRecorder
+from tui.keyboard import KeyboardReader
 import tui.transitions as transitions
 from speed_slide.__game_consts import _Constants as Constants
 from speed_slide.game_scenes import *
+from speed_slide.io import set_keyboard, get_keyboard
+from speed_slide.puzzle_generator import Puzzle, PuzzlePool, shutdown_now
+from speed_slide.level_prefetcher import LevelPrefetcher
+from speed_slide.random_streams import RandomStreams, set_random_streams, cosmetic, gameplay
 from tui.controls import TxtLabel
+import concurrent.futures
+import threading
 
-__screen = Screen(Constants.SCREEN_WIDTH, Constants.SCREEN_HEIGHT)
+__screen: Screen | None = None # created on first use, so that importing the game writes nothing to the terminal
+__puzzle_pool: PuzzlePool | None = None
+__puzzle_executor: concurrent.futures.ProcessPoolExecutor | None = None # started when the pool is first refilled
+__puzzle_lock = threading.Lock()
+__seeded = False # whether the game was given a seed, in which case puzzles are not taken from the pool
+
+def get_screen() -> Screen:
+    """
+    Gets the screen the game is rendered on, e.g. to change its render target. The screen is created, and its blank
+    scene drawn, on the first call.
+    """
+    global __screen
+    if __screen is None:
+        __screen = Screen(Constants.SCREEN_WIDTH, Constants.SCREEN_HEIGHT)
+    return __screen
+
+def set_screen(screen: Screen | None):
+    """
+    Sets the screen the game is rendered on, e.g. a headless one. If None, get_screen() creates a new one.
+    """
+    global __screen
+    __screen = screen
 
 def __get_arg(args: dict[str, str], keys: list[str], value_type: type, default_value):
     """
@@ -22,41 +53,74 @@ def __get_arg(args: dict[str, str], keys: list[str], value_type: type, default_v
     return value_type(value)
 
 def __handle_launch_options(args: dict[str, str]):
+    global __seeded
+
     # debug mode
     Constants.DEBUG = __get_arg(args, ['--debug'], bool, False)
 
+    # random options: the same seed and input play the same game with the same animations
+    __seeded = args.get('--seed', '') != ''
+    set_random_streams(RandomStreams(int(args['--seed']) if __seeded else None))
+
     # graphics options
     match __get_arg(args, ['--graphics-mode', '-g'], str, 'normal'):
         case 'normal':
             pass
         case 'performant':
-            Constants.ANIMATION_SECONDS_PER_FRAME = 0.06
+            Constants.TARGET_FPS = 15 # animations take as long, but fewer frames are rendered
+    FrameScheduler.default.target_fps = Constants.TARGET_FPS
+
+    # output options
+    screen = get_screen()
+    match __get_arg(args, ['--output-mode', '-o'], str, OutputModes.DIFF):
+        case OutputModes.DIFF:
+            screen.output_mode = OutputModes.DIFF
+        case OutputModes.FULL_REDRAW:
+            screen.output_mode = OutputModes.FULL_REDRAW
+
+    # render target options
+    if __get_arg(args, ['--headless'], bool, False):
+        screen.frame_writer = NullTarget()
+    if args.get('--record', '') != '':
+        # a full frame is the screen, the line break before it and the cursor line after it
+        screen.frame_writer = FrameRecorder(args['--record'], Constants.SCREEN_WIDTH, Constants.SCREEN_HEIGHT + 2,
+                                            target=screen.frame_writer)
+
+    # input options
+    match __get_arg(args, ['--input-mode', '-i'], str, 'line'):
+        case 'line':
+            set_keyboard(None)
+        case 'raw':
+            # keys are read as they are pressed, falling back to line input if the input is not a terminal
+            set_keyboard(KeyboardReader() if KeyboardReader.is_supported() else None)
 
 def __menu():
-    __screen.transition_into_scene(MainGameMenuScene(), transitions.get_random(200), Constants.ANIMATION_SECONDS_PER_FRAME)
-    return __screen.play_scene()
+    get_screen().transition_into_scene(MainGameMenuScene(), transitions.get_random(200, cosmetic()), Constants.ANIMATION_SECONDS_PER_FRAME)
+    return get_screen().play_scene()
 
 def __title():
-    __screen.transition_into_scene(TitleScene(), time_per_frame=Constants.ANIMATION_SECONDS_PER_FRAME)
-    __screen.play_scene()
+    get_screen().transition_into_scene(TitleScene(), time_per_frame=Constants.ANIMATION_SECONDS_PER_FRAME)
+    get_screen().play_scene()
 
 def __about():
-    __screen.transition_into_scene(AboutScene(), transitions.scatter(200), Constants.ANIMATION_SECONDS_PER_FRAME)
-    __screen.play_scene()
+    get_screen().transition_into_scene(AboutScene(), transitions.scatter(200, cosmetic()), Constants.ANIMATION_SECONDS_PER_FRAME)
+    get_screen().play_scene()
 
 def __start_new_game():
     difficulty = 3
     attempt = 1
     total_score = 0
+    prefetcher = LevelPrefetcher(__take_puzzle, gameplay())
 
     while True:
-        __screen.transition_into_scene(GameLevelTitleScene(difficulty, attempt, total_score), transitions.scatter(200), Constants.ANIMATION_SECONDS_PER_FRAME)
-        lbl_road: TxtLabel = __screen.play_scene() # the control is reused in the next scene
+        prefetcher.prefetch(difficulty) # the level is prepared while its title is shown
+        get_screen().transition_into_scene(GameLevelTitleScene(difficulty, attempt, total_score), transitions.scatter(200, cosmetic()), Constants.ANIMATION_SECONDS_PER_FRAME)
+        lbl_road: TxtLabel = get_screen().play_scene() # the control is reused in the next scene
 
-        main_scene = MainGameScene(difficulty, attempt)
+        main_scene = MainGameScene(difficulty, attempt, prefetcher.get(difficulty))
         main_scene.add_control_at(lbl_road, lbl_road.x_coord, lbl_road.y_coord)
-        __screen.transition_into_scene(main_scene, transitions.slide_from_right, Constants.ANIMATION_SECONDS_PER_FRAME)
-        result, awards = __screen.play_scene() # refer to docstring of MainGameScene.play() for the return values
+        get_screen().transition_into_scene(main_scene, transitions.slide_from_right, Constants.ANIMATION_SECONDS_PER_FRAME)
+        result, awards = get_screen().play_scene() # refer to docstring of MainGameScene.play() for the return values
 
         if result == -1:
             break # stop immediately
@@ -68,28 +132,83 @@ def __start_new_game():
             attempt += 1
 
         if result == 0 or result == 1:
+            prefetcher.prefetch(difficulty) # the next level is prepared while the summary is shown
             summary_scene = LevelSummaryScene(total_score, awards, result == 0, difficulty == 6)
             summary_scene.add_control_at(lbl_road, lbl_road.x_coord, lbl_road.y_coord)
-            __screen.transition_into_scene(summary_scene, transitions.slide_from_right, Constants.ANIMATION_SECONDS_PER_FRAME)
-            total_score = __screen.play_scene() # LevelSummaryScene.play() returns the new total score
+            get_screen().transition_into_scene(summary_scene, transitions.slide_from_right, Constants.ANIMATION_SECONDS_PER_FRAME)
+            total_score = get_screen().play_scene() # LevelSummaryScene.play() returns the new total score
 
         if result == 2:
-            __screen.transition_into_scene(GameOverScene(total_score), transitions.slide_from_right, Constants.ANIMATION_SECONDS_PER_FRAME)
-            __screen.play_scene()
+            get_screen().transition_into_scene(GameOverScene(total_score), transitions.slide_from_right, Constants.ANIMATION_SECONDS_PER_FRAME)
+            get_screen().play_scene()
             break
 
+def __take_puzzle(difficulty: int) -> Puzzle | None:
+    """
+    Takes a ready-made puzzle from the pool and refills the pool in the background.
+    :return: The puzzle, or None if the pool has run out, in which case one is generated.
+    """
+    if __puzzle_pool is None or Constants.DEBUG: # puzzles are 3 moves away in debug mode
+        return None
+    puzzle = __puzzle_pool.take(difficulty)
+    __refill_puzzle_pool([difficulty])
+    return puzzle
+
+def __refill_puzzle_pool(sizes: list[int] | None = None):
+    """
+    Refills the pool in background processes, which are only started once a difficulty is below capacity.
+    """
+    global __puzzle_executor
+    with __puzzle_lock: # puzzles are taken by the thread of the level prefetcher
+        if __puzzle_pool is None or __puzzle_pool.missing(sizes) == 0:
+            return
+        if __puzzle_executor is None:
+            __puzzle_executor = concurrent.futures.ProcessPoolExecutor()
+        __puzzle_pool.refill(__puzzle_executor, sizes)
+
+def __start_puzzle_pool():
+    global __puzzle_pool
+    __puzzle_pool = PuzzlePool()
+    __refill_puzzle_pool()
+
+def __stop_puzzle_pool():
+    global __puzzle_pool, __puzzle_executor
+    with __puzzle_lock:
+        if __puzzle_executor is not None:
+            shutdown_now(__puzzle_executor) # puzzles still being generated are dropped, so exiting never waits for them
+        pool, __puzzle_pool, __puzzle_executor = __puzzle_pool, None, None
+    try:
+        pool.save()
+    except OSError:
+        pass # the pool is refilled next time
+
 def __help():
-    __screen.transition_into_scene(HelpScene(), transitions.get_random(200), Constants.ANIMATION_SECONDS_PER_FRAME)
-    __screen.play_scene()
+    get_screen().transition_into_scene(HelpScene(), transitions.get_random(200, cosmetic()), Constants.ANIMATION_SECONDS_PER_FRAME)
+    get_screen().play_scene()
 
 def __goodbye():
-    __screen.transition_into_scene(GoodbyeScene(), transitions.scatter(200), Constants.ANIMATION_SECONDS_PER_FRAME)
-    __screen.play_scene()
+    get_screen().transition_into_scene(GoodbyeScene(), transitions.scatter(200, cosmetic()), Constants.ANIMATION_SECONDS_PER_FRAME)
+    get_screen().play_scene()
 
 def main(**kwargs):
 
     __handle_launch_options(kwargs)
-
+    keyboard = get_keyboard()
+    if keyboard is not None:
+        keyboard.start()
+    if not Constants.DEBUG and not __seeded:
+        __start_puzzle_pool()
+    try:
+        __play()
+    finally:
+        if keyboard is not None:
+            keyboard.stop() # restores the terminal, even if interrupted
+        if __puzzle_pool is not None:
+            __stop_puzzle_pool()
+        if isinstance(get_screen().frame_writer, FrameRecorder):
+            get_screen().frame_writer.close() # the recording is complete even if the game is interrupted
+
+def __play():
     __title()
 
     while True:
@@ -105,5 +224,5 @@ def main(**kwargs):
             __about()
 
     __goodbye()
-    __screen.transition_into_blank_scene(transitions.scatter(200), Constants.ANIMATION_SECONDS_PER_FRAME)
-    __screen.clear_screen()
+    get_screen().transition_into_blank_scene(transitions.scatter(200, cosmetic()), Constants.ANIMATION_SECONDS_PER_FRAME)
+    get_screen().clear_screen()
@@ -0,0 +1,107 @@
+"""
+Contains the compact encodings of game boards, used as immutable keys by solvers, caches and replay deduplication.
+A board of size N is packed into a single int, holding the tile at index i (y * N + x) in bits
+[i * b, (i + 1) * b), where b is the number of bits of N*N - 1, i.e. 4 bits for 3x3 and 4x4, 5 for 5x5 and 6 for 6x6.
+The empty block is 0, so its bits are always clear.
+"""
+
+import math
+
+
+def bits_per_tile(size: int) -> int:
+    """
+    Gets the number of bits a tile takes in the packed form of a board of the given size.
+    """
+    return max(1, (size * size - 1).bit_length())
+
+def pack(tiles: list[int], size: int) -> int:
+    """
+    Packs the tiles of a board into an int.
+    :param tiles: The tile at every index, e.g. GameBoard.tiles.
+    :param size: The size of the board.
+    """
+    bits = bits_per_tile(size)
+    key = 0
+    for tile in reversed(tiles):
+        key = (key << bits) | tile
+    return key
+
+def unpack(key: int, size: int) -> list[int]:
+    """
+    Unpacks an int packed by pack() into the tile at every index.
+    """
+    bits = bits_per_tile(size)
+    mask = (1 << bits) - 1
+    return [(key >> (index * bits)) & mask for index in range(size * size)]
+
+def tile_at(key: int, size: int, index: int) -> int:
+    """
+    Gets the tile at an index of a packed board.
+    """
+    bits = bits_per_tile(size)
+    return (key >> (index * bits)) & ((1 << bits) - 1)
+
+def empty_index(key: int, size: int) -> int:
+    """
+    Finds the index of the empty block of a packed board. Solvers should keep track of it instead, see slide().
+    """
+    bits = bits_per_tile(size)
+    mask = (1 << bits) - 1
+    for index in range(size * size):
+        if (key >> (index * bits)) & mask == 0:
+            return index
+    raise ValueError('The packed board has no empty block.')
+
+def slide(key: int, size: int, empty: int, index: int) -> int:
+    """
+    Slides the tile at an index into the empty block of a packed board. Validity of the move is not checked.
+    :param key: The packed board.
+    :param size: The size of the board.
+    :param empty: The index of the empty block, which becomes the index of the tile.
+    :param index: The index of the tile, which becomes the empty block.
+    :return: The packed board after the slide.
+    """
+    bits = bits_per_tile(size)
+    tile = (key >> (index * bits)) & ((1 << bits) - 1)
+    # the bits of the empty block are clear, so the tile is moved by a subtraction and an addition
+    return key - (tile << (index * bits)) + (tile << (empty * bits))
+
+def to_bytes(key: int, size: int) -> bytes:
+    """
+    Gets the bytes (little-endian) of a packed board, e.g. for writing it to a file. Boards of the same size always
+    take the same number of bytes.
+    """
+    return key.to_bytes((size * size * bits_per_tile(size) + 7) // 8, 'little')
+
+def from_bytes(data: bytes) -> int:
+    """
+    Gets the packed board from the bytes given by to_bytes().
+    """
+    return int.from_bytes(data, 'little')
+
+def rank(tiles: list[int]) -> int:
+    """
+    Gets the index of a board among all permutations of its tiles in lexicographic order, from 0 to (N*N)! - 1,
+    e.g. for indexing tables of boards densely.
+    """
+    remaining = list(range(len(tiles)))
+    result = 0
+    for position, tile in enumerate(tiles):
+        smaller = remaining.index(tile) # the number of unused tiles smaller than this one
+        remaining.pop(smaller)
+        result += smaller * math.factorial(len(tiles) - 1 - position)
+    return result
+
+def unrank(index: int, size: int) -> list[int]:
+    """
+    Gets the tiles of the board with an index given by rank().
+    """
+    count = size * size
+    if not 0 <= index < math.factorial(count):
+        raise ValueError(f'The index must be from 0 to {count}! - 1.')
+    remaining = list(range(count))
+    tiles = []
+    for position in range(count):
+        smaller, index = divmod(index, math.factorial(count - 1 - position))
+        tiles.append(remaining.pop(smaller))
+    return tiles
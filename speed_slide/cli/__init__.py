@@ -0,0 +1,5 @@
+"""
+Contains the command line tools of the game, e.g. python -m speed_slide.cli.pattern_database build.
+The tools are kept apart from the modules they use, which the speed_slide package imports, so that running one with
+python -m does not import its module a second time.
+"""
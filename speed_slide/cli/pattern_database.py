@@ -0,0 +1,29 @@
+"""
+Builds the additive pattern databases of the solver, see speed_slide.pattern_database.
+
+Usage: python -m speed_slide.cli.pattern_database build [--size=N] [--processes=N] [--cache-dir=PATH]
+  --size=N         The size of the boards, 4 or 5 (default 4). Other sizes need patterns given in code.
+  --processes=N    The number of databases built at the same time (default 1).
+  --cache-dir=PATH The directory the databases are written to (default ~/.cache/speed_slide/pattern_databases, or
+                   under $XDG_CACHE_HOME if set).
+"""
+
+import sys
+
+from speed_slide.pattern_database import PARTITIONS, build_all
+
+
+def __main(args: list[str]):
+    if len(args) == 0 or args[0] != 'build':
+        print(__doc__.strip())
+        return
+    options = dict(arg.split('=', 1) if '=' in arg else (arg, '') for arg in args[1:])
+    size = int(options.get('--size', 4))
+    if size not in PARTITIONS:
+        print(f'There is no default partition of {size}x{size} boards.')
+        sys.exit(2)
+    build_all(size, int(options.get('--processes', 1)), options.get('--cache-dir'))
+
+
+if __name__ == '__main__':
+    __main(sys.argv[1:])
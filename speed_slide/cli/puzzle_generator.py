@@ -0,0 +1,32 @@
+"""
+Fills the pool of ready-made puzzles of the game, see speed_slide.puzzle_generator.
+
+Usage: python -m speed_slide.cli.puzzle_generator fill [--count=N] [--processes=N] [--path=PATH]
+  --count=N      The number of puzzles kept ready for every difficulty (default 8).
+  --processes=N  The number of processes generating puzzles (default: the number of CPUs).
+  --path=PATH    The file the pool is kept in (default ~/.cache/speed_slide/puzzles/pool.json).
+"""
+
+import concurrent.futures
+import sys
+
+from speed_slide.puzzle_generator import DISTANCES, PuzzlePool
+
+
+def __main(args: list[str]):
+    if len(args) == 0 or args[0] != 'fill':
+        print(__doc__.strip())
+        return
+    options = dict(arg.split('=', 1) if '=' in arg else (arg, '') for arg in args[1:])
+    pool = PuzzlePool(options.get('--path'), int(options.get('--count', 8)))
+    processes = int(options['--processes']) if '--processes' in options else None
+    with concurrent.futures.ProcessPoolExecutor(processes) as executor:
+        pool.refill(executor)
+    pool.save()
+    for size in DISTANCES:
+        print(f'{size}x{size}: {pool.count(size)} puzzles, distances '
+              f'{", ".join(str(puzzle.distance) for puzzle in pool.puzzles[size])}')
+
+
+if __name__ == '__main__':
+    __main(sys.argv[1:])
@@ -0,0 +1,53 @@
+"""
+Plays simulated games with speed_slide.simulation and reports the distribution of their scores.
+
+Usage: python -m speed_slide.cli.simulation [--games=N] [--policy=NAME] [--levels=N] [--processes=N] [--seed=N] [--pool]
+  --games=N      The number of games played (default 1000).
+  --policy=NAME  The bot playing: random, greedy or solver (default greedy).
+  --levels=N     The maximum number of levels of a game (default 10).
+  --processes=N  The number of processes playing (default: the number of CPUs).
+  --seed=N       The seed of the first game; game i uses seed + i (default 0).
+  --pool         Picks the puzzles from the puzzle pool of the game instead of generating them, which is far faster.
+                 Difficulties missing from the pool are still generated.
+"""
+
+import statistics
+import sys
+import time
+
+from speed_slide.puzzle_generator import PuzzlePool
+from speed_slide.simulation import simulate
+
+
+def __main(args: list[str]):
+    options = dict(arg.split('=', 1) if '=' in arg else (arg, '') for arg in args)
+    if '--help' in options:
+        print(__doc__.strip())
+        return
+    games, policy = int(options.get('--games', 1000)), options.get('--policy', 'greedy')
+    processes = int(options['--processes']) if '--processes' in options else None
+    try:
+        start = time.perf_counter()
+        puzzles = PuzzlePool().puzzles if '--pool' in options else None
+        results = simulate(games, policy, int(options.get('--levels', 10)), processes, int(options.get('--seed', 0)),
+                           puzzles)
+        seconds = time.perf_counter() - start
+    except ValueError as error:
+        print(error)
+        sys.exit(2)
+
+    scores = sorted(score for score, _, _ in results)
+    print(f'{games} games by the {policy} bot in {seconds:.2f} s ({games / seconds:.0f} games/s)')
+    print(f'score: mean {statistics.mean(scores):.0f}, median {statistics.median(scores):.0f}, '
+          f'min {scores[0]}, max {scores[-1]}')
+    if games >= 10:
+        deciles = statistics.quantiles(scores, n=10)
+        print('score deciles: ' + ', '.join(f'{decile:.0f}' for decile in deciles))
+    print(f'levels played: mean {statistics.mean(levels for _, levels, _ in results):.1f}')
+    for difficulty in range(3, 7):
+        reached = sum(1 for _, _, reached in results if reached == difficulty)
+        print(f'last level {difficulty}x{difficulty}: {reached} ({reached / games:.0%})')
+
+
+if __name__ == '__main__':
+    __main(sys.argv[1:])
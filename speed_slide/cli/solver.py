@@ -0,0 +1,36 @@
+"""
+Solves a board with speed_slide.solver and prints the solution.
+
+Usage: python -m speed_slide.cli.solver TILES [--weight=W] [--max-nodes=N]
+  TILES  The tiles row by row, separated by commas, with 0 as the empty block, e.g. 1,2,3,4,0,6,7,5,8.
+"""
+
+import sys
+
+from speed_slide.game_board import GameBoard
+from speed_slide.solver import solve
+
+
+def __main(args: list[str]):
+    if len(args) == 0 or args[0] in ('-h', '--help'):
+        print(__doc__.strip())
+        return
+    options = dict(arg.split('=', 1) if '=' in arg else (arg, '') for arg in args[1:])
+    weight = float(options['--weight']) if '--weight' in options else None
+    max_nodes = int(options['--max-nodes']) if '--max-nodes' in options else None
+    try:
+        solution = solve(GameBoard.from_tiles([int(tile) for tile in args[0].split(',')]), weight, max_nodes)
+    except ValueError as e:
+        print(e)
+        sys.exit(2)
+    if solution is None:
+        print(f'No solution found within {max_nodes} nodes.')
+        sys.exit(1)
+    print(' '.join(str(move) for move in solution.moves))
+    print(f'{len(solution)} moves ({"optimal" if solution.optimal else f"at most {solution.weight:g}x optimal"}), '
+          f'{solution.nodes_expanded} nodes expanded in {solution.seconds:.3f} s '
+          f'({solution.nodes_per_second:,.0f} nodes/s)')
+
+
+if __name__ == '__main__':
+    __main(sys.argv[1:])
@@ -0,0 +1,150 @@
+"""
+Contains the game board of the slide puzzle, which the main game scene, solvers and simulations share.
+"""
+
+import speed_slide.board_encoding as board_encoding
+
+
+class GameBoard(object):
+    """
+    An NxN slide puzzle. The tiles are numbered from 1 to N*N - 1, and the empty block is 0.
+    The tiles are stored in a flat list indexed by y * N + x, together with the index of every tile, so that finding a
+    tile, checking whether it can slide, sliding it, and checking whether the board is solved take constant time.
+    """
+
+    # the indices next to every index (left, right, up, down) and the solved tiles, by the size of the board
+    __neighbours_cache: dict[int, tuple[tuple[int, ...], ...]] = {}
+    __goal_cache: dict[int, tuple[int, ...]] = {}
+
+    def __init__(self, size: int):
+        """
+        Creates a solved board.
+        :param size: The number of blocks in a row and in a column.
+        """
+        self.size = size
+        self.tiles: list[int] = list(GameBoard.__goal(size)) # tile at every index
+        self.positions: list[int] = [size * size - 1] + list(range(size * size - 1)) # index of every tile
+        self.tiles_in_place = size * size # the number of indices holding their solved tile, the empty block included
+        self.adjacent: list[int] = [self.tiles[i] for i in GameBoard.neighbours(size)[size * size - 1]]
+
+        # only becomes True when a slide solves the board, which the game may also set directly
+        self.solved = False
+
+    @classmethod
+    def from_tiles(cls, tiles: list[int]) -> 'GameBoard':
+        """
+        Creates a board from the tiles at every index, e.g. [1, 2, 3, 4, 5, 6, 7, 0, 8].
+        """
+        size = round(len(tiles) ** 0.5)
+        if size * size != len(tiles) or sorted(tiles) != list(range(len(tiles))):
+            raise ValueError('The tiles must be a permutation of 0 to N*N - 1.')
+        board = cls(size)
+        board.tiles = list(tiles)
+        for index, tile in enumerate(tiles):
+            board.positions[tile] = index
+        goal = GameBoard.__goal(size)
+        board.tiles_in_place = sum(tile == goal[index] for index, tile in enumerate(tiles))
+        board.adjacent = [tiles[i] for i in GameBoard.neighbours(size)[board.positions[0]]]
+        return board
+
+    @classmethod
+    def from_key(cls, key: int, size: int) -> 'GameBoard':
+        """
+        Creates a board from its packed form, see key.
+        """
+        return cls.from_tiles(board_encoding.unpack(key, size))
+
+    @property
+    def key(self) -> int:
+        """
+        The board packed into an int (see speed_slide.board_encoding), which may be used as an immutable key of
+        dictionaries and sets.
+        """
+        return board_encoding.pack(self.tiles, self.size)
+
+    def copy(self) -> 'GameBoard':
+        """
+        Gets a copy of the board.
+        """
+        board = GameBoard.from_tiles(self.tiles)
+        board.solved = self.solved
+        return board
+
+    @property
+    def is_solved(self) -> bool:
+        """
+        Whether every tile is in place, regardless of the solved flag.
+        """
+        return self.tiles_in_place == self.size * self.size
+
+    @property
+    def empty_index(self) -> int:
+        return self.positions[0]
+
+    def tile_at(self, x: int, y: int) -> int:
+        """
+        Gets the tile at a position, 0 if the block is empty.
+        """
+        return self.tiles[y * self.size + x]
+
+    def position_of(self, number: int) -> tuple[int, int]:
+        """
+        Gets the position (x, y) of a tile.
+        """
+        y, x = divmod(self.positions[number], self.size)
+        return x, y
+
+    def is_adjacent(self, number: int) -> bool:
+        """
+        Whether a tile is next to the empty block, i.e. whether it can slide.
+        """
+        return 1 <= number < self.size * self.size and \
+            self.positions[number] in GameBoard.neighbours(self.size)[self.positions[0]]
+
+    def slide(self, number: int):
+        """
+        Slides the block with the specified number.
+        Validity of move should be checked before calling this method.
+        """
+        tiles, positions, goal = self.tiles, self.positions, GameBoard.__goal(self.size)
+        index, empty_index = positions[number], positions[0]
+
+        # only the two swapped indices may change whether they hold their solved tile
+        self.tiles_in_place += ((goal[empty_index] == number) - (goal[index] == number)
+                                + (goal[index] == 0) - (goal[empty_index] == 0))
+        tiles[index], tiles[empty_index] = 0, number
+        positions[0], positions[number] = index, empty_index
+
+        self.adjacent = [tiles[i] for i in GameBoard.neighbours(self.size)[index]]
+        if self.tiles_in_place == self.size * self.size:
+            self.solved = True
+
+    @classmethod
+    def neighbours(cls, size: int) -> tuple[tuple[int, ...], ...]:
+        """
+        Gets the indices next to every index of a board of the given size, in the order left, right, up, down.
+        """
+        if size not in cls.__neighbours_cache:
+            neighbours = []
+            for index in range(size * size):
+                y, x = divmod(index, size)
+                neighbours.append(tuple(y * size + x + dx + dy * size
+                                        for dx, dy in ((-1, 0), (1, 0), (0, -1), (0, 1))
+                                        if 0 <= x + dx < size and 0 <= y + dy < size))
+            cls.__neighbours_cache[size] = tuple(neighbours)
+        return cls.__neighbours_cache[size]
+
+    @classmethod
+    def __goal(cls, size: int) -> tuple[int, ...]:
+        """
+        Gets the tiles of a solved board of the given size.
+        """
+        if size not in cls.__goal_cache:
+            cls.__goal_cache[size] = tuple(range(1, size * size)) + (0,)
+        return cls.__goal_cache[size]
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, GameBoard) and self.tiles == other.tiles
+
+    def __repr__(self) -> str:
+        return f'GameBoard.from_tiles({self.tiles!r})'
@@ -2,7 +2,7 @@ from speed_slide.game_scenes.title_scene import TitleScene
 from speed_slide.game_scenes.main_game_menu_scene import MainGameMenuScene
 from speed_slide.game_scenes.about_scene import AboutScene
 from speed_slide.game_scenes.game_level_title_scene import GameLevelTitleScene
-from speed_slide.game_scenes.main_game_scene import MainGameScene
+from speed_slide.game_scenes.main_game_scene import MainGameScene, PreparedLevel
 from speed_slide.game_scenes.level_summary_scene import LevelSummaryScene
 from speed_slide.game_scenes.game_over_scene import GameOverScene
 from speed_slide.game_scenes.goodbye_scene import GoodbyeScene
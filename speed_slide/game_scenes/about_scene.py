@@ -1,6 +1,6 @@
-import time
 from tui import *
 from tui.controls import *
+from tui.frame_scheduler import FrameScheduler
 from speed_slide.io import safe_input
 from speed_slide.__game_consts import _Constants as Constants
 
@@ -62,20 +62,18 @@ class AboutScene(Scene):
         self.render()
 
         # cards entrance animation
-        for x in range(-81, max(target_x_coords) + 6, 6):
+        for x in FrameScheduler.default.pace(range(-81, max(target_x_coords) + 6, 6), Constants.ANIMATION_SECONDS_PER_FRAME):
             for card, target_x in list(zip(cards, target_x_coords)):
                 card.x_coord = min(x, target_x)
             self.render()
-            time.sleep(Constants.ANIMATION_SECONDS_PER_FRAME)
 
         safe_input(RichFormatText('Press enter to return to the main menu...'))
 
         # cards exit animation
-        for x in range(1, 110 + 6, 6):
+        for x in FrameScheduler.default.pace(range(1, 110 + 6, 6), Constants.ANIMATION_SECONDS_PER_FRAME):
             for card in cards:
                 card.x_coord = card.x_coord if x < card.x_coord else x
             self.render()
-            time.sleep(Constants.ANIMATION_SECONDS_PER_FRAME)
 
         # clear controls
         self.controls.clear()
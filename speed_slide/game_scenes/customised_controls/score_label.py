@@ -1,6 +1,6 @@
-import time
 from tui.controls import Control, TxtLabel
 from tui import ForegroundColours, TextFormats, Scene, RichFormatText
+from tui.frame_scheduler import FrameScheduler
 from speed_slide.__game_consts import _Constants as Constants
 
 
@@ -36,25 +36,20 @@ class ScoreLabel(Control):
         if self.__score == new_score:
             return
 
-        if step == 0:
-            self.__score = new_score
-            self.__render()
-            parent.render() if parent is not None else None
-            screen_painter(parent) if screen_painter is not None and parent is not None else None
-            time.sleep(Constants.ANIMATION_SECONDS_PER_FRAME)
-            return
-
+        # every frame sets the score from scratch, so frames can be dropped by the scheduler, and the last frame,
+        # which is never dropped, is the new score
         step = abs(step)
+        if step == 0:
+            scores = [new_score]
+        else:
+            scores = [*range(self.__score, new_score, step if new_score > self.__score else -step)[1:], new_score]
 
-        for i in range(self.__score, new_score, step if new_score > self.__score else -step):
-            if self.__score < new_score:
-                self.__score = i if i + step <= new_score else new_score
-            else:
-                self.__score = i if i - step >= new_score else new_score
+        for score in FrameScheduler.default.pace(scores, Constants.ANIMATION_SECONDS_PER_FRAME,
+                                                 hold=Constants.ANIMATION_SECONDS_PER_FRAME):
+            self.__score = score
             self.__render()
             parent.render() if parent is not None else None
             screen_painter(parent) if screen_painter is not None and parent is not None else None
-            time.sleep(Constants.ANIMATION_SECONDS_PER_FRAME)
 
     def render(self):
         """
@@ -62,6 +57,12 @@ class ScoreLabel(Control):
         """
         pass
 
+    def is_dirty(self) -> bool:
+        """
+        The label is rendered by itself when its score changes, so render() never has to be called.
+        """
+        return False
+
     def __render(self):
         """
         Internal renderer.
@@ -1,6 +1,7 @@
 import time
 from tui import Scene, ForegroundColours, TextFormats, transitions
 from tui.controls import *
+from tui.frame_scheduler import FrameScheduler
 from speed_slide.__game_consts import _Constants as Constants
 from speed_slide.game_scenes.customised_controls import ScoreLabel
 
@@ -56,16 +57,33 @@ D~~~~~~~~#_/____|____\___
         self.add_control_at(dw_level_title, -lbl_car.width - dw_level_title.width, 12)
         self.add_control_at(lbl_car, -lbl_car.width, 16)
 
-        # car tolls the level title from left to right
-        for x in range(-lbl_car.width - dw_level_title.width, Constants.SCREEN_WIDTH + 6, 6):
+        # car tolls the level title from left to right, stopping with both centred on the screen
+        # the last frame of an animation is never dropped, so the car stops exactly at the centre
+        centre_x = (Constants.SCREEN_WIDTH - dw_level_title.width - lbl_car.width + 1) // 2
+        self.__drive(dw_level_title, lbl_car, self.__positions(-lbl_car.width - dw_level_title.width, centre_x),
+                     hold=Constants.ANIMATION_SECONDS_PER_FRAME)
+
+        step = 0.1919191919 * 10 ** (len(str(self.__total_score)) - 1)
+        lbl_score.animate_change_score(self.__total_score, int(step), self.on_scene_update, self)
+        time.sleep(3)
+
+        # drives on until the level title has left the screen
+        self.__drive(dw_level_title, lbl_car, self.__positions(centre_x, Constants.SCREEN_WIDTH)[1:])
+
+        return self.get_control('lbl_road') # this control is reused in the next scene
+
+    def __drive(self, dw_level_title: DialogueWindow, lbl_car: TxtLabel, positions: list[int], hold: float = 0.0):
+        """
+        Moves the level title and the car behind it through positions of the level title, one frame per position.
+        """
+        for x in FrameScheduler.default.pace(positions, Constants.ANIMATION_SECONDS_PER_FRAME, hold=hold):
             dw_level_title.x_coord = x
             lbl_car.x_coord = x + dw_level_title.width
             self.render()
-            time.sleep(Constants.ANIMATION_SECONDS_PER_FRAME)
-
-            if x == 27: # at centre of the screen
-                step = 0.1919191919 * 10 ** (len(str(self.__total_score)) - 1)
-                lbl_score.animate_change_score(self.__total_score, int(step), self.on_scene_update, self)
-                time.sleep(3)
 
-        return self.get_control('lbl_road') # this control is reused in the next scene
\ No newline at end of file
+    @staticmethod
+    def __positions(start: int, stop: int, step: int = 6) -> list[int]:
+        """
+        Gets the positions from start to stop by step, stop included even if it is not a whole number of steps away.
+        """
+        return [*range(start, stop, step), stop]
@@ -2,6 +2,7 @@ from tui import Scene, ForegroundColours, TextFormats
 from tui.controls import TxtLabel
 from speed_slide.__game_consts import _Constants as Constants
 from speed_slide.game_scenes.customised_controls import ScoreLabel
+from speed_slide.io import wait_for_enter
 import time
 
 
@@ -72,4 +73,4 @@ class GameOverScene(Scene):
         self.controls.append(lbl_continue)
         self.render()
 
-        input()
\ No newline at end of file
+        wait_for_enter()
\ No newline at end of file
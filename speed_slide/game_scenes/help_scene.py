@@ -64,7 +64,8 @@ class HelpScene(Scene):
                                         text="YOU GOTTA BE JOKING! Why would you want to go page -1?!\n\n\n"
                                              "Anyway, here's a hidden trick for you:\n\n"
                                              "Type \'/give-up?\' at the start of a level will give you the solution. "
-                                             "REMEMBER! The solution only works when the board has not been touched.")
+                                             "REMEMBER! The solution only works when the board has not been touched.\n\n"
+                                             "Stuck halfway? Type \'/hint\' and the block to slide next will light up.")
 
                 dw.controls.append(lbl_para1)
             # ================================= START [PAGE 1] ===============================
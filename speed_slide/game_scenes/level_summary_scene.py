@@ -4,6 +4,7 @@ from tui.controls import DialogueWindow, TxtLabel
 from speed_slide.__game_consts import _Constants as Constants
 from speed_slide.game_scenes.customised_controls import ScoreLabel
 import time
+import speed_slide.random_streams as random_streams
 
 
 class LevelSummaryScene(Scene):
@@ -28,7 +29,8 @@ class LevelSummaryScene(Scene):
 
         lbl_congrats = TxtLabel('lbl_congrats', 40, 1, 20, 2, 0,
                                 'CONGRATULATIONS! Let\'s see how you did!')
-        lbl_congrats.formatted_text.set_random_colours_to_all(except_foreground=[ForegroundColours.BLACK, ForegroundColours.WHITE])
+        lbl_congrats.formatted_text.set_random_colours_to_all(except_foreground=[ForegroundColours.BLACK, ForegroundColours.WHITE],
+                                                              rng=random_streams.cosmetic())
 
         lbl_event_name = TxtLabel('lbl_event_name', 30, 3, 11, 4, 0, '',
                                   padding_left=2, padding_right=2, padding_top=1, padding_bottom=1, draw_borders=True,
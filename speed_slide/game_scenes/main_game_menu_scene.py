@@ -3,12 +3,14 @@ from tui import *
 from tui.controls import *
 from speed_slide.io import safe_input, beep
 from speed_slide.__game_consts import _Constants as Constants
+import speed_slide.random_streams as random_streams
 
 class MainGameMenuScene(Scene):
     def __init__(self):
         super().__init__(Constants.SCREEN_WIDTH, Constants.SCREEN_HEIGHT, '*')
 
-        self.background_rft.set_random_colours_to_all(except_foreground=[ForegroundColours.BLACK, ForegroundColours.WHITE])
+        self.background_rft.set_random_colours_to_all(except_foreground=[ForegroundColours.BLACK, ForegroundColours.WHITE],
+                                                      rng=random_streams.cosmetic())
 
         copyright_text = '(C) 2024 HKU ENGG1330 Semester 1 Group 1L3-3. All rights reserved.'
         lbl_copyright = TxtLabel('lbl_copyright', 110, 3, 0, 27, text=f'{copyright_text: ^110}',
@@ -2,35 +2,90 @@ from tui import Scene, ForegroundColours, RichFormatText, TextFormats, Backgroun
 from tui.controls import TxtLabel, DialogueWindow
 from speed_slide.__game_consts import _Constants as Constants
 from speed_slide.io import safe_input, beep
+from speed_slide.game_board import GameBoard
+from speed_slide.solver import Solver
+from speed_slide.puzzle_generator import Puzzle, generate
+from speed_slide.simulation import GameSimulation
+import speed_slide.random_streams as random_streams
 from speed_slide.game_scenes.__random_events_ascii_arts import EventASCIIArts as ASCIIArts
 import random
 import time
 
 
+class PreparedLevel(object):
+    """
+    The puzzle and the simulation of the rules of a level, prepared before the main game scene is created, e.g. in the
+    background by speed_slide.level_prefetcher.LevelPrefetcher while the level title is shown.
+    Nothing is rendered here, as RichFormatText objects share caches that are not thread-safe (e.g. StyleTable): the
+    labels of the blocks are created by the scene, on the game thread.
+    """
+
+    def __init__(self, difficulty: int, puzzle: Puzzle | None = None, rng: random.Random | None = None):
+        """
+        Prepares a level.
+        :param puzzle: The puzzle to play, e.g. taken from a PuzzlePool. Default is None, which generates one.
+        :param rng: The random number generator of the puzzle and the random events. Default is None, which seeds one
+                    from the gameplay stream of speed_slide.random_streams.
+        """
+        rng = rng if rng is not None else random.Random(random_streams.gameplay().getrandbits(64))
+        self.difficulty = difficulty
+        self.puzzle = puzzle if puzzle is not None else generate(difficulty, 3 if Constants.DEBUG else None, rng)
+        self.simulation = GameSimulation()
+        self.simulation.reset(difficulty, rng.getrandbits(64), self.puzzle)
+        self.solution: list[int] = list(self.puzzle.solution)
+
+
 class MainGameScene(Scene):
     """
     The main game scene.
     """
 
-    def __init__(self, difficulty: int, attempt: int):
+    def __init__(self, difficulty: int, attempt: int, level: PreparedLevel | None = None):
+        """
+        Creates the main game scene.
+        :param level: The level to play, prepared beforehand. Default is None, which prepares one.
+        """
         super().__init__(Constants.SCREEN_WIDTH, Constants.SCREEN_HEIGHT)
 
         self.__difficulty = difficulty
         self.__attempt = attempt
+        self.__level = level if level is not None else PreparedLevel(difficulty)
+        if self.__level.difficulty != difficulty:
+            raise ValueError('The level must be prepared for the difficulty of the scene.')
+        self.__simulation = self.__level.simulation # the rules of the level, which the scene renders
 
-        self.__gb = self.__GameBoard(difficulty)
+        self.__gb = GameBoard(difficulty)
 
         # main dialogue window
         dw_main = DialogueWindow('dw_main', Constants.SCREEN_WIDTH - 4, Constants.SCREEN_HEIGHT - 4, 2, 2,
                                  title='', border_colour=ForegroundColours.YELLOW)
         self.show_dialogue(dw_main, None)
 
-        self.__target_moves = random.randint(difficulty ** 2, difficulty ** 3)
-        self.__debug_solution: list[int] = []
-        self.__board_labels: dict[tuple[int, int], TxtLabel] = {}
+        self.__debug_solution: list[int] = self.__level.solution
+        self.__board_labels: dict[tuple[int, int], TxtLabel] = MainGameScene.__create_board_labels(difficulty)
 
         self.render()
 
+    @staticmethod
+    def __create_board_labels(difficulty: int) -> dict[tuple[int, int], TxtLabel]:
+        """
+        Creates the labels of the blocks at every position, showing the solved board.
+        """
+        width, height = Constants.SCREEN_WIDTH - 4, Constants.SCREEN_HEIGHT - 4 # the size of the main dialogue window
+        x_start = (width - 4 - difficulty * 6 - 25 - 1) // 2 + 2 # exclude divider
+        y_start = (height - 4 - difficulty * 3) // 2 + 2
+        labels = {}
+        for index, number in enumerate(GameBoard(difficulty).tiles):
+            y, x = divmod(index, difficulty)
+            lbl_block = TxtLabel(f'lbl_block:{x};{y}', 6, 3, x_start + x * 6, y_start + y * 3,
+                                 text=f'{number:0>2}' if number != 0 else '  ', draw_borders=True,
+                                 border_colour=ForegroundColours.MAGENTA,
+                                 padding_top=1, padding_bottom=1, padding_left=2, padding_right=2)
+            lbl_block.formatted_text.set_format(0, slice(2), lbl_block.border_colour)
+            lbl_block.render() # so that showing the board does not render every block
+            labels[(x, y)] = lbl_block
+        return labels
+
     def play(self):
         """
         Starts the game and returns the game result.
@@ -55,8 +110,8 @@ class MainGameScene(Scene):
          .set_format(0, slice(35), ForegroundColours.MAGENTA, text_format=TextFormats.UNDERLINE_AND_BOLD)
          .set_format(1, slice(13), ForegroundColours.CYAN))
 
-        # generate labels from board
-        self.__update_labels()
+        # show the labels of the board
+        dw_main.controls.extend(list(self.__board_labels.values()))
 
         # divider bar
         lbl_divider = TxtLabel('lbl_divider', 1, dw_main.height - 2, dw_main.width - 2 - 25, 1,
@@ -77,18 +132,8 @@ class MainGameScene(Scene):
                 self.render()
                 time.sleep(Constants.ANIMATION_SECONDS_PER_FRAME)
 
-        # shuffle the game board
-        last_n_moves = [] # stores last n moves to reduce redundant random moves, n = difficulty
-        for _ in range(self.__target_moves if not Constants.DEBUG else 3):
-            while True:
-                move = random.choice(self.__gb.adjacent)
-                if move not in last_n_moves or all(self.__gb.adjacent[i] in last_n_moves for i in range(len(self.__gb.adjacent))):
-                    break
-            self.__gb.slide(move)
-            self.__debug_solution.insert(0, move)
-            last_n_moves.append(move)
-            if len(last_n_moves) > self.__difficulty:
-                last_n_moves.pop(0)
+        # shuffle the game board, which was prepared with the level
+        self.__gb = self.__simulation.state.board
 
         time.sleep(1)
 
@@ -96,33 +141,29 @@ class MainGameScene(Scene):
         for y in range(self.__difficulty):
             for x in range(self.__difficulty):
                 lbl = self.__board_labels[(x, y)]
-                lbl.text = f'{self.__gb.board[(x, y)]:0>2}' if self.__gb.board[(x, y)] != 0 else '  '
+                lbl.text = f'{self.__gb.tile_at(x, y):0>2}' if self.__gb.tile_at(x, y) != 0 else '  '
                 self.render()
                 time.sleep(Constants.ANIMATION_SECONDS_PER_FRAME)
 
         dw_main.controls.append(lbl_footer)
 
-        terminate_signal = False
-
-        moves = 0
-        self.__target_moves = self.__target_moves * 2
-        max_moves = self.__target_moves * 3
+        state = self.__simulation.state
 
         # right hand side info
         lbl_target = TxtLabel('lbl_target', 25, 2, dw_main.width - 25, 2,
-                              text=f'TARGET MOVES\n  {self.__target_moves}')
+                              text=f'TARGET MOVES\n  {state.target_moves}')
         (lbl_target.formatted_text
              .set_format(0, slice(25), ForegroundColours.MAGENTA, text_format=TextFormats.UNDERLINE_AND_BOLD)
              .set_format(0, slice(25), ForegroundColours.MAGENTA))
 
         lbl_max = TxtLabel('lbl_max', 25, 2, dw_main.width - 25, 5,
-                          text=f'MAX MOVES\n  {max_moves}')
+                          text=f'MAX MOVES\n  {state.max_moves}')
         (lbl_max.formatted_text
             .set_format(0, slice(25), ForegroundColours.MAGENTA, text_format=TextFormats.UNDERLINE_AND_BOLD)
             .set_format(0, slice(25), ForegroundColours.MAGENTA))
 
         lbl_moves = TxtLabel('lbl_moves', 25, 2, dw_main.width - 25, 8,
-                             text=f'MOVES\n  {moves}')
+                             text=f'MOVES\n  {state.moves}')
         (lbl_moves.formatted_text
             .set_format(0, slice(25), ForegroundColours.MAGENTA, text_format=TextFormats.UNDERLINE_AND_BOLD)
             .set_format(0, slice(25), ForegroundColours.MAGENTA))
@@ -136,117 +177,93 @@ class MainGameScene(Scene):
 
         dw_main.controls.extend([lbl_target, lbl_max, lbl_moves, lbl_objectives])
 
-        # for random events:
-        blind_event_counter = 0 # max = self.__difficulty - 2
-        blinded_blocks: list[int] = []
-        awards: list[tuple[str, int]] = [] # refer to docstring for awards/penalties
-
         # main game loop
-        while not self.__gb.solved:
+        while not state.done:
             # update footer
             available_options = '  '
             for i in range(4):
                 # display adjacent blocks, with blinded blocks
                 item = (self.__gb.adjacent[i]
-                        if self.__gb.adjacent[i] not in blinded_blocks else '**')\
+                        if self.__gb.adjacent[i] not in state.blinded_blocks else '**')\
                     if i < len(self.__gb.adjacent) else '--'
                 available_options += f'{item:0>2} '
             lbl_footer.text = f'You may slide the following blocks:\n{available_options}'
 
             # update moves
-            lbl_moves.text = f'MOVES\n  {moves}'
+            lbl_moves.text = f'MOVES\n  {state.moves}'
             self.render()
 
-            # random event when target < moves < max
-            if self.__target_moves < moves < max_moves:
-                if random.choices((True, False), weights=(30, 70), k=1)[0]:
-                    event_msg, points_change, event_name = self.__generate_random_event()
-                    if event_msg != 'None' and points_change == 0:
-                        # blinded block event
-                        if blind_event_counter < self.__difficulty - 2:
-                            blind_event_counter += 1
-                            self.__display_random_event((event_msg, points_change))
-                            blinded_blocks.extend(random.choices(range(1, self.__difficulty ** 2), k=2))
-                    elif event_msg != 'None':
-                        # other random events
-                        self.__display_random_event((event_msg, points_change))
-                        awards.append((event_name, points_change))
-
-            self.__update_labels(blinded_blocks)
+            # random event rolled by the last move, when target < moves < max
+            if state.event is not None:
+                self.__display_random_event((state.event[0], state.event[1]))
+                state.event = None
+
+            self.__update_labels(state.blinded_blocks)
 
             # get user input
-            while not terminate_signal and not moves >= max_moves:
+            while True:
                 user_input = safe_input(RichFormatText('Enter the block number to slide: ')
                                         .set_format(0, slice(33), ForegroundColours.WHITE, background=ForegroundColours.MAGENTA))
                 # validate input
                 # match input with commands
                 match user_input.lower():
                     case '/quit':
-                        terminate_signal = True
+                        self.__simulation.quit()
                         break
                     case '/give-up?':
                         lbl_solution = TxtLabel('lbl_solution', 110, 1, 0, 0, 999, auto_size=True,
                                                 text='Never gonna give you up! ANS: ' + ' '.join(str(x) for x in self.__debug_solution))
                         self.add_control_at(lbl_solution, 0, 0)
                         break
+                    case '/hint':
+                        self.__show_hint()
+                        continue
                     case '/pass-b':
                         # test: solves below target
                         if Constants.DEBUG:
-                            self.__gb.solved = True
-                            moves = self.__target_moves - 1
-                            awards.append(('DEBUG PASS BELOW TARGET', 8))
+                            self.__simulation.force(state.target_moves - 1, True, ('DEBUG PASS BELOW TARGET', 8))
                             break
                     case '/pass-a':
                         # test: solves above target
                         if Constants.DEBUG:
-                            self.__gb.solved = True
-                            moves = self.__target_moves + 1
-                            awards.append(('DEBUG PASS ABOVE TARGET', 11))
+                            self.__simulation.force(state.target_moves + 1, True, ('DEBUG PASS ABOVE TARGET', 11))
                             break
                     case '/not-solve-max-moves':
                         # test: moves = max moves and puzzle not solved
                         if Constants.DEBUG:
-                            moves = max_moves
-                            self.__gb.solved = False
+                            self.__simulation.force(state.max_moves, False)
                             break
                     case '/solve-max-moves':
                         # test: moves = max moves and puzzle solved
                         if Constants.DEBUG:
-                            moves = max_moves
-                            self.__gb.solved = True
+                            self.__simulation.force(state.max_moves, True)
                             break
                     case '/surrender':
-                        moves = max_moves + 1
+                        self.__simulation.surrender()
                         break
                 if not str.isnumeric(user_input):
                     self.__display_error('Invalid input! Please enter a number from the available options.')
                     continue
                 user_input = int(user_input)
-                if not 1 <= user_input <= self.__difficulty ** 2 - 1:
-                    self.__display_error('Invalid input! That block doesn\'t exist! Are you having illusions!?')
+                if self.__gb.is_adjacent(user_input):
+                    # highlight selected option
+                    num_x, num_y = self.__gb.position_of(user_input)
+                    lbl = self.__board_labels[(num_x, num_y)]
+                    lbl.formatted_text.set_format(0, slice(2), ForegroundColours.BLACK, BackgroundColours.MAGENTA)
+                    self.render()
+                    time.sleep(0.2)
+                try:
+                    self.__simulation.step(user_input)
+                except ValueError as error:
+                    self.__display_error(str(error))
                     continue
-                if user_input not in self.__gb.adjacent:
-                    self.__display_error('Invalid input! You cannot slide this block to the empty space directly!')
-                    continue
-
-                moves += 1
-                # highlight selected option
-                num_x, num_y = list(self.__gb.board.keys())[list(self.__gb.board.values()).index(user_input)]
-                lbl = self.__board_labels[(num_x, num_y)]
-                lbl.formatted_text.set_format(0, slice(2), ForegroundColours.BLACK, BackgroundColours.MAGENTA)
-                self.render()
-                time.sleep(0.2)
-                self.__gb.slide(user_input)
                 break
 
             # END OF USER INPUT LOOP
 
-            if terminate_signal:
+            if state.result == -1:
                 return -1, None
-            if moves == max_moves:
-                if not self.__gb.solved:
-                    moves += 1 # avoid dead loop
-            if moves > max_moves:
+            if state.result == 2:
                 self.__update_labels(list(range(1, self.__difficulty ** 2)))
                 for label in list(self.__board_labels.values()):
                     label.border_colour = ForegroundColours.RED
@@ -255,80 +272,41 @@ class MainGameScene(Scene):
                 self.render()
                 return 2, None
 
-            if self.__gb.solved:
-                awards.insert(0, ('PUZZLE SOLVED', 1000 * self.__difficulty))
+            if state.result in (0, 1): # the puzzle is solved, within target moves for 0
                 self.__update_labels(None)
                 for label in list(self.__board_labels.values()):
                     label.border_colour = ForegroundColours.GREEN
                     label.formatted_text.set_format(0, slice(2), ForegroundColours.GREEN)
                 self.render()
-            if self.__gb.solved and moves <= self.__target_moves: # within target moves
-                awards.insert(1, ('BELOW TARGET', int((self.__target_moves - moves) * self.__difficulty ** 2) * 100))
-                return 0, awards
-            if self.__gb.solved and moves > self.__target_moves:
-                return 1, awards
+                return state.result, state.awards
 
             # END OF MAIN GAME LOOP
 
     def __update_labels(self, blinded: list[int] | None = None):
         """
-        Create labels representing the game board. Blinded numbers will be displayed as '**'.
+        Updates the labels representing the game board. Blinded numbers will be displayed as '**'.
         """
         blinded = blinded if blinded is not None else []
 
-        # create labels if there isn't any
-        if len(self.__board_labels) == 0:
-            for item in self.__gb.board:
-                x_start = (self.get_control('dw_main').width - 4 - self.__difficulty * 6 - 25 - 1) // 2 + 2 # exclude divider
-                y_start = (self.get_control('dw_main').height - 4 - self.__difficulty * 3) // 2 + 2
-                x, y = item
-                text = f'{self.__gb.board[item]:0>2}' if self.__gb.board[item] not in blinded else '**'
-                lbl_block = TxtLabel(f'lbl_block:{x};{y}', 6, 3, x_start + x * 6, y_start + y * 3,
-                                     text=text, draw_borders=True,
-                                     border_colour=ForegroundColours.MAGENTA,
-                                     padding_top=1, padding_bottom=1, padding_left=2, padding_right=2)
-                lbl_block.formatted_text.set_format(0, slice(2), lbl_block.border_colour)
-                if lbl_block.text == '00':
-                    lbl_block.text = '  '
-                self.__board_labels[item] = lbl_block
-            self.get_control('dw_main').controls.extend(list(self.__board_labels.values()))
-            return
-
-        # update existing
-        for x, y in self.__gb.board:
-            num = self.__gb.board[(x, y)]
+        for index, num in enumerate(self.__gb.tiles):
+            y, x = divmod(index, self.__difficulty)
             lbl = self.__board_labels[(x, y)]
             lbl_text = f'{num:0>2}' if num not in blinded else '**'
             lbl.text = lbl_text if num != 0 else '  '
             lbl.formatted_text.set_format(0, slice(2), ForegroundColours.MAGENTA, BackgroundColours.TRANSPARENT)
         self.render()
 
-    def __generate_random_event(self) -> tuple[str, int, str]:
+    def __show_hint(self):
         """
-        Get a random event (either award or penalties). Higher difficulty level should have larger possibility
-        of awards than of penalties.
-        :return: a rewards tuple
+        Highlights the block to slide next in the shortest solution the solver finds from the current board.
         """
-        events = (
-            ('None', 0, None),
-            ('A witch used a spell on you! Some of the blocks are now hidden from you!', 0, None),
-            ('A golden coin was hidden under the block! You sold it for 100 points!', 100, 'GOLDEN COIN FOUND'),
-            ('An angel blessed you! +500 points!', 500, 'BLESSING FROM ANGEL'),
-            ('A sneaky mouse stole 100 points from you! :-(', -100, 'SNEAKY MOUSE'),
-            ('Bad luck! A witch cursed you! -300 points! @#%$!', -300, 'WITCH CURSE'),
-        )
-        bad_events_weight = self.__difficulty / (self.__difficulty + self.__difficulty ** 2)
-        good_events_weight = 1 - bad_events_weight
-        event_weights = (
-            75, # None
-            5,  # Blinded blocks
-            good_events_weight * 20 * 0.8, # Golden coin
-            good_events_weight * 20 * 0.2, # Angel
-            bad_events_weight * 20 * 0.8, # Mouse
-            bad_events_weight * 20 * 0.2, # Witch
-        )
-        event = random.choices(events, weights=event_weights, k=1)[0]
-        return event
+        solution = Solver(self.__difficulty, max_nodes=Constants.HINT_MAX_NODES).solve(self.__gb)
+        if solution is None or len(solution) == 0:
+            self.__display_error('Even the wisest owl cannot see a way out of this one. Try a few more moves!')
+            return
+        lbl = self.__board_labels[self.__gb.position_of(solution.moves[0])]
+        lbl.formatted_text.set_format(0, slice(2), ForegroundColours.BLACK, BackgroundColours.CYAN)
+        self.render()
 
     def __display_random_event(self, event: tuple[str, int]):
         """
@@ -389,72 +367,3 @@ class MainGameScene(Scene):
         beep()
         self.show_dialogue(dw_error, lambda _: safe_input(RichFormatText('Press enter to dismiss...')
                                                           .set_format(0, slice(None), ForegroundColours.MAGENTA)))
-
-    class __GameBoard:
-        """
-        An internal class for dealing with the game board.
-        """
-
-        def __init__(self, difficulty: int):
-            self.__difficulty = difficulty
-
-            self.board: dict[tuple[int, int], int] = {}
-            counter = 1
-            for y in range(difficulty):
-                for x in range(difficulty):
-                    self.board[(x, y)] = counter
-                    counter += 1
-            # set last block to 0
-            self.board[(difficulty - 1, difficulty - 1)] = 0
-
-            self.adjacent: list[int] = []
-            self.__empty_index = (difficulty - 1, difficulty - 1)
-            self.find_adjacent()
-            self.solved = False
-
-        def slide(self, number: int):
-            """
-            Slides the block with the specified number.
-            Validity of move should be checked before calling this method.
-            """
-            number_index = list(self.board.keys())[list(self.board.values()).index(number)]
-            # swap
-            self.board[number_index], self.board[self.__empty_index] = self.board[self.__empty_index], self.board[number_index]
-            self.find_adjacent()
-            self.__check_if_solved()
-
-        def find_adjacent(self):
-            """
-            Finds the adjacent numbers of the empty block (0), and stores them in self.__adjacent.
-            """
-            self.adjacent.clear()
-            self.__empty_index = list(self.board.keys())[list(self.board.values()).index(0)]
-            empty_x, empty_y = self.__empty_index
-            adjacent_indices = (
-                (empty_x - 1, empty_y), # left
-                (empty_x + 1, empty_y), # right
-                (empty_x, empty_y - 1), # up
-                (empty_x, empty_y + 1), # down
-            )
-            for index in adjacent_indices:
-                value = self.board.get(index, None)
-                if value is None:
-                    continue
-                self.adjacent.append(value)
-
-        def __check_if_solved(self):
-            """
-            Checks if the board has been solved. Result is stored in self.solved.
-            """
-            solved = True
-            counter = 1
-            for y in range(self.__difficulty):
-                for x in range(self.__difficulty):
-                    if x == self.__difficulty - 1 and y == self.__difficulty - 1:
-                        solved = solved and self.board[(x, y)] == 0
-                    else:
-                        solved = solved and self.board[(x, y)] == counter
-                    if not solved:
-                        return
-                    counter += 1
-            self.solved = True
@@ -1,7 +1,9 @@
 from tui import Scene, RichFormatText, ForegroundColours
 from tui.controls import TxtLabel
+from tui.frame_scheduler import FrameScheduler
 from speed_slide.__game_consts import _Constants as Constants
 import time
+import speed_slide.random_streams as random_streams
 
 
 class TitleScene(Scene):
@@ -20,7 +22,7 @@ Y88b.      888    888 888        888        888    888
       "888 888        888        888        888    888 
 Y88b  d88P 888        888        888        888  .d88P
  "Y8888P"  888        8888888888 8888888888 8888888P"  """)
-        lbl_speed.formatted_text.set_random_colours_to_all(except_foreground=except_colours)
+        lbl_speed.formatted_text.set_random_colours_to_all(except_foreground=except_colours, rng=random_streams.cosmetic())
         lbl_slide = TxtLabel('lbl_slide', 56, 8, 0, 0, text=""" .d8888b.  888      8888888 8888888b.  8888888888
 d88P  Y88b 888        888   888  "Y88b 888        
 Y88b.      888        888   888    888 888        
@@ -29,16 +31,16 @@ Y88b.      888        888   888    888 888
       "888 888        888   888    888 888
 Y88b  d88P 888        888   888  .d88P 888
  "Y8888P"  88888888 8888888 8888888P"  88888888888""")
-        lbl_slide.formatted_text.set_random_colours_to_all(except_foreground=except_colours)
+        lbl_slide.formatted_text.set_random_colours_to_all(except_foreground=except_colours, rng=random_streams.cosmetic())
 
         self.add_control_at(lbl_speed, - lbl_speed.width - 1, 5)
         self.add_control_at(lbl_slide, self.width, 15)
 
-        for i in range(-lbl_speed.width - 1, self.width + lbl_slide.width + 1, 10):
+        for i in FrameScheduler.default.pace(range(-lbl_speed.width - 1, self.width + lbl_slide.width + 1, 10),
+                                             Constants.ANIMATION_SECONDS_PER_FRAME):
             lbl_speed.x_coord = i
             lbl_slide.x_coord = self.width - i - lbl_slide.width
             self.render()
-            time.sleep(Constants.ANIMATION_SECONDS_PER_FRAME)
 
         lbl_speed.x_coord = 27 # place at center
         lbl_slide.x_coord = 29
@@ -1,12 +1,35 @@
+import os
 import string
 from tui import *
+from tui.keyboard import KeyboardReader, Keys
 from speed_slide.__game_consts import _Constants as Constants
 
 
-def safe_input(prompt: RichFormatText = RichFormatText('>>> ')):
+__keyboard: KeyboardReader | None = None # None if the input is read line by line with input()
+
+
+def set_keyboard(keyboard: KeyboardReader | None):
+    """
+    Sets the raw-mode keyboard reader safe_input() reads from. If None, safe_input() uses input().
+    """
+    global __keyboard
+    __keyboard = keyboard
+
+def get_keyboard() -> KeyboardReader | None:
+    """
+    Gets the raw-mode keyboard reader safe_input() reads from, None if it uses input().
+    """
+    return __keyboard
+
+
+def safe_input(prompt: RichFormatText = RichFormatText('>>> '), on_idle: callable = None):
     """
     A safe version of the input() function that handles escape sequences properly.
     :param prompt: The prompt to display.
+    :param on_idle: Called repeatedly while waiting for keys, e.g. to advance an animation. Only called if the input
+                    is read from a keyboard reader, see set_keyboard(). It is opt-in, and no scene of the game passes
+                    it, as none changes while waiting for input. A scene update clears the terminal below the scene,
+                    so an on_idle that renders a scene has to print the prompt again.
     :return: User input with only printable ASCII characters.
     """
     new_prompt = prompt
@@ -22,7 +45,8 @@ def safe_input(prompt: RichFormatText = RichFormatText('>>> ')):
         new_prompt.copy_from(prompt, 1, 0, copy_text=False)
 
     print(new_prompt, end='', flush=True)
-    user_in = input()
+    user_in = read_line(__keyboard, on_idle) if __keyboard is not None else input()
+    Screen.notify_external_output() # the prompt and the echoed input may have scrolled the terminal
 
     output = ''
     # keep only printable characters
@@ -32,8 +56,54 @@ def safe_input(prompt: RichFormatText = RichFormatText('>>> ')):
 
     return output
 
+def wait_for_enter():
+    """
+    Waits until Enter is pressed, without a prompt. What is typed before Enter is discarded.
+    """
+    if __keyboard is not None:
+        read_line(__keyboard)
+    else:
+        input()
+    Screen.notify_external_output() # the echoed input may have scrolled the terminal
+
+def read_line(keyboard: KeyboardReader, on_idle: callable = None, idle_interval: float = 0.02) -> str:
+    """
+    Reads a line from a raw-mode keyboard reader until Enter is pressed, echoing what is typed. Only printable ASCII
+    characters are taken, Backspace erases the last one, and Esc erases the whole line. Other keys are ignored.
+    :param keyboard: The running keyboard reader.
+    :param on_idle: Called every idle_interval seconds while no key is pressed.
+    :param idle_interval: The number of seconds between two calls of on_idle.
+    :return: The line, without the line break.
+    """
+    line = ''
+    while True:
+        event = keyboard.get(idle_interval if on_idle is not None else None)
+        if event is None:
+            on_idle()
+        elif event.key == Keys.ENTER:
+            print(flush=True)
+            return line
+        elif event.key == Keys.BACKSPACE and line != '':
+            line = line[:-1]
+            print('\b \b', end='', flush=True)
+        elif event.key == Keys.ESCAPE and line != '':
+            print('\b \b' * len(line), end='', flush=True)
+            line = ''
+        elif event.key == Keys.CHAR and event.char in string.printable and event.char not in '\t\n\r\x0b\x0c':
+            line += event.char
+            print(event.char, end='', flush=True)
+
 def beep():
     """
     Produces a beep sound.
     """
-    print('\a', end='', flush=True)
\ No newline at end of file
+    print('\a', end='', flush=True)
+
+def get_cache_dir(name: str) -> str:
+    """
+    Gets the directory the game caches data in, e.g. pattern databases. It is not created.
+    :param name: The name of the subdirectory.
+    :return: The path of ~/.cache/speed_slide/<name>, or of $XDG_CACHE_HOME/speed_slide/<name> if set.
+    """
+    cache_home = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(cache_home, 'speed_slide', name)
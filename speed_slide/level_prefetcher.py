@@ -0,0 +1,72 @@
+"""
+Contains the prefetcher preparing the next level of the game in the background while the scenes before it play.
+"""
+
+import random
+import threading
+
+from speed_slide.game_scenes.main_game_scene import PreparedLevel
+from speed_slide.puzzle_generator import Puzzle
+
+
+class LevelPrefetcher(object):
+    """
+    Prepares the next level (see PreparedLevel) on a background thread, e.g. while the level title or the level summary
+    is shown, so that the main game scene shows its board without preparing it first.
+    Only one level is prepared at a time: prefetching another difficulty drops the level prepared before.
+    """
+
+    def __init__(self, take_puzzle: callable = None, rng: random.Random | None = None):
+        """
+        Creates a LevelPrefetcher.
+        :param take_puzzle: Called with the difficulty to get a ready-made puzzle, e.g. PuzzlePool.take. It may return
+                            None, in which case a puzzle is generated. Default is None, which always generates one.
+        :param rng: The random number generator seeding every level. Default is None, which uses the random module.
+        """
+        self.__take_puzzle = take_puzzle
+        self.__rng = rng if rng is not None else random
+        self.__lock = threading.Lock()
+        self.__difficulty: int | None = None
+        self.__thread: threading.Thread | None = None
+        self.__level: PreparedLevel | None = None
+
+    def prefetch(self, difficulty: int):
+        """
+        Starts preparing a level in the background, unless it is already being prepared or ready.
+        """
+        with self.__lock:
+            if self.__difficulty == difficulty:
+                return
+            self.__difficulty, self.__level = difficulty, None
+            # the seed is drawn here, so that the levels are the same whenever the thread runs
+            rng = random.Random(self.__rng.getrandbits(64))
+            # a daemon thread does not keep the game running if it quits while a level is prepared
+            self.__thread = threading.Thread(target=self.__prepare, args=(difficulty, rng), daemon=True)
+            self.__thread.start()
+
+    def get(self, difficulty: int) -> PreparedLevel:
+        """
+        Takes the level of a difficulty, waiting for it if it is still being prepared, or preparing it now if it was
+        not prefetched.
+        """
+        with self.__lock:
+            thread = self.__thread if self.__difficulty == difficulty else None
+        if thread is not None:
+            thread.join()
+        with self.__lock:
+            level = self.__level if self.__difficulty == difficulty else None
+            self.__difficulty, self.__thread, self.__level = None, None, None
+        return level if level is not None else self.__create(difficulty, random.Random(self.__rng.getrandbits(64)))
+
+    def __prepare(self, difficulty: int, rng: random.Random):
+        try:
+            level = self.__create(difficulty, rng)
+        except Exception:
+            return # get() prepares the level again and raises the error on the game thread
+        with self.__lock:
+            if self.__difficulty == difficulty:
+                self.__level = level
+
+    def __create(self, difficulty: int, rng: random.Random | None = None) -> PreparedLevel:
+        puzzle: Puzzle | None = self.__take_puzzle(difficulty) if self.__take_puzzle is not None else None
+        return PreparedLevel(difficulty, puzzle, rng)
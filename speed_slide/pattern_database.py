@@ -0,0 +1,231 @@
+"""
+Contains the disjoint additive pattern databases used by the solver as its heuristic for large boards.
+A pattern database stores, for every placement of a group of tiles (the pattern), the number of slides of those tiles
+needed to bring them home, found by a breadth-first search backwards from the solved board. As every move slides one
+tile, the values of disjoint patterns may be added up without overestimating.
+
+The databases are built once into files under a cache directory (see speed_slide.cli.pattern_database), and
+memory-mapped when first used.
+"""
+
+import mmap
+import multiprocessing
+import os
+import time
+
+from speed_slide.game_board import GameBoard
+from speed_slide.io import get_cache_dir
+
+
+# the default partitions of the tiles into disjoint patterns, by the size of the board. Building a database takes memory
+# for (N*N) ** (tiles + 1) states, which limits the patterns to 5 tiles on 4x4 boards and 4 tiles on 5x5 boards
+PARTITIONS: dict[int, tuple[tuple[int, ...], ...]] = {
+    4: ((1, 2, 3, 5, 6), (4, 7, 8, 11, 12), (9, 10, 13, 14, 15)),
+    5: ((1, 2, 6, 7), (3, 4, 8, 9), (5, 10, 15, 20), (11, 12, 16, 17), (13, 14, 18, 19), (21, 22, 23, 24)),
+}
+
+
+def default_cache_dir() -> str:
+    """
+    Gets the directory the pattern databases are stored in by default.
+    """
+    return get_cache_dir('pattern_databases')
+
+
+class PatternDatabase(object):
+    """
+    The numbers of moves of a pattern of tiles to bring them home, from every placement of the tiles.
+    A placement is indexed by the sum of index(tile_i) * (N*N)**i over the i-th tile of the pattern, so that sliding a
+    tile changes the index by a multiplication and an addition.
+    """
+
+    __UNKNOWN = 255 # the value of placements not reached yet while building
+
+    def __init__(self, size: int, pattern: tuple[int, ...], table):
+        """
+        Creates a PatternDatabase. Use build() or load() instead.
+        :param size: The size of the boards.
+        :param pattern: The tiles of the pattern.
+        :param table: The number of moves at every index, e.g. a bytearray or a read-only mmap.
+        """
+        self.size = size
+        self.pattern = pattern
+        self.table = table
+        self.weights = [(size * size) ** slot for slot in range(len(pattern))]
+        self.__weight_of = dict(zip(pattern, self.weights))
+
+    @staticmethod
+    def file_name(size: int, pattern: tuple[int, ...]) -> str:
+        return f'{size}x{size}-{"-".join(str(tile) for tile in pattern)}.pdb'
+
+    @classmethod
+    def load(cls, size: int, pattern: tuple[int, ...], cache_dir: str | None = None) -> 'PatternDatabase | None':
+        """
+        Memory-maps a pattern database built before.
+        :return: The pattern database, or None if it has not been built.
+        """
+        path = os.path.join(cache_dir if cache_dir is not None else default_cache_dir(), cls.file_name(size, pattern))
+        if not os.path.isfile(path) or os.path.getsize(path) != (size * size) ** len(pattern):
+            return None
+        with open(path, 'rb') as file:
+            table = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) # stays valid after the file is closed
+        return cls(size, pattern, table)
+
+    @classmethod
+    def build(cls, size: int, pattern: tuple[int, ...], progress: callable = None) -> 'PatternDatabase':
+        """
+        Builds a pattern database by a breadth-first search from the solved board over the placements of the pattern
+        and the empty block. Only slides of tiles of the pattern count as moves; the empty block passes other tiles
+        for free. The number of moves of a placement is the least over all cells of the empty block.
+        :param progress: Called with (depth, placements reached at the depth, seconds elapsed) after every depth.
+        """
+        cells = size * size
+        neighbours = GameBoard.neighbours(size)
+        weights = [cells ** slot for slot in range(len(pattern))]
+        empty_weight = cells ** len(pattern) # the cell of the empty block is the last digit of a state
+        table = bytearray([PatternDatabase.__UNKNOWN]) * empty_weight
+        expanded = bytearray(cells * empty_weight)
+
+        start = time.perf_counter()
+        placement = sum((tile - 1) * weight for tile, weight in zip(pattern, weights))
+        frontier, depth = [placement + (cells - 1) * empty_weight], 0
+        while len(frontier) > 0:
+            next_frontier, reached = [], 0
+            position = 0
+            while position < len(frontier): # states reached for free are appended to the current depth
+                state = frontier[position]
+                position += 1
+                if expanded[state]: # states may be added more than once before they are expanded
+                    continue
+                expanded[state] = 1
+                empty, placement = divmod(state, empty_weight)
+                if table[placement] == PatternDatabase.__UNKNOWN:
+                    table[placement] = depth
+                    reached += 1
+
+                weight_at, rest = {}, placement
+                for weight in weights:
+                    rest, cell = divmod(rest, cells)
+                    weight_at[cell] = weight
+                for neighbour in neighbours[empty]:
+                    weight = weight_at.get(neighbour)
+                    if weight is None: # another tile slides, which is free
+                        next_state = state + (neighbour - empty) * empty_weight
+                        if not expanded[next_state]:
+                            frontier.append(next_state)
+                    else: # a tile of the pattern slides into the empty block
+                        next_state = placement + (empty - neighbour) * weight + neighbour * empty_weight
+                        if not expanded[next_state]:
+                            next_frontier.append(next_state)
+            if progress is not None:
+                progress(depth, reached, time.perf_counter() - start)
+            frontier, depth = next_frontier, depth + 1
+        return cls(size, pattern, table)
+
+    def save(self, cache_dir: str | None = None):
+        """
+        Writes the pattern database to the cache directory, replacing the file atomically.
+        """
+        cache_dir = cache_dir if cache_dir is not None else default_cache_dir()
+        os.makedirs(cache_dir, exist_ok=True)
+        path = os.path.join(cache_dir, PatternDatabase.file_name(self.size, self.pattern))
+        with open(path + '.tmp', 'wb') as file:
+            file.write(self.table)
+        os.replace(path + '.tmp', path)
+
+    def lookup(self, tiles: list[int]) -> int:
+        """
+        Gets the number of moves of the pattern on a board.
+        """
+        return self.table[self.index_of(tiles)]
+
+    def index_of(self, tiles: list[int]) -> int:
+        """
+        Gets the index of the placement of the pattern on a board.
+        """
+        weight_of = self.__weight_of
+        return sum(weight_of[tile] * index for index, tile in enumerate(tiles) if tile in weight_of)
+
+
+class AdditivePatternDatabases(object):
+    """
+    The heuristic of the solver summing disjoint pattern databases, see speed_slide.solver.Solver. Only the database
+    of the tile slid is looked up again after a slide.
+    """
+
+    def __init__(self, databases: list[PatternDatabase]):
+        tiles = [tile for database in databases for tile in database.pattern]
+        if len(tiles) != len(set(tiles)):
+            raise ValueError('The patterns of additive pattern databases must be disjoint.')
+        self.size = databases[0].size
+        self.databases = databases
+
+        # the database of every tile, and the weight of every tile in the index of its database (0 for other tiles)
+        count = self.size * self.size
+        self.__database_of: list[PatternDatabase | None] = [None] * count
+        self.__weights_of: list[list[int] | None] = [None] * count
+        for database in databases:
+            weights = [0] * count
+            for tile, weight in zip(database.pattern, database.weights):
+                weights[tile] = weight
+            for tile in database.pattern:
+                self.__database_of[tile] = database
+                self.__weights_of[tile] = weights
+
+    @classmethod
+    def load(cls, size: int, cache_dir: str | None = None) -> 'AdditivePatternDatabases | None':
+        """
+        Memory-maps the databases of the default partition of a board size.
+        :return: The heuristic, or None if there is no default partition or it has not been built.
+        """
+        if size not in PARTITIONS:
+            return None
+        databases = [PatternDatabase.load(size, pattern, cache_dir) for pattern in PARTITIONS[size]]
+        return cls(databases) if all(database is not None for database in databases) else None
+
+    def estimate(self, tiles: list[int]) -> int:
+        """
+        Computes the heuristic of a board.
+        """
+        return sum(database.lookup(tiles) for database in self.databases)
+
+    def update(self, tiles: list[int], h: int, tile: int, from_index: int, to_index: int) -> int:
+        """
+        Updates the heuristic of a board after a tile has slid from one index to another (the empty block).
+        :param tiles: The tiles after the slide.
+        :param h: The heuristic before the slide.
+        :return: The heuristic after the slide.
+        """
+        database = self.__database_of[tile]
+        if database is None:
+            return h
+        weights = self.__weights_of[tile]
+        index = sum(weights[other] * cell for cell, other in enumerate(tiles))
+        table = database.table
+        return h + table[index] - table[index - (to_index - from_index) * weights[tile]]
+
+
+def build_all(size: int, processes: int = 1, cache_dir: str | None = None, progress: bool = True):
+    """
+    Builds and saves the databases of the default partition of a board size.
+    :param processes: The number of databases built at the same time, each in a process of its own.
+    :param progress: Whether to print the progress.
+    """
+    jobs = [(size, pattern, cache_dir, progress) for pattern in PARTITIONS[size]]
+    if processes > 1:
+        with multiprocessing.Pool(min(processes, len(jobs))) as pool:
+            pool.starmap(__build_and_save, jobs)
+    else:
+        for job in jobs:
+            __build_and_save(*job)
+
+def __build_and_save(size: int, pattern: tuple[int, ...], cache_dir: str | None, progress: bool):
+    name = PatternDatabase.file_name(size, pattern)
+
+    def print_progress(depth: int, placements: int, seconds: float):
+        print(f'{name}: depth {depth}, {placements} placements ({seconds:.1f} s)', flush=True)
+
+    database = PatternDatabase.build(size, pattern, print_progress if progress else None)
+    database.save(cache_dir)
+    if progress:
+        print(f'{name}: saved', flush=True)
@@ -0,0 +1,209 @@
+"""
+Contains the generator of puzzles at a requested distance from the solved board, verified by the solver, and the pool
+of ready-made puzzles the game takes its levels from, refilled in background processes and kept on disk. The pool can
+be filled ahead of time with speed_slide.cli.puzzle_generator.
+"""
+
+import concurrent.futures
+import json
+import os
+import random
+import threading
+
+from speed_slide.game_board import GameBoard
+from speed_slide.io import get_cache_dir
+from speed_slide.solver import Solver
+
+
+# the range of distances of the puzzles of every difficulty, i.e. the size of the board
+DISTANCES: dict[int, tuple[int, int]] = {3: (8, 20), 4: (12, 30), 5: (20, 45), 6: (30, 60)}
+
+
+class Puzzle(object):
+    """
+    A shuffled board together with a solution of it.
+    """
+
+    def __init__(self, tiles: list[int], solution: list[int], optimal: bool):
+        """
+        Creates a Puzzle.
+        :param tiles: The tile at every index of the board.
+        :param solution: The numbers of the blocks to slide to solve the board.
+        :param optimal: Whether no shorter solution exists. Boards larger than 4x4 are solved by a weighted search,
+                        so their distance is only an upper bound.
+        """
+        self.tiles = tiles
+        self.solution = solution
+        self.optimal = optimal
+
+    @property
+    def size(self) -> int:
+        return round(len(self.tiles) ** 0.5)
+
+    @property
+    def distance(self) -> int:
+        """
+        The number of moves of the solution, i.e. the distance from the solved board if the solution is optimal.
+        """
+        return len(self.solution)
+
+    def to_dict(self) -> dict:
+        return {'tiles': self.tiles, 'solution': self.solution, 'optimal': self.optimal}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'Puzzle':
+        return cls(list(data['tiles']), list(data['solution']), bool(data['optimal']))
+
+
+def generate(size: int, distance: int | None = None, rng: random.Random | None = None) -> Puzzle:
+    """
+    Generates a puzzle at a distance from the solved board.
+    The board is walked randomly until the heuristic of the solver is close to the distance, then solved, and walked
+    further if needed. The board is then moved along its solution until exactly `distance` moves are left, which is
+    the distance from the solved board if the solution is optimal.
+    :param size: The size of the board.
+    :param distance: The number of moves of the solution. Default is None, which picks one from DISTANCES.
+    :param rng: The random number generator. Default is None, which uses the random module.
+    """
+    rng = rng if rng is not None else random.Random(random.getrandbits(64))
+    if distance is None:
+        distance = rng.randint(*DISTANCES[size])
+    solver = Solver(size)
+    estimate = solver.heuristic.estimate
+
+    board = GameBoard(size)
+    previous = None
+    while True:
+        # solving is quick near the requested distance, but slow far beyond it
+        while estimate(board.tiles) < distance - 2 * size:
+            previous = __random_slide(board, previous, rng)
+        solution = solver.solve(board)
+        if len(solution) >= distance:
+            break
+        for _ in range(distance - len(solution)): # each slide brings the board at most one move further
+            previous = __random_slide(board, previous, rng)
+
+    moves = solution.moves
+    for move in moves[:len(moves) - distance]: # a suffix of an optimal solution is optimal as well
+        board.slide(move)
+    return Puzzle(list(board.tiles), moves[len(moves) - distance:], solution.optimal)
+
+def __random_slide(board: GameBoard, previous: int | None, rng: random.Random) -> int:
+    """
+    Slides a random block next to the empty block, other than the block slid just before.
+    """
+    move = rng.choice([number for number in board.adjacent if number != previous])
+    board.slide(move)
+    return move
+
+def shutdown_now(executor: concurrent.futures.ProcessPoolExecutor):
+    """
+    Shuts down a process pool without waiting for the puzzles being generated: puzzles not started yet are cancelled,
+    and the processes are terminated, as the interpreter would otherwise wait for them to finish when it exits.
+    """
+    processes = list((executor._processes or {}).values()) # no public access before Python 3.14
+    executor.shutdown(wait=False, cancel_futures=True)
+    for process in processes:
+        process.terminate()
+
+def generate_batch(size: int, count: int, processes: int | None = None) -> list[Puzzle]:
+    """
+    Generates puzzles in parallel processes.
+    :param processes: The number of processes. Default is None, which uses the number of CPUs.
+    """
+    with concurrent.futures.ProcessPoolExecutor(processes) as executor:
+        return list(executor.map(generate, [size] * count))
+
+
+class PuzzlePool(object):
+    """
+    Ready-made puzzles of every difficulty, kept in a JSON file. The game takes a puzzle when a level starts and the
+    pool is refilled in background processes, so that starting a level never waits for a puzzle to be generated.
+    """
+
+    def __init__(self, path: str | None = None, capacity: int = 8):
+        """
+        Creates a PuzzlePool and loads the puzzles kept in its file.
+        :param path: The file the pool is kept in. Default is None, which uses default_path().
+        :param capacity: The number of puzzles kept ready for every difficulty.
+        """
+        self.path = path if path is not None else PuzzlePool.default_path()
+        self.capacity = capacity
+        self.puzzles: dict[int, list[Puzzle]] = {size: [] for size in DISTANCES}
+
+        self.__lock = threading.Lock() # puzzles are added by the threads of the executor
+        self.__pending: dict[int, int] = {size: 0 for size in DISTANCES} # puzzles being generated
+        self.load()
+
+    @staticmethod
+    def default_path() -> str:
+        return os.path.join(get_cache_dir('puzzles'), 'pool.json')
+
+    def load(self):
+        """
+        Loads the puzzles kept in the file, if any. A file that cannot be read is ignored.
+        """
+        try:
+            with open(self.path, 'r') as file:
+                data = json.load(file)
+            puzzles = {int(size): [Puzzle.from_dict(puzzle) for puzzle in puzzles] for size, puzzles in data.items()}
+        except (OSError, ValueError, KeyError, TypeError):
+            return
+        with self.__lock:
+            for size, loaded in puzzles.items():
+                self.puzzles.setdefault(size, []).extend(loaded)
+
+    def save(self):
+        """
+        Writes the puzzles to the file, replacing it atomically.
+        """
+        with self.__lock:
+            data = {str(size): [puzzle.to_dict() for puzzle in puzzles] for size, puzzles in self.puzzles.items()}
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        with open(self.path + '.tmp', 'w') as file:
+            json.dump(data, file)
+        os.replace(self.path + '.tmp', self.path)
+
+    def count(self, size: int) -> int:
+        return len(self.puzzles.get(size, []))
+
+    def take(self, size: int) -> Puzzle | None:
+        """
+        Takes a puzzle of a difficulty.
+        :return: The puzzle, or None if none is ready.
+        """
+        with self.__lock:
+            puzzles = self.puzzles.get(size, [])
+            return puzzles.pop(0) if len(puzzles) > 0 else None
+
+    def add(self, puzzle: Puzzle):
+        with self.__lock:
+            self.puzzles.setdefault(puzzle.size, []).append(puzzle)
+
+    def missing(self, sizes: list[int] | None = None) -> int:
+        """
+        Gets the number of puzzles refill() would generate, i.e. the puzzles neither in the pool nor being generated.
+        :param sizes: The difficulties to count. Default is None, which counts every difficulty.
+        """
+        with self.__lock:
+            return sum(max(self.capacity - len(self.puzzles.get(size, [])) - self.__pending[size], 0)
+                       for size in (sizes if sizes is not None else list(DISTANCES)))
+
+    def refill(self, executor: concurrent.futures.Executor, sizes: list[int] | None = None):
+        """
+        Submits the generation of the puzzles missing from the pool to an executor, e.g. a ProcessPoolExecutor.
+        Generated puzzles are added as they are done. Nothing is submitted for difficulties already at capacity.
+        :param sizes: The difficulties to refill. Default is None, which refills every difficulty.
+        """
+        for size in sizes if sizes is not None else list(DISTANCES):
+            with self.__lock:
+                missing = self.capacity - len(self.puzzles.get(size, [])) - self.__pending[size]
+                self.__pending[size] += max(missing, 0)
+            for _ in range(missing):
+                executor.submit(generate, size).add_done_callback(lambda future, s=size: self.__on_generated(s, future))
+
+    def __on_generated(self, size: int, future: concurrent.futures.Future):
+        with self.__lock:
+            self.__pending[size] -= 1
+        if not future.cancelled() and future.exception() is None:
+            self.add(future.result())
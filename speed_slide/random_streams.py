@@ -0,0 +1,54 @@
+"""
+Contains the random number generators of the game, seeded from a single seed so that games can be reproduced.
+Gameplay (puzzles, random events, blinded blocks) and cosmetics (transitions, colours) draw from separate streams, so
+that changing an animation does not change the game.
+"""
+
+import random
+
+
+class RandomStreams(object):
+    """
+    The random number generators of the game, derived from one seed.
+    """
+
+    def __init__(self, seed: int | None = None):
+        """
+        Creates the streams.
+        :param seed: The seed of the game. Default is None, which draws one from the random module.
+        """
+        self.seed = seed if seed is not None else random.getrandbits(64)
+        # string seeds are hashed, so the streams are unrelated but the same on every platform and Python version
+        self.gameplay = random.Random(f'{self.seed}:gameplay')
+        self.cosmetic = random.Random(f'{self.seed}:cosmetic')
+
+
+__streams: RandomStreams | None = None
+
+def set_random_streams(streams: RandomStreams):
+    """
+    Sets the streams the game draws from, e.g. RandomStreams(seed) for a seeded game.
+    """
+    global __streams
+    __streams = streams
+
+def get_random_streams() -> RandomStreams:
+    """
+    Gets the streams the game draws from, creating them from the random module if none have been set.
+    """
+    global __streams
+    if __streams is None:
+        __streams = RandomStreams()
+    return __streams
+
+def gameplay() -> random.Random:
+    """
+    Gets the stream of gameplay, i.e. puzzles, random events and blinded blocks.
+    """
+    return get_random_streams().gameplay
+
+def cosmetic() -> random.Random:
+    """
+    Gets the stream of cosmetics, i.e. transitions and colours.
+    """
+    return get_random_streams().cosmetic
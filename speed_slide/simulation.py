@@ -0,0 +1,266 @@
+"""
+Contains the rules of a level of the game without rendering or input, which MainGameScene drives and bots play, and a
+harness running many simulated games across processes to report the distribution of their scores.
+The harness can be run from the command line with speed_slide.cli.simulation.
+"""
+
+import concurrent.futures
+import random
+
+from speed_slide.game_board import GameBoard
+from speed_slide.puzzle_generator import Puzzle, generate
+
+
+# the random events, as (message, points, name of the award). The second event blinds blocks
+EVENTS: tuple[tuple[str, int, str | None], ...] = (
+    ('None', 0, None),
+    ('A witch used a spell on you! Some of the blocks are now hidden from you!', 0, None),
+    ('A golden coin was hidden under the block! You sold it for 100 points!', 100, 'GOLDEN COIN FOUND'),
+    ('An angel blessed you! +500 points!', 500, 'BLESSING FROM ANGEL'),
+    ('A sneaky mouse stole 100 points from you! :-(', -100, 'SNEAKY MOUSE'),
+    ('Bad luck! A witch cursed you! -300 points! @#%$!', -300, 'WITCH CURSE'),
+)
+
+MAX_SCORE = 9999999999 # the largest total score displayed
+
+
+class GameState(object):
+    """
+    The state of a level being played.
+    """
+
+    def __init__(self, difficulty: int, puzzle: Puzzle):
+        self.difficulty = difficulty
+        self.board = GameBoard.from_tiles(puzzle.tiles)
+        self.solution: list[int] = list(puzzle.solution)
+        self.target_moves = puzzle.distance * 2 # the optimal number of moves, doubled to be fair to players
+        self.max_moves = self.target_moves * 3
+        self.moves = 0
+        self.blinded_blocks: list[int] = []
+        self.blind_events = 0 # the number of blinding events so far, at most difficulty - 2
+        self.awards: list[tuple[str, int]] = [] # refer to MainGameScene.play() for awards/penalties
+        self.event: tuple[str, int, str | None] | None = None # the random event happened after the last move
+        # -1 for quit, 0 for win (advance to new difficulty), 1 for win (same difficulty), 2 for lose, None if playing
+        self.result: int | None = None
+
+    @property
+    def done(self) -> bool:
+        return self.result is not None
+
+    @property
+    def score(self) -> int:
+        """
+        The points earned from the level so far.
+        """
+        return sum(points for _, points in self.awards)
+
+
+class GameSimulation(object):
+    """
+    The rules of a level: the move limits, the random events after the target moves, the blinded blocks, and the
+    awards when the level ends. Nothing is rendered and no input is read, so that the rules can be played by the main
+    game scene, bots and tests alike.
+    """
+
+    def __init__(self):
+        self.state: GameState | None = None
+        self.rng = random.Random()
+
+    def reset(self, difficulty: int, seed: int | None = None, puzzle: Puzzle | None = None) -> GameState:
+        """
+        Starts a level.
+        :param difficulty: The size of the board.
+        :param seed: The seed of the random events, and of the puzzle if not given. Default is None, which draws one
+                     from the random module.
+        :param puzzle: The puzzle to play. Default is None, which generates one.
+        :return: The state of the level.
+        """
+        self.rng = random.Random(seed if seed is not None else random.getrandbits(64))
+        self.state = GameState(difficulty, puzzle if puzzle is not None else generate(difficulty, rng=self.rng))
+        return self.state
+
+    def step(self, move: int) -> tuple[GameState, list[tuple[str, int]], bool]:
+        """
+        Slides a block, then ends the level if it is solved or out of moves, or else rolls a random event.
+        :param move: The number of the block to slide.
+        :return: The state, the awards given by the step, and whether the level has ended.
+        """
+        state = self.__playing_state()
+        if not 1 <= move <= state.difficulty ** 2 - 1:
+            raise ValueError('Invalid input! That block doesn\'t exist! Are you having illusions!?')
+        if not state.board.is_adjacent(move):
+            raise ValueError('Invalid input! You cannot slide this block to the empty space directly!')
+
+        state.moves += 1
+        state.board.slide(move)
+        return self.__end_turn()
+
+    def surrender(self) -> tuple[GameState, list[tuple[str, int]], bool]:
+        """
+        Gives up the level, which loses it.
+        """
+        state = self.__playing_state()
+        state.moves = state.max_moves + 1
+        return self.__end_turn()
+
+    def force(self, moves: int, solved: bool, award: tuple[str, int] | None = None) \
+            -> tuple[GameState, list[tuple[str, int]], bool]:
+        """
+        Sets the number of moves and whether the board is solved, for the commands of debug mode.
+        :param award: An award given before the level ends, if any.
+        """
+        state = self.__playing_state()
+        state.moves = moves
+        state.board.solved = solved
+        awards = []
+        if award is not None:
+            state.awards.append(award)
+            awards.append(award)
+        state, end_awards, done = self.__end_turn()
+        return state, awards + end_awards, done
+
+    def quit(self) -> GameState:
+        """
+        Quits the level without a result.
+        """
+        self.__playing_state().result = -1
+        return self.state
+
+    def __playing_state(self) -> GameState:
+        if self.state is None or self.state.done:
+            raise ValueError('There is no level being played. Call reset() first.')
+        return self.state
+
+    def __end_turn(self) -> tuple[GameState, list[tuple[str, int]], bool]:
+        state = self.state
+        state.event = None
+        if state.moves == state.max_moves and not state.board.solved:
+            state.moves += 1 # the last move did not solve the board
+        if state.moves > state.max_moves:
+            state.result = 2
+            return state, [], True
+
+        if state.board.solved:
+            awards = [('PUZZLE SOLVED', 1000 * state.difficulty)]
+            if state.moves <= state.target_moves: # within target moves
+                awards.append(('BELOW TARGET', (state.target_moves - state.moves) * state.difficulty ** 2 * 100))
+            state.awards[0:0] = awards
+            state.result = 0 if state.moves <= state.target_moves else 1
+            return state, awards, True
+
+        # random event when target < moves < max
+        awards = []
+        if state.target_moves < state.moves < state.max_moves and self.rng.random() < 0.3:
+            event = self.__random_event()
+            if event[0] != 'None' and event[1] == 0:
+                # blinded block event
+                if state.blind_events < state.difficulty - 2:
+                    state.blind_events += 1
+                    state.event = event
+                    state.blinded_blocks.extend(self.rng.choices(range(1, state.difficulty ** 2), k=2))
+            elif event[0] != 'None':
+                # other random events
+                state.event = event
+                state.awards.append((event[2], event[1]))
+                awards.append((event[2], event[1]))
+        return state, awards, False
+
+    def __random_event(self) -> tuple[str, int, str | None]:
+        """
+        Gets a random event (either award or penalties). Higher difficulty level should have larger possibility
+        of awards than of penalties.
+        """
+        difficulty = self.state.difficulty
+        bad_events_weight = difficulty / (difficulty + difficulty ** 2)
+        good_events_weight = 1 - bad_events_weight
+        event_weights = (
+            75, # None
+            5,  # Blinded blocks
+            good_events_weight * 20 * 0.8, # Golden coin
+            good_events_weight * 20 * 0.2, # Angel
+            bad_events_weight * 20 * 0.8, # Mouse
+            bad_events_weight * 20 * 0.2, # Witch
+        )
+        return self.rng.choices(EVENTS, weights=event_weights, k=1)[0]
+
+
+# bot policies, choosing the block to slide from the state of a level and a random number generator
+
+def random_policy(state: GameState, rng: random.Random) -> int:
+    """
+    Slides a random block.
+    """
+    return rng.choice(state.board.adjacent)
+
+def greedy_policy(state: GameState, rng: random.Random) -> int:
+    """
+    Slides the block that brings the board closest to solved by the Manhattan distance, at random among the closest,
+    or a random block one time in five to leave local minima.
+    """
+    board = state.board
+    if rng.random() < 0.2:
+        return rng.choice(board.adjacent)
+    size, empty = board.size, board.empty_index
+
+    def change(number: int) -> int:
+        # the change of the Manhattan distance of the block, which moves to the empty block
+        home_y, home_x = divmod(number - 1, size)
+        (from_y, from_x), (to_y, to_x) = divmod(board.positions[number], size), divmod(empty, size)
+        return abs(to_x - home_x) + abs(to_y - home_y) - abs(from_x - home_x) - abs(from_y - home_y)
+
+    changes = {number: change(number) for number in board.adjacent}
+    best = min(changes.values())
+    return rng.choice([number for number, value in changes.items() if value == best])
+
+def solver_policy(state: GameState, rng: random.Random) -> int:
+    """
+    Follows the solution of the puzzle, which is optimal for boards up to 4x4.
+    """
+    return state.solution[state.moves]
+
+POLICIES: dict[str, callable] = {'random': random_policy, 'greedy': greedy_policy, 'solver': solver_policy}
+
+
+def play_game(policy: callable, seed: int, max_levels: int = 10, puzzles: dict[int, list[Puzzle]] | None = None) \
+        -> tuple[int, int, int]:
+    """
+    Plays a game the way speed_slide.main does: from the 3x3 board, advancing a difficulty when a level is passed
+    below the target moves, until a level is lost or max_levels levels are played.
+    :param policy: The bot, e.g. greedy_policy.
+    :param seed: The seed of the game.
+    :param puzzles: The puzzles picked from by difficulty. Default is None, which generates every puzzle.
+    :return: The total score, the number of levels played and the difficulty of the last level.
+    """
+    rng = random.Random(seed)
+    simulation = GameSimulation()
+    difficulty, total_score = 3, 0
+    for level in range(1, max_levels + 1):
+        choices = puzzles.get(difficulty) if puzzles is not None else None
+        state = simulation.reset(difficulty, rng.getrandbits(64), rng.choice(choices) if choices else None)
+        done = False
+        while not done:
+            state, _, done = simulation.step(policy(state, rng))
+        if state.result == 2:
+            break
+        total_score = min(total_score + state.score, MAX_SCORE)
+        if level < max_levels and state.result == 0:
+            difficulty = min(difficulty + 1, 6)
+    return total_score, level, difficulty
+
+def simulate(games: int, policy: str = 'greedy', max_levels: int = 10, processes: int | None = None, seed: int = 0,
+             puzzles: dict[int, list[Puzzle]] | None = None) -> list[tuple[int, int, int]]:
+    """
+    Plays games across processes, see play_game().
+    :param policy: The name of the bot in POLICIES.
+    :param processes: The number of processes. Default is None, which uses the number of CPUs.
+    :param seed: The seed of the first game; game i uses seed + i, so that the results do not depend on processes.
+    :param puzzles: The puzzles picked from by difficulty, e.g. PuzzlePool.puzzles. Default is None, which generates
+                    every puzzle.
+    :return: The results of play_game() of every game, in order.
+    """
+    if policy not in POLICIES:
+        raise ValueError(f'The policy must be one of {", ".join(POLICIES)}.')
+    seeds = range(seed, seed + games)
+    with concurrent.futures.ProcessPoolExecutor(processes) as executor:
+        return list(executor.map(play_game, [POLICIES[policy]] * games, seeds, [max_levels] * games,
+                                 [puzzles] * games, chunksize=max(1, games // 64)))
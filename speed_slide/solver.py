@@ -0,0 +1,300 @@
+"""
+Contains the solver of the slide puzzle, with the Manhattan distance plus linear conflicts as the heuristic.
+Solutions are optimal with weight 1, which is the default for boards up to 4x4 and uses IDA*. Larger boards are solved
+by weighted A*, which finds solutions at most `weight` times as long as the optimal ones far faster.
+Boards can be solved from the command line with speed_slide.cli.solver.
+"""
+
+import heapq
+import math
+import time
+
+from speed_slide.game_board import GameBoard
+from speed_slide.pattern_database import AdditivePatternDatabases
+import speed_slide.board_encoding as board_encoding
+
+
+def is_solvable(tiles: list[int]) -> bool:
+    """
+    Whether a board can be solved, i.e. it can be reached from the solved board by sliding blocks.
+    """
+    size = round(len(tiles) ** 0.5)
+    numbers = [tile for tile in tiles if tile != 0]
+    inversions = sum(1 for i in range(len(numbers)) for j in range(i + 1, len(numbers)) if numbers[i] > numbers[j])
+    if size % 2 == 1:
+        return inversions % 2 == 0
+    # on even boards, every vertical slide changes the parity of the inversions and moves the empty block by a row
+    rows_from_bottom = size - tiles.index(0) // size
+    return (inversions + rows_from_bottom) % 2 == 1
+
+def default_weight(size: int) -> float:
+    """
+    Gets the weight of the heuristic used for boards of the given size, 1 (optimal) for boards up to 4x4.
+    """
+    return 1.0 if size <= 4 else 2.0 if size == 5 else 3.0
+
+__heuristics = {} # the heuristics of default_heuristic() by the size of the board
+
+def default_heuristic(size: int):
+    """
+    Gets the heuristic used for boards of the given size: the additive pattern databases if they have been built
+    (see speed_slide.pattern_database), otherwise ManhattanLinearConflict. The heuristic is kept for later boards.
+    """
+    if size not in __heuristics:
+        databases = AdditivePatternDatabases.load(size)
+        __heuristics[size] = databases if databases is not None else ManhattanLinearConflict(size)
+    return __heuristics[size]
+
+
+class ManhattanLinearConflict(object):
+    """
+    The sum of the Manhattan distances of the tiles to their solved positions, plus two moves for every tile that has
+    to leave its row or column to let another tile of the same row or column past. Admissible, and updated
+    incrementally after every slide.
+    """
+
+    def __init__(self, size: int):
+        self.size = size
+        count = size * size
+        # distances[tile][index] is the Manhattan distance of a tile at an index to its solved index
+        self.__distances = [[0] * count] + [
+            [abs(index % size - (tile - 1) % size) + abs(index // size - (tile - 1) // size) for index in range(count)]
+            for tile in range(1, count)]
+        self.__rows = [[y * size + x for x in range(size)] for y in range(size)]
+        self.__columns = [[y * size + x for y in range(size)] for x in range(size)]
+        self.__conflicts: dict[tuple[int, ...], int] = {} # conflicts by the order of the tiles solved in a line
+
+    def estimate(self, tiles: list[int]) -> int:
+        """
+        Computes the heuristic of a board.
+        """
+        size = self.size
+        distance = sum(self.__distances[tile][index] for index, tile in enumerate(tiles))
+        rows = sum(self.__line_conflicts(tiles, self.__rows[y], y, False) for y in range(size))
+        columns = sum(self.__line_conflicts(tiles, self.__columns[x], x, True) for x in range(size))
+        return distance + rows + columns
+
+    def update(self, tiles: list[int], h: int, tile: int, from_index: int, to_index: int) -> int:
+        """
+        Updates the heuristic of a board after a tile has slid from one index to another (the empty block).
+        :param tiles: The tiles after the slide.
+        :param h: The heuristic before the slide.
+        :return: The heuristic after the slide.
+        """
+        size = self.size
+        h += self.__distances[tile][to_index] - self.__distances[tile][from_index]
+
+        # only the line the tile belongs to changes its conflicts, if the tile has moved into or out of it
+        goal = tile - 1
+        if from_index // size == to_index // size: # moved along a row, so it has changed its column
+            line, is_column, lines = goal % size, True, self.__columns
+            moved = line == from_index % size or line == to_index % size
+        else:
+            line, is_column, lines = goal // size, False, self.__rows
+            moved = line == from_index // size or line == to_index // size
+        if moved:
+            after = self.__line_conflicts(tiles, lines[line], line, is_column)
+            tiles[from_index], tiles[to_index] = tile, 0
+            before = self.__line_conflicts(tiles, lines[line], line, is_column)
+            tiles[from_index], tiles[to_index] = 0, tile
+            h += after - before
+        return h
+
+    def __line_conflicts(self, tiles: list[int], indices: list[int], line: int, is_column: bool) -> int:
+        """
+        Gets the extra moves of the tiles that belong to a line: two for every tile that has to leave the line so
+        that the rest are in order.
+        """
+        size = self.size
+        if is_column:
+            order = tuple((tile - 1) // size for tile in (tiles[i] for i in indices) if tile != 0 and (tile - 1) % size == line)
+        else:
+            order = tuple((tile - 1) % size for tile in (tiles[i] for i in indices) if tile != 0 and (tile - 1) // size == line)
+        if len(order) < 2:
+            return 0
+        if order not in self.__conflicts:
+            # the tiles that stay form the longest increasing subsequence
+            longest = [1] * len(order)
+            for i in range(len(order)):
+                for j in range(i):
+                    if order[j] < order[i]:
+                        longest[i] = max(longest[i], longest[j] + 1)
+            self.__conflicts[order] = 2 * (len(order) - max(longest))
+        return self.__conflicts[order]
+
+
+class Solution(object):
+    """
+    A solution found by the solver.
+    """
+
+    def __init__(self, moves: list[int], weight: float, nodes_expanded: int, seconds: float):
+        """
+        Creates a Solution.
+        :param moves: The numbers of the blocks to slide, in order.
+        :param weight: The weight of the heuristic the solution was found with.
+        :param nodes_expanded: The number of boards whose moves were searched.
+        :param seconds: The time the search took.
+        """
+        self.moves = moves
+        self.weight = weight
+        self.nodes_expanded = nodes_expanded
+        self.seconds = seconds
+
+    @property
+    def optimal(self) -> bool:
+        """
+        Whether the solution is guaranteed to be the shortest.
+        """
+        return self.weight == 1
+
+    @property
+    def nodes_per_second(self) -> float:
+        return self.nodes_expanded / self.seconds if self.seconds > 0 else 0.0
+
+    def __len__(self) -> int:
+        return len(self.moves)
+
+
+class Solver(object):
+    """
+    Solves boards with IDA*. A solver may be reused for boards of the same size.
+    """
+
+    def __init__(self, size: int, weight: float | None = None, heuristic=None, max_nodes: int | None = None):
+        """
+        Creates a Solver.
+        :param size: The size of the boards.
+        :param weight: The weight of the heuristic. Solutions are at most this many times as long as the optimal
+                       ones. Default is None, which uses default_weight(size).
+        :param heuristic: An object with estimate(tiles) and update(tiles, h, tile, from_index, to_index), see
+                          ManhattanLinearConflict. Default is None, which uses default_heuristic(size).
+        :param max_nodes: The maximum number of nodes to expand before giving up. If None, never gives up.
+        """
+        self.size = size
+        self.weight = weight if weight is not None else default_weight(size)
+        self.heuristic = heuristic if heuristic is not None else default_heuristic(size)
+        self.max_nodes = max_nodes
+
+    def solve(self, board: GameBoard) -> Solution | None:
+        """
+        Finds a solution of a board. With weight 1, IDA* is used, which needs memory only for the current path.
+        Otherwise, weighted A* is used, remembering every board seen by its packed key, as weighted IDA* takes
+        erratically long on large boards.
+        :return: The solution, or None if max_nodes were expanded without finding one.
+        """
+        if board.size != self.size:
+            raise ValueError(f'The solver solves {self.size}x{self.size} boards, not {board.size}x{board.size}.')
+        if not is_solvable(board.tiles):
+            raise ValueError('The board cannot be solved.')
+
+        start = time.perf_counter()
+        if self.weight == 1:
+            moves, nodes_expanded = self.__ida_star(list(board.tiles))
+        else:
+            moves, nodes_expanded = self.__weighted_a_star(list(board.tiles))
+        if moves is None:
+            return None
+        return Solution(moves, self.weight, nodes_expanded, time.perf_counter() - start)
+
+    def __ida_star(self, tiles: list[int]) -> tuple[list[int] | None, int]:
+        """
+        Searches depth-first with an increasing bound of the estimated length.
+        :return: The moves, or None if max_nodes were expanded, and the number of nodes expanded.
+        """
+        goal = list(range(1, self.size * self.size)) + [0]
+        neighbours = GameBoard.neighbours(self.size)
+        update = self.heuristic.update
+        max_nodes = self.max_nodes if self.max_nodes is not None else math.inf
+        path: list[int] = []
+        nodes_expanded = 0
+        found = -1 # returned by search() when the board is solved
+
+        def search(empty: int, g: int, h: int, previous: int, bound: int) -> float:
+            # returns the smallest f above the bound, or found
+            nonlocal nodes_expanded
+            f = g + h
+            if f > bound:
+                return f
+            if h == 0 and tiles == goal:
+                return found
+            if nodes_expanded >= max_nodes:
+                return math.inf
+            nodes_expanded += 1
+            next_bound = math.inf
+            for index in neighbours[empty]:
+                if index == previous: # sliding the same block back
+                    continue
+                tile = tiles[index]
+                tiles[empty], tiles[index] = tile, 0
+                path.append(tile)
+                result = search(index, g + 1, update(tiles, h, tile, index, empty), empty, bound)
+                if result == found:
+                    return found
+                path.pop()
+                tiles[empty], tiles[index] = 0, tile
+                if result < next_bound:
+                    next_bound = result
+            return next_bound
+
+        h = bound = self.heuristic.estimate(tiles)
+        while True:
+            bound = search(tiles.index(0), 0, h, -1, bound)
+            if bound == found:
+                return path, nodes_expanded
+            if bound == math.inf:
+                return None, nodes_expanded
+
+    def __weighted_a_star(self, tiles: list[int]) -> tuple[list[int] | None, int]:
+        """
+        Searches best-first by g + weight * h, remembering every board seen by its packed key.
+        :return: The moves, or None if max_nodes were expanded, and the number of nodes expanded.
+        """
+        size = self.size
+        neighbours = GameBoard.neighbours(size)
+        update = self.heuristic.update
+        weight = self.weight
+        max_nodes = self.max_nodes if self.max_nodes is not None else math.inf
+        goal_key = board_encoding.pack(list(range(1, size * size)) + [0], size)
+
+        key = board_encoding.pack(tiles, size)
+        h = self.heuristic.estimate(tiles)
+        # open boards as (f, -g, key, empty, h), so that deeper boards are expanded first among equal f
+        frontier = [(weight * h, 0, key, tiles.index(0), h)]
+        parents: dict[int, tuple[int, int] | None] = {key: None} # the previous board and the tile slid, by key
+        costs = {key: 0}
+        nodes_expanded = 0
+        while len(frontier) > 0:
+            _, g, key, empty, h = heapq.heappop(frontier)
+            g = -g
+            if g > costs[key]: # a shorter way to this board has been found since
+                continue
+            if key == goal_key:
+                moves = []
+                while parents[key] is not None:
+                    key, tile = parents[key]
+                    moves.append(tile)
+                return moves[::-1], nodes_expanded
+            if nodes_expanded >= max_nodes:
+                return None, nodes_expanded
+            nodes_expanded += 1
+
+            tiles = board_encoding.unpack(key, size)
+            for index in neighbours[empty]:
+                tile = tiles[index]
+                child_key = board_encoding.slide(key, size, empty, index)
+                if costs.get(child_key, math.inf) <= g + 1:
+                    continue
+                tiles[empty], tiles[index] = tile, 0
+                child_h = update(tiles, h, tile, index, empty)
+                tiles[empty], tiles[index] = 0, tile
+                costs[child_key] = g + 1
+                parents[child_key] = (key, tile)
+                heapq.heappush(frontier, (g + 1 + weight * child_h, -(g + 1), child_key, index, child_h))
+        return None, nodes_expanded
+
+def solve(board: GameBoard, weight: float | None = None, max_nodes: int | None = None) -> Solution | None:
+    """
+    Finds a solution of a board, see Solver.
+    """
+    return Solver(board.size, weight, max_nodes=max_nodes).solve(board)
@@ -0,0 +1,142 @@
+"""
+Tests of playing scenes with asyncio.
+"""
+
+import asyncio
+import threading
+import time
+
+from tui import Scene, Screen, transitions
+from tui.aio import AsyncScene, AsyncScreen, KeyStream
+from tui.controls import TxtLabel
+from tui.frame_scheduler import FrameScheduler
+from tui.keyboard import KeyEvent, Keys
+from tui.render_targets import CellBuffer
+
+
+class CountingScene(AsyncScene):
+    """
+    Counts up on a label, rendering at every step, while a second task moves another label.
+    """
+
+    def __init__(self, async_screen: AsyncScreen | None = None):
+        super().__init__(20, 4)
+        self.async_screen = async_screen
+        self.lbl_count = TxtLabel('lbl_count', 10, 1, text='0')
+        self.lbl_moving = TxtLabel('lbl_moving', 1, 1, text='*')
+        self.add_control_at(self.lbl_count, 0, 0)
+        self.add_control_at(self.lbl_moving, 0, 2)
+
+    async def play_async(self):
+        moving = None
+        if self.async_screen is not None:
+            moving = self.async_screen.animate(range(1, 10), 0, self.__move)
+        for count in range(1, 101):
+            self.lbl_count.text = str(count)
+            self.render()
+            await asyncio.sleep(0)
+        if moving is not None:
+            await moving
+        await asyncio.sleep(0.05) # lets the render tick write the last update
+        return count
+
+    def __move(self, x: int):
+        self.lbl_moving.x_coord = x
+        self.render()
+
+
+def create_screen() -> tuple[Screen, CellBuffer]:
+    cell_buffer = CellBuffer(20, 6)
+    return Screen(20, 4, frame_writer=cell_buffer, frame_scheduler=FrameScheduler()), cell_buffer
+
+
+def test_render_tick_coalesces_scene_updates():
+    screen, cell_buffer = create_screen()
+
+    async def main():
+        async with AsyncScreen(screen, ticks_per_second=200) as async_screen:
+            await async_screen.transition_into_scene(CountingScene(async_screen), transitions.direct, 0)
+            frames_before = screen.frames_written
+            result = await async_screen.play_scene()
+        return result, async_screen, screen.frames_written - frames_before
+
+    result, async_screen, frames = asyncio.run(main())
+    assert result == 100
+    # the 109 scene updates are written by the render tick, far fewer times
+    assert 0 < frames < 109
+    assert frames == async_screen.frames_flushed
+    text = cell_buffer.get_text()
+    assert text[1].rstrip() == '100'
+    assert text[3].rstrip() == '         *'
+
+
+def test_updates_after_stop_are_written_immediately():
+    screen, cell_buffer = create_screen()
+    scene = CountingScene()
+
+    async def main():
+        async with AsyncScreen(screen) as async_screen:
+            await async_screen.transition_into_scene(scene, transitions.direct, 0)
+
+    asyncio.run(main())
+    frames_before = screen.frames_written
+    scene.lbl_count.text = 'stopped'
+    scene.render()
+    assert screen.frames_written == frames_before + 1
+    assert cell_buffer.get_text()[1].rstrip() == 'stopped'
+
+
+def test_synchronous_scene_runs_on_the_loop_thread():
+    screen, cell_buffer = create_screen()
+
+    class SynchronousScene(Scene):
+        def __init__(self, async_screen: AsyncScreen):
+            super().__init__(20, 4)
+            self.async_screen = async_screen
+
+        def play(self):
+            ticks = self.async_screen.ticks
+            label = TxtLabel('lbl', 10, 1, text='sync')
+            self.add_control_at(label, 0, 0)
+            self.render()
+            time.sleep(0.05) # the render tick would run 10 times meanwhile if the scene did not block it
+            assert self.async_screen.ticks == ticks
+            return threading.get_ident()
+
+    async def main():
+        async with AsyncScreen(screen, ticks_per_second=200) as async_screen:
+            await async_screen.transition_into_scene(SynchronousScene(async_screen), transitions.direct, 0)
+            frames_before = screen.frames_written
+            thread = await async_screen.play_scene()
+            # written at once, not at the next render tick
+            assert screen.frames_written > frames_before
+            assert async_screen.frames_flushed == 0
+            return thread
+
+    assert asyncio.run(main()) == threading.get_ident()
+    assert cell_buffer.get_text()[1].rstrip() == 'sync'
+
+
+def test_async_scene_plays_on_a_synchronous_screen():
+    screen, cell_buffer = create_screen()
+    screen.transition_into_scene(CountingScene(), transitions.direct, 0)
+    assert screen.play_scene() == 100
+    assert cell_buffer.get_text()[1].rstrip() == '100'
+
+
+def test_key_stream_polls_the_keyboard():
+    class FakeKeyboard(object):
+        def __init__(self):
+            self.events = [None, KeyEvent(Keys.CHAR, 'a'), None, None, KeyEvent(Keys.ENTER)]
+
+        def poll(self) -> KeyEvent | None:
+            return self.events.pop(0)
+
+    async def main():
+        events = []
+        async for event in KeyStream(FakeKeyboard()):
+            events.append(event)
+            if event.key == Keys.ENTER:
+                return events
+
+    assert asyncio.run(main()) == [KeyEvent(Keys.CHAR, 'a'), KeyEvent(Keys.ENTER)]
@@ -0,0 +1,78 @@
+"""
+Tests of the packed and ranked encodings of game boards.
+"""
+
+import itertools
+import random
+
+import pytest
+
+from speed_slide import board_encoding
+from speed_slide.game_board import GameBoard
+
+
+def shuffled_board(size: int, slides: int, seed: int) -> GameBoard:
+    rng = random.Random(seed)
+    board = GameBoard(size)
+    for _ in range(slides):
+        board.slide(rng.choice(board.adjacent))
+    return board
+
+
+@pytest.mark.parametrize('size, bits', [(2, 2), (3, 4), (4, 4), (5, 5), (6, 6)])
+def test_bits_per_tile(size: int, bits: int):
+    assert board_encoding.bits_per_tile(size) == bits
+
+
+@pytest.mark.parametrize('size', [2, 3, 4, 5, 6])
+def test_pack_unpack_round_trip(size: int):
+    for seed in range(20):
+        tiles = shuffled_board(size, 200, seed).tiles
+        key = board_encoding.pack(tiles, size)
+        assert board_encoding.unpack(key, size) == tiles
+        assert board_encoding.from_bytes(board_encoding.to_bytes(key, size)) == key
+        assert [board_encoding.tile_at(key, size, index) for index in range(size * size)] == tiles
+        assert board_encoding.empty_index(key, size) == tiles.index(0)
+
+
+@pytest.mark.parametrize('size', [3, 4, 6])
+def test_slide_matches_game_board(size: int):
+    rng = random.Random(size)
+    board = GameBoard(size)
+    key = board_encoding.pack(board.tiles, size)
+    for _ in range(300):
+        number = rng.choice(board.adjacent)
+        key = board_encoding.slide(key, size, board.empty_index, board.positions[number])
+        board.slide(number)
+        assert key == board_encoding.pack(board.tiles, size)
+
+
+def test_to_bytes_has_fixed_length():
+    assert len(board_encoding.to_bytes(board_encoding.pack(GameBoard(4).tiles, 4), 4)) == 8
+    assert len(board_encoding.to_bytes(0, 4)) == 8
+
+
+def test_rank_unrank_round_trip_is_lexicographic():
+    permutations = [list(tiles) for tiles in itertools.permutations(range(4))]
+    assert [board_encoding.rank(tiles) for tiles in permutations] == list(range(24))
+    assert [board_encoding.unrank(index, 2) for index in range(24)] == permutations
+
+
+@pytest.mark.parametrize('size', [3, 4])
+def test_rank_unrank_round_trip(size: int):
+    for seed in range(20):
+        tiles = shuffled_board(size, 200, seed).tiles
+        assert board_encoding.unrank(board_encoding.rank(tiles), size) == tiles
+
+
+def test_unrank_rejects_out_of_range_index():
+    with pytest.raises(ValueError):
+        board_encoding.unrank(24, 2)
+    with pytest.raises(ValueError):
+        board_encoding.unrank(-1, 2)
+
+
+def test_game_board_key_round_trip():
+    board = shuffled_board(4, 100, 0)
+    assert board.key == board_encoding.pack(board.tiles, 4)
+    assert GameBoard.from_key(board.key, 4) == board
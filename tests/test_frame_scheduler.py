@@ -0,0 +1,34 @@
+"""
+Tests of pacing the frames of animations.
+"""
+
+import time
+
+from tui.frame_scheduler import FrameScheduler
+
+
+def test_last_frame_is_never_dropped():
+    scheduler = FrameScheduler()
+    presented = []
+    for frame in scheduler.pace(range(10), 0.001):
+        presented.append(frame)
+        time.sleep(0.005) # every frame overruns, so the frames in between are dropped
+    assert presented[0] == 0 and presented[-1] == 9
+    assert scheduler.frames_dropped == 10 - len(presented) > 0
+
+
+def test_hold_is_measured_from_the_deadline_of_the_last_frame():
+    scheduler = FrameScheduler()
+    start = time.perf_counter()
+    for frame in scheduler.pace([0, 1, 2], 0.02, hold=0.1):
+        if frame == 2:
+            time.sleep(0.05) # presenting the last frame takes part of the hold
+    elapsed = time.perf_counter() - start
+    assert 0.14 <= elapsed < 0.19 # the last frame is due at 0.04 s and held until 0.14 s
+    assert scheduler.frames_presented == 3
+
+
+def test_no_hold_by_default():
+    start = time.perf_counter()
+    assert list(FrameScheduler().pace([0, 1], 0.02)) == [0, 1]
+    assert time.perf_counter() - start < 0.04
@@ -0,0 +1,72 @@
+"""
+Tests of the flat GameBoard.
+"""
+
+import random
+
+import pytest
+
+from speed_slide.game_board import GameBoard
+
+
+def count_in_place(board: GameBoard) -> int:
+    goal = list(range(1, board.size * board.size)) + [0]
+    return sum(tile == goal[index] for index, tile in enumerate(board.tiles))
+
+
+def test_new_board_is_solved():
+    board = GameBoard(3)
+    assert board.tiles == [1, 2, 3, 4, 5, 6, 7, 8, 0]
+    assert board.tiles_in_place == 9
+    assert board.is_solved
+    assert not board.solved # only a slide sets the flag
+    assert sorted(board.adjacent) == [6, 8]
+
+
+def test_slide_moves_tile_into_empty_block():
+    board = GameBoard(3)
+    assert board.is_adjacent(8) and not board.is_adjacent(5)
+    board.slide(8)
+    assert board.tile_at(1, 2) == 0 and board.tile_at(2, 2) == 8
+    assert board.position_of(8) == (2, 2)
+    assert board.empty_index == 7
+    assert sorted(board.adjacent) == [5, 7, 8]
+    assert board.tiles_in_place == 7
+    assert not board.is_solved
+
+
+@pytest.mark.parametrize('size', [2, 3, 4, 6])
+def test_random_slides_keep_index_and_count(size: int):
+    rng = random.Random(size)
+    board = GameBoard(size)
+    for _ in range(500):
+        board.slide(rng.choice(board.adjacent))
+        assert all(board.tiles[board.positions[tile]] == tile for tile in range(size * size))
+        assert board.tiles_in_place == count_in_place(board)
+        assert board == GameBoard.from_tiles(board.tiles)
+
+
+def test_slide_back_sets_solved():
+    board = GameBoard(3)
+    board.slide(8)
+    board.slide(5)
+    assert not board.solved
+    board.slide(5)
+    board.slide(8)
+    assert board.is_solved and board.solved
+
+
+def test_copy_keeps_solved_flag():
+    board = GameBoard.from_tiles([1, 2, 3, 4, 5, 6, 7, 0, 8])
+    board.slide(8)
+    copy = board.copy()
+    assert copy == board and copy.solved
+    copy.slide(8)
+    assert board.is_solved and not copy.is_solved
+
+
+def test_from_tiles_rejects_invalid_tiles():
+    with pytest.raises(ValueError):
+        GameBoard.from_tiles([1, 2, 3, 0, 5])
+    with pytest.raises(ValueError):
+        GameBoard.from_tiles([1, 1, 2, 0])
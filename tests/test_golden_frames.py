@@ -0,0 +1,33 @@
+"""
+Tests that every storage backend of RichFormatText writes the same frames as the 'list' backend (the golden frames) in
+every benchmark workload, as python -m benchmarks --verify does.
+"""
+
+import pytest
+
+from benchmarks.runner import verify
+from benchmarks.workloads import WORKLOADS
+from tui.controls.__rft_backends import BACKENDS
+
+
+def group_workloads() -> dict[str, dict[str, callable]]:
+    """
+    Groups the workloads compared with each other, i.e. '<name>.<backend>' with the same name of other backends.
+    """
+    groups = {}
+    for name, workload in WORKLOADS.items():
+        prefix, _, suffix = name.rpartition('.')
+        groups.setdefault(prefix if suffix in BACKENDS else name, {})[name] = workload
+    return groups
+
+
+GROUPS = group_workloads()
+
+
+@pytest.mark.parametrize('group', list(GROUPS))
+def test_backends_write_golden_frames(group: str):
+    digests = verify(GROUPS[group], list(BACKENDS))
+    assert list(digests) == [group]
+    assert set(digests[group]) == set(BACKENDS)
+    differing = [backend for backend, digest in digests[group].items() if digest != digests[group]['list']]
+    assert differing == []
@@ -0,0 +1,46 @@
+"""
+Tests that importing the game, as every process started by the multiprocessing "spawn" start method does, writes
+nothing to the terminal.
+"""
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def run_python(code: str) -> subprocess.CompletedProcess:
+    """
+    Runs Python code in a new interpreter from the root of the repository, capturing what it writes.
+    """
+    return subprocess.run([sys.executable, '-c', code], cwd=ROOT, capture_output=True, timeout=120)
+
+
+def test_import_writes_nothing():
+    result = run_python('import speed_slide')
+    assert result.returncode == 0, result.stderr
+    assert result.stdout == b''
+
+
+def test_spawned_worker_writes_nothing():
+    # the worker imports speed_slide to unpickle generate(), as the workers refilling the puzzle pool do
+    result = run_python(
+        'import concurrent.futures, multiprocessing\n'
+        'from speed_slide.puzzle_generator import generate\n'
+        'with concurrent.futures.ProcessPoolExecutor(1, mp_context=multiprocessing.get_context("spawn")) as executor:\n'
+        '    executor.submit(generate, 3, 4).result()\n')
+    assert result.returncode == 0, result.stderr
+    assert result.stdout == b''
+
+
+@pytest.mark.parametrize('tool', ['pattern_database', 'puzzle_generator', 'simulation', 'solver'])
+def test_cli_runs_once(tool: str):
+    # runpy warns if the module it runs was already imported by the speed_slide package
+    result = subprocess.run([sys.executable, '-m', f'speed_slide.cli.{tool}', '--help'], cwd=ROOT, capture_output=True,
+                            timeout=120)
+    assert result.returncode == 0, result.stderr
+    assert result.stderr == b''
+    assert f'Usage: python -m speed_slide.cli.{tool} '.encode() in result.stdout
@@ -0,0 +1,61 @@
+"""
+Tests of reading lines from a raw-mode keyboard reader, and of waiting for Enter.
+"""
+
+import pytest
+
+from speed_slide.io import read_line, wait_for_enter
+from tui import Screen
+from tui.keyboard import KeyEvent, Keys
+
+
+class FakeKeyboard(object):
+    """
+    Stands in for a KeyboardReader, returning scripted events. None stands for a timeout with no key pressed.
+    """
+
+    def __init__(self, events: list[KeyEvent | None]):
+        self.events = list(events)
+        self.timeouts: list[float | None] = []
+
+    def get(self, timeout: float | None = None) -> KeyEvent | None:
+        self.timeouts.append(timeout)
+        event = self.events.pop(0)
+        assert event is not None or timeout is not None, 'waited for a key without a timeout'
+        return event
+
+
+def chars(text: str) -> list[KeyEvent]:
+    return [KeyEvent(Keys.CHAR, char) for char in text]
+
+
+def test_on_idle_is_called_once_per_timeout(capsys):
+    keyboard = FakeKeyboard([None, *chars('1'), None, None, *chars('2'), None, KeyEvent(Keys.ENTER)])
+    idle_calls = []
+    assert read_line(keyboard, lambda: idle_calls.append(None), 0.05) == '12'
+    assert len(idle_calls) == 4
+    assert keyboard.timeouts == [0.05] * 7
+    assert capsys.readouterr().out == '12\n'
+
+
+def test_waits_without_timeout_if_not_idling(capsys):
+    keyboard = FakeKeyboard([*chars('ab'), KeyEvent(Keys.BACKSPACE), *chars('c'), KeyEvent(Keys.ENTER)])
+    assert read_line(keyboard) == 'ac'
+    assert keyboard.timeouts == [None] * 5
+
+
+def test_escape_erases_the_line(capsys):
+    keyboard = FakeKeyboard([*chars('abc'), KeyEvent(Keys.ESCAPE), *chars('\tq'), KeyEvent(Keys.ENTER)])
+    assert read_line(keyboard) == 'q'
+
+
+@pytest.mark.parametrize('use_keyboard', [True, False])
+def test_wait_for_enter_notifies_external_output(use_keyboard: bool, monkeypatch, capsys):
+    if use_keyboard:
+        monkeypatch.setattr('speed_slide.io.__keyboard', FakeKeyboard([*chars('x'), KeyEvent(Keys.ENTER)]))
+    else:
+        monkeypatch.setattr('speed_slide.io.__keyboard', None)
+        monkeypatch.setattr('builtins.input', lambda: 'x')
+    count = Screen._Screen__external_output_count
+    wait_for_enter()
+    assert Screen._Screen__external_output_count == count + 1
@@ -0,0 +1,36 @@
+"""
+Tests of the prefetcher preparing levels in the background.
+"""
+
+import random
+import threading
+
+from speed_slide.game_scenes import MainGameScene
+from speed_slide.level_prefetcher import LevelPrefetcher
+from tui.controls.__rft_backends import StyleTable
+
+
+def test_prefetch_thread_renders_nothing(monkeypatch):
+    # the style table is shared by every RichFormatText and is only safe to use on the game thread
+    threads = set()
+    intern = StyleTable.intern
+
+    def record_intern(style: tuple[int, int, int]) -> int:
+        threads.add(threading.current_thread())
+        return intern(style)
+
+    monkeypatch.setattr(StyleTable, 'intern', staticmethod(record_intern))
+    prefetcher = LevelPrefetcher(rng=random.Random(0))
+    prefetcher.prefetch(3)
+    MainGameScene(3, 1, prefetcher.get(3))
+    assert threads == {threading.current_thread()}
+
+
+def test_prefetched_level_is_seeded():
+    levels = []
+    for _ in range(2):
+        prefetcher = LevelPrefetcher(rng=random.Random(0))
+        prefetcher.prefetch(4)
+        levels.append(prefetcher.get(4))
+    assert levels[0].puzzle.tiles == levels[1].puzzle.tiles
+    assert levels[0].solution == levels[1].solution
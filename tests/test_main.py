@@ -0,0 +1,39 @@
+"""
+Tests of launching the game.
+"""
+
+import builtins
+import json
+import time
+
+import pytest
+
+import speed_slide
+from speed_slide.__game_consts import _Constants as Constants
+from tui import Screen
+from tui.frame_scheduler import FrameScheduler
+from tui.render_targets import NullTarget
+
+
+def test_recording_is_complete_when_interrupted(tmp_path, monkeypatch):
+    def interrupt(prompt: str = ''):
+        raise KeyboardInterrupt
+
+    monkeypatch.setattr(speed_slide, '__screen', Screen(Constants.SCREEN_WIDTH, Constants.SCREEN_HEIGHT,
+                                                        frame_writer=NullTarget(), frame_scheduler=FrameScheduler()))
+    monkeypatch.setattr(time, 'sleep', lambda seconds: None)
+    monkeypatch.setattr(builtins, 'input', interrupt) # Ctrl-C at the main menu
+    monkeypatch.setattr(Constants, 'ANIMATION_SECONDS_PER_FRAME', 0)
+    monkeypatch.setattr(FrameScheduler.default, 'target_fps', None)
+    monkeypatch.setenv('XDG_CACHE_HOME', str(tmp_path)) # the puzzle pool is kept apart from the user's
+
+    path = tmp_path / 'session.cast'
+    with pytest.raises(KeyboardInterrupt):
+        speed_slide.main(**{'--record': str(path)})
+
+    recorder = speed_slide.get_screen().frame_writer
+    assert recorder._FrameRecorder__file is None # closed, so that nothing is left in its buffer
+    header, *events = [json.loads(line) for line in path.read_text(encoding='utf-8').splitlines()]
+    assert header['version'] == 2
+    assert len(events) > 0
+    assert all(kind == 'o' for _, kind, _ in events)
@@ -0,0 +1,94 @@
+"""
+Tests of the additive pattern databases on 3x3 boards, small enough to compare with a breadth-first search.
+"""
+
+import itertools
+import random
+
+import pytest
+
+from speed_slide import board_encoding
+from speed_slide.game_board import GameBoard
+from speed_slide.pattern_database import AdditivePatternDatabases, PatternDatabase
+from speed_slide.solver import ManhattanLinearConflict, Solver
+
+PARTITION = ((1, 2, 3, 4), (5, 6, 7, 8))
+
+
+@pytest.fixture(scope='module')
+def heuristic() -> AdditivePatternDatabases:
+    return AdditivePatternDatabases([PatternDatabase.build(3, pattern) for pattern in PARTITION])
+
+
+@pytest.fixture(scope='module')
+def distances() -> dict[int, int]:
+    """
+    The number of moves to solve a sample of 3x3 boards, by their packed keys.
+    """
+    goal = GameBoard(3)
+    neighbours = GameBoard.neighbours(3)
+    distances = {goal.key: 0}
+    frontier = [(goal.key, goal.empty_index)]
+    while frontier:
+        next_frontier = []
+        for key, empty in frontier:
+            for index in neighbours[empty]:
+                child = board_encoding.slide(key, 3, empty, index)
+                if child not in distances:
+                    distances[child] = distances[key] + 1
+                    next_frontier.append((child, index))
+        frontier = next_frontier
+    keys = random.Random(0).sample(sorted(distances), 5000)
+    return {key: distances[key] for key in keys}
+
+
+def test_build_reaches_every_placement(heuristic: AdditivePatternDatabases):
+    for database in heuristic.databases:
+        assert len(database.table) == 9 ** 4
+        assert database.lookup(GameBoard(3).tiles) == 0
+        placements = [sum(cell * weight for cell, weight in zip(cells, database.weights))
+                      for cells in itertools.permutations(range(9), 4)]
+        assert all(database.table[placement] != 255 for placement in placements)
+
+
+def test_heuristic_is_admissible(heuristic: AdditivePatternDatabases, distances: dict[int, int]):
+    manhattan = ManhattanLinearConflict(3)
+    stronger = 0
+    for key, distance in distances.items():
+        tiles = board_encoding.unpack(key, 3)
+        estimate = heuristic.estimate(tiles)
+        assert estimate <= distance
+        stronger += estimate > manhattan.estimate(tiles)
+    assert stronger > 0 # tracking the empty block makes some estimates stronger than Manhattan distance
+
+
+def test_update_matches_estimate(heuristic: AdditivePatternDatabases):
+    rng = random.Random(1)
+    board = GameBoard(3)
+    h = heuristic.estimate(board.tiles)
+    for _ in range(300):
+        number = rng.choice(board.adjacent)
+        from_index, to_index = board.positions[number], board.empty_index
+        board.slide(number)
+        h = heuristic.update(board.tiles, h, number, from_index, to_index)
+        assert h == heuristic.estimate(board.tiles)
+
+
+def test_solver_with_databases_is_optimal(heuristic: AdditivePatternDatabases, distances: dict[int, int]):
+    solver = Solver(3, heuristic=heuristic)
+    for key in list(distances)[:50]:
+        assert len(solver.solve(GameBoard.from_key(key, 3))) == distances[key]
+
+
+def test_save_and_load(heuristic: AdditivePatternDatabases, tmp_path):
+    database = heuristic.databases[0]
+    assert PatternDatabase.load(3, database.pattern, str(tmp_path)) is None
+    database.save(str(tmp_path))
+    loaded = PatternDatabase.load(3, database.pattern, str(tmp_path))
+    assert bytes(loaded.table) == bytes(database.table)
+
+
+def test_patterns_must_be_disjoint():
+    databases = [PatternDatabase.build(3, (1, 2)), PatternDatabase.build(3, (2, 3))]
+    with pytest.raises(ValueError):
+        AdditivePatternDatabases(databases)
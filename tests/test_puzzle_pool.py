@@ -0,0 +1,92 @@
+"""
+Tests of refilling the pool of ready-made puzzles, and of shutting down the processes refilling it.
+"""
+
+import os
+import subprocess
+import sys
+import time
+
+import speed_slide
+from speed_slide.game_board import GameBoard
+from speed_slide.puzzle_generator import DISTANCES, Puzzle, PuzzlePool
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class FakeExecutor(object):
+    """
+    Stands in for a ProcessPoolExecutor, recording the difficulties submitted without running anything.
+    """
+
+    def __init__(self):
+        self.submitted: list[int] = []
+
+    def submit(self, function: callable, size: int):
+        self.submitted.append(size)
+        return FakeFuture()
+
+
+class FakeFuture(object):
+    def add_done_callback(self, callback: callable):
+        pass
+
+
+def create_full_pool(path: str) -> PuzzlePool:
+    pool = PuzzlePool(path, capacity=2)
+    for size in DISTANCES:
+        for _ in range(2):
+            pool.add(Puzzle(list(GameBoard(size).tiles), [], True))
+    return pool
+
+
+def test_full_pool_submits_nothing(tmp_path):
+    pool = create_full_pool(str(tmp_path / 'pool.json'))
+    executor = FakeExecutor()
+    assert pool.missing() == 0
+    pool.refill(executor)
+    assert executor.submitted == []
+
+
+def test_refill_submits_only_missing_puzzles(tmp_path):
+    pool = create_full_pool(str(tmp_path / 'pool.json'))
+    executor = FakeExecutor()
+    pool.take(4)
+    pool.take(4)
+    pool.take(6)
+    assert pool.missing() == 3 and pool.missing([4]) == 2
+    pool.refill(executor)
+    assert sorted(executor.submitted) == [4, 4, 6]
+    # puzzles being generated are not submitted again
+    assert pool.missing() == 0
+    pool.refill(executor)
+    assert len(executor.submitted) == 3
+
+
+def test_game_starts_processes_only_below_capacity(tmp_path, monkeypatch):
+    executors = []
+    monkeypatch.setattr(speed_slide, 'PuzzlePool', lambda: create_full_pool(str(tmp_path / 'pool.json')))
+    monkeypatch.setattr('concurrent.futures.ProcessPoolExecutor', lambda: executors.append(FakeExecutor()) or executors[-1])
+    monkeypatch.setattr(speed_slide, 'shutdown_now', lambda executor: None)
+    getattr(speed_slide, '__start_puzzle_pool')()
+    try:
+        assert executors == []
+        assert getattr(speed_slide, '__take_puzzle')(3) is not None
+        assert len(executors) == 1 and executors[0].submitted == [3]
+    finally:
+        getattr(speed_slide, '__stop_puzzle_pool')()
+
+
+def test_exit_does_not_wait_for_generation():
+    code = ('import concurrent.futures, time\n'
+            'from speed_slide.puzzle_generator import shutdown_now\n'
+            'if __name__ == "__main__":\n'
+            '    executor = concurrent.futures.ProcessPoolExecutor(1)\n'
+            '    future = executor.submit(time.sleep, 60)\n'
+            '    while not future.running():\n'
+            '        time.sleep(0.01)\n'
+            '    shutdown_now(executor)\n')
+    start = time.perf_counter()
+    result = subprocess.run([sys.executable, '-c', code], cwd=ROOT, capture_output=True, timeout=60)
+    assert result.returncode == 0, result.stderr
+    assert time.perf_counter() - start < 20
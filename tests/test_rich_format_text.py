@@ -0,0 +1,170 @@
+"""
+Tests of RichFormatText and the style table with every storage backend.
+"""
+
+import random
+
+import pytest
+
+from tui import RichFormatText
+from tui.controls.__rft_backends import BACKENDS, StyleTable
+from tui.text_formats import ForegroundColours, BackgroundColours, TextFormats
+
+
+def create_rft(backend: str) -> RichFormatText:
+    rft = RichFormatText('first line\nsecond line\nthird line', backend)
+    rft.set_format(0, slice(5), ForegroundColours.RED, text_format=TextFormats.BOLD)
+    rft.set_format(2, slice(2, 8), background=BackgroundColours.BLUE)
+    return rft
+
+
+@pytest.mark.parametrize('backend', list(BACKENDS))
+def test_copy_then_mutate_then_render(backend: str):
+    original = create_rft(backend)
+    rendered = original.render()
+    copy = original.copy()
+    assert copy.version == original.version
+    assert copy.render() == rendered
+
+    copy[1] = 'changed line'
+    copy.set_format(0, slice(5), ForegroundColours.GREEN)
+    assert copy.version > original.version
+
+    expected = create_rft(backend)
+    expected[1] = 'changed line'
+    expected.set_format(0, slice(5), ForegroundColours.GREEN)
+    assert copy.render() == expected.render()
+    assert copy.render()[2] == rendered[2] # unchanged lines are taken from the cache of the copy
+    assert original.render() == rendered
+
+
+def test_style_table_interns_each_style_once():
+    style = (ForegroundColours.MAGENTA, BackgroundColours.CYAN, TextFormats.UNDERLINE_AND_BOLD)
+    style_id = StyleTable.intern(style)
+    assert StyleTable.intern(tuple(list(style))) == style_id # equal, not identical
+    assert StyleTable.styles[style_id] == style
+    assert StyleTable.intern((ForegroundColours.MAGENTA, BackgroundColours.CYAN, TextFormats.BOLD)) != style_id
+    assert style_id not in StyleTable.transparent_ids
+
+    transparent_id = StyleTable.intern((ForegroundColours.MAGENTA, BackgroundColours.TRANSPARENT, TextFormats.BOLD))
+    assert transparent_id in StyleTable.transparent_ids
+    assert StyleTable.escapes()[transparent_id] == \
+        f'\033[{TextFormats.BOLD};{ForegroundColours.MAGENTA};{BackgroundColours.DEFAULT}m'
+
+
+def random_formats(rft: RichFormatText, rng: random.Random, steps: int):
+    """
+    Sets formats at random, some options left unspecified, over ranges of every kind, and changes lines in between.
+    """
+    for _ in range(steps):
+        line = rng.randrange(len(rft))
+        match rng.randrange(8):
+            case 0:
+                rft[line] = 'x' * rng.randrange(20)
+            case 1:
+                rft.clear_formats()
+            case _:
+                start, stop = rng.randint(-15, 15), rng.choice([None, rng.randint(-15, 15)])
+                rft.set_format(line, slice(start, stop, rng.choice([None, 1, 2, -1])),
+                               rng.choice([None, ForegroundColours.random(rng)]),
+                               rng.choice([None, BackgroundColours.TRANSPARENT, BackgroundColours.random(rng)]),
+                               rng.choice([None, TextFormats.DEFAULT, TextFormats.BOLD, TextFormats.UNDERLINE]))
+
+
+@pytest.mark.parametrize('backend', list(BACKENDS))
+def test_set_format_matches_list_backend(backend: str):
+    for seed in range(20):
+        expected, rft = create_rft('list'), create_rft(backend)
+        random_formats(expected, random.Random(seed), 50)
+        random_formats(rft, random.Random(seed), 50)
+        for line in range(len(rft)):
+            assert rft[line] == expected[line]
+            assert rft.get_format(line, slice(None)) == expected.get_format(line, slice(None))
+        assert rft.render() == expected.render()
+
+
+@pytest.mark.parametrize('backend', list(BACKENDS))
+def test_escapes_follow_the_default_background(backend: str, monkeypatch):
+    rft = RichFormatText('text', backend)
+    rft.set_format(0, slice(2), ForegroundColours.RED)
+    monkeypatch.setattr(BackgroundColours, 'DEFAULT', BackgroundColours.BLACK)
+    expected = RichFormatText('text', 'list').set_format(0, slice(2), ForegroundColours.RED)
+    assert rft.render() == expected.render()
+    assert f';{BackgroundColours.BLACK}m' in rft.render()[0]
+
+
+def create_layer(backend: str, rng: random.Random) -> RichFormatText:
+    """
+    Creates ragged lines of random text with random formats, a third of them with transparent backgrounds.
+    """
+    rft = RichFormatText('\n'.join(''.join(rng.choice('abc ') for _ in range(rng.randint(4, 14))) for _ in range(6)),
+                         backend)
+    for line in range(len(rft)):
+        for x in range(len(rft[line])):
+            rft.set_format(line, slice(x, x + 1), ForegroundColours.random(rng),
+                           rng.choice([BackgroundColours.TRANSPARENT, BackgroundColours.random(rng),
+                                       BackgroundColours.random(rng)]),
+                           rng.choice([TextFormats.DEFAULT, TextFormats.BOLD]))
+    return rft
+
+
+def copy_cells(target: RichFormatText, source: RichFormatText, target_line: int, target_index: int, copy_text: bool,
+               copy_formats: bool, clip: tuple[int, int, int, int] | None, blend_background: bool
+               ) -> tuple[list[str], list[list[tuple[int, int, int]]]]:
+    """
+    Copies a RichFormatText onto the text and formats of another cell by cell, as copy_from() should.
+    """
+    lines = [list(target[y]) for y in range(len(target))]
+    formats = [target.get_format(y, slice(None)) for y in range(len(target))]
+    for y in range(len(target)):
+        for x in range(len(lines[y])):
+            source_y, source_x = y - target_line, x - target_index
+            if not (0 <= source_y < len(source) and 0 <= source_x < len(source[source_y])):
+                continue
+            if clip is not None and not (clip[0] <= x < clip[0] + clip[2] and clip[1] <= y < clip[1] + clip[3]):
+                continue
+            if copy_text:
+                lines[y][x] = source[source_y][source_x]
+            if copy_formats:
+                fg, bg, tf = source.get_format(source_y, slice(source_x, source_x + 1))[0]
+                if blend_background and bg == BackgroundColours.TRANSPARENT:
+                    bg = formats[y][x][1]
+                formats[y][x] = (fg, bg, tf)
+    return [''.join(line) for line in lines], formats
+
+
+@pytest.mark.parametrize('source_backend', list(BACKENDS))
+@pytest.mark.parametrize('backend', list(BACKENDS))
+def test_copy_from_matches_copying_cells(backend: str, source_backend: str):
+    rng = random.Random(13)
+    for _ in range(60):
+        target, source = create_layer(backend, rng), create_layer(source_backend, rng)
+        target_line, target_index = rng.randint(-4, 5), rng.randint(-10, 12)
+        copy_text, copy_formats = rng.choice([(True, True), (True, False), (False, True)])
+        clip = rng.choice([None, (rng.randint(-2, 10), rng.randint(-2, 5), rng.randint(0, 8), rng.randint(0, 4))])
+        blend_background = rng.random() < 0.5
+
+        expected_lines, expected_formats = copy_cells(target, source, target_line, target_index, copy_text,
+                                                      copy_formats, clip, blend_background)
+        target.copy_from(source, target_line, target_index, copy_text, copy_formats, clip, blend_background)
+        assert [target[y] for y in range(len(target))] == expected_lines
+        assert [target.get_format(y, slice(None)) for y in range(len(target))] == expected_formats
+
+        expected = RichFormatText('\n'.join(expected_lines), 'list')
+        for y, line_formats in enumerate(expected_formats):
+            for x, (fg, bg, tf) in enumerate(line_formats):
+                expected.set_format(y, slice(x, x + 1), fg, bg, tf)
+        assert target.render() == expected.render()
+
+
+@pytest.mark.parametrize('backend', list(BACKENDS))
+def test_copy_from_outside_the_target_changes_nothing(backend: str):
+    rng = random.Random(0)
+    target, source = create_layer(backend, rng), create_layer(backend, rng)
+    rendered, version = target.render(), target.version
+    target.copy_from(source, len(target), 0)
+    target.copy_from(source, -len(source), 0)
+    target.copy_from(source, 0, 0, clip=(0, 0, 0, 3))
+    target.copy_from(source, 0, 0, copy_text=False, copy_formats=False)
+    assert target.render() == rendered
+    assert target.version == version
@@ -0,0 +1,169 @@
+"""
+Tests that rendering a scene incrementally, recomposing only the damaged rectangles, gives the same frames as
+composing every control from scratch, including the child controls of dialogue windows.
+"""
+
+import random
+
+import pytest
+
+from tui import RichFormatText, Scene
+from tui.controls import Control, DialogueWindow, TxtLabel
+from tui.controls.__rft_backends import BACKENDS
+from tui.text_formats import BackgroundColours, ForegroundColours, TextFormats
+
+
+class Counter(Control):
+    """
+    A control that is always dirty and renders a new RichFormatText object every time, as the base Control allows.
+    """
+
+    def __init__(self):
+        super().__init__('counter', 4, 2, 0, 0)
+        self.renders = 0
+
+    def render(self):
+        self.renders += 1
+        self._internal_rft = RichFormatText.create_by_size(self.width, self.height, str(self.renders % 10))
+
+
+def full_render(scene: Scene) -> list[str]:
+    """
+    Composes the background and every control of a scene from scratch, as the first render of a scene does.
+    """
+    canvas = RichFormatText.create_by_size(scene.width, scene.height, scene.background)
+    canvas.copy_from(scene.background_rft)
+    for control in sorted(scene.controls, key=lambda c: (c.z_coord, c.y_coord, c.x_coord)):
+        canvas.copy_from(control.get_rft_object(), control.y_coord, control.x_coord)
+    return canvas.render()
+
+
+def mutate_label(label: TxtLabel, rng: random.Random):
+    """
+    Changes a label at random: its text, formats, position or z-index.
+    """
+    match rng.randrange(5):
+        case 0:
+            label.text = '\n'.join(''.join(rng.choice('ab #') for _ in range(rng.randrange(label.width + 1)))
+                                   for _ in range(label.height))
+        case 1:
+            start = rng.randrange(label.width)
+            label.formatted_text.set_format(rng.randrange(label.height), slice(start, start + rng.randrange(1, 4)),
+                                            ForegroundColours.random(rng),
+                                            rng.choice([BackgroundColours.TRANSPARENT, BackgroundColours.random(rng)]),
+                                            rng.choice([TextFormats.DEFAULT, TextFormats.BOLD]))
+        case 2:
+            label.x_coord += rng.randint(-3, 3)
+            label.y_coord += rng.randint(-2, 2)
+        case 3:
+            label.z_coord = rng.randrange(3)
+        case 4:
+            pass # unchanged, so nothing is recomposed for it
+
+
+def create_scene(rng: random.Random) -> tuple[Scene, list[TxtLabel]]:
+    scene = Scene(24, 10, '.')
+    scene.background_rft.set_format(3, slice(4, 12), background=BackgroundColours.BLUE)
+    labels = []
+    for i in range(6):
+        label = TxtLabel(f'lbl_{i}', rng.randint(3, 8), rng.randint(1, 3), text=f'label {i}')
+        label.formatted_text.set_format(0, slice(2), background=BackgroundColours.TRANSPARENT)
+        scene.add_control_at(label, rng.randint(-2, 20), rng.randint(-1, 9))
+        labels.append(label)
+    return scene, labels
+
+
+@pytest.mark.parametrize('backend', list(BACKENDS))
+def test_recomposition_matches_full_render(backend: str, monkeypatch):
+    monkeypatch.setattr(RichFormatText, 'default_backend', backend)
+    rng = random.Random(5)
+    scene, labels = create_scene(rng)
+    recomposed = 0
+    for _ in range(300):
+        for label in rng.sample(labels, rng.randint(1, 2)):
+            mutate_label(label, rng)
+        scene.render()
+        assert scene.get_rendered() == full_render(scene)
+        recomposed += scene.cells_recomposed_last_frame
+    # most frames recompose only a part of the scene
+    assert recomposed < 300 * scene.width * scene.height / 2
+
+
+def test_unchanged_scene_recomposes_nothing():
+    scene, labels = create_scene(random.Random(0))
+    scene.render()
+    assert scene.controls_rendered_last_frame == 0
+    assert scene.cells_recomposed_last_frame == 0
+
+    labels[0].text = 'changed'
+    scene.render()
+    assert scene.controls_rendered_last_frame == 1
+    assert 0 < scene.cells_recomposed_last_frame <= 2 * labels[0].width * labels[0].height
+
+
+def test_controls_added_and_removed_recompose_everything():
+    scene, labels = create_scene(random.Random(1))
+    scene.controls.remove(labels[2])
+    scene.render()
+    assert scene.cells_recomposed_last_frame == scene.width * scene.height
+    assert scene.get_rendered() == full_render(scene)
+
+    scene.add_control_at(Counter(), 1, 1)
+    for _ in range(3):
+        scene.render()
+        assert scene.get_rendered() == full_render(scene)
+
+
+def full_render_window(window: DialogueWindow) -> list[str]:
+    """
+    Renders a dialogue window with the same child controls from scratch.
+    """
+    reference = DialogueWindow('reference', window.width, window.height, title=window.title,
+                               border_colour=window.border_colour)
+    reference.controls = list(window.controls)
+    reference.render()
+    return reference.get_rft_object().render()
+
+
+@pytest.mark.parametrize('backend', list(BACKENDS))
+def test_dialogue_window_damage_matches_full_render(backend: str, monkeypatch):
+    monkeypatch.setattr(RichFormatText, 'default_backend', backend)
+    rng = random.Random(6)
+    scene, labels = create_scene(rng)
+    window = DialogueWindow('dw', 16, 7, title='Window', border_colour=ForegroundColours.BLUE)
+    children = []
+    for i in range(4):
+        child = TxtLabel(f'child_{i}', rng.randint(3, 8), rng.randint(1, 3), text=f'child {i}')
+        window.controls.append(child)
+        child.x_coord, child.y_coord = rng.randint(-1, 12), rng.randint(-1, 6)
+        children.append(child)
+    scene.add_control_at(window, 4, 2)
+
+    for _ in range(300):
+        match rng.randrange(10):
+            case 0:
+                window.title = rng.choice(['Window', 'Another title', ''])
+            case 1:
+                window.border_colour = ForegroundColours.random(rng)
+            case 2:
+                window.x_coord += rng.randint(-2, 2)
+            case _:
+                mutate_label(rng.choice(children + labels[:1]), rng)
+        scene.render()
+        assert window.get_rft_object().render() == full_render_window(window)
+        assert scene.get_rendered() == full_render(scene)
+
+
+def test_dialogue_window_propagates_child_damage():
+    scene = Scene(30, 12)
+    window = DialogueWindow('dw', 20, 8, title='Window')
+    child = TxtLabel('child', 6, 1, text='before')
+    window.controls.append(child)
+    child.x_coord, child.y_coord = 3, 3
+    scene.add_control_at(window, 5, 2)
+
+    child.text = 'after'
+    scene.render()
+    # only the cells of the child are recomposed in the scene, not the whole window
+    assert 0 < scene.cells_recomposed_last_frame <= child.width * child.height
+    assert scene.get_rendered() == full_render(scene)
@@ -0,0 +1,21 @@
+"""
+Tests of animating the score of a ScoreLabel.
+"""
+
+import pytest
+
+from speed_slide.__game_consts import _Constants as Constants
+from speed_slide.game_scenes.customised_controls import ScoreLabel
+from tui import Scene
+
+
+@pytest.mark.parametrize('old_score, new_score, step', [(0, 10, 5), (0, 10, 3), (10, -7, 4), (5, 123, 0)])
+def test_animation_ends_at_the_new_score(old_score: int, new_score: int, step: int, monkeypatch):
+    monkeypatch.setattr(Constants, 'ANIMATION_SECONDS_PER_FRAME', 0)
+    scene = Scene(10, 1)
+    label = ScoreLabel('lbl_score', old_score)
+    scene.add_control_at(label, 0, 0)
+    shown = []
+    label.animate_change_score(new_score, step, lambda _: shown.append(label.get_rft_object()[0]), scene)
+    assert shown[-1] == (f'{new_score:0>10}' if new_score >= 0 else f'-{-new_score:0>9}')
+    assert len(shown) == ((abs(new_score - old_score) + step - 1) // step if step > 0 else 1)
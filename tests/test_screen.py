@@ -0,0 +1,84 @@
+"""
+Tests of the frames Screen writes to the terminal.
+"""
+
+from tui import Scene, Screen, transitions
+from tui.controls import TxtLabel
+from tui.frame_scheduler import FrameScheduler
+from tui.frame_writer import FrameWriter
+
+
+class FrameLog(FrameWriter):
+    """
+    A FrameWriter that keeps the text of every frame instead of writing it.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.frames: list[str] = []
+        self.__parts: list[str] = []
+
+    def begin_frame(self):
+        self.__parts = []
+
+    def write(self, text: str):
+        self.__parts.append(text)
+
+    def end_frame(self) -> int:
+        self.frames.append(''.join(self.__parts))
+        return len(self.frames[-1].encode())
+
+
+def create_screen() -> tuple[Screen, FrameLog]:
+    frame_log = FrameLog()
+    return Screen(20, 4, frame_writer=frame_log, frame_scheduler=FrameScheduler()), frame_log
+
+
+def create_scene() -> tuple[Scene, TxtLabel]:
+    scene = Scene(20, 4)
+    label = TxtLabel('label', 10, 1, text='first')
+    scene.add_control_at(label, 2, 1)
+    return scene, label
+
+
+def test_only_changed_lines_are_snapshot(monkeypatch):
+    screen, frame_log = create_screen()
+    scene, label = create_scene()
+    screen.transition_into_scene(scene, transitions.direct, 0)
+
+    snapshot_lines = []
+    snapshot_line = Screen._Screen__snapshot_line
+    monkeypatch.setattr(Screen, '_Screen__snapshot_line',
+                        classmethod(lambda cls, rft, y: snapshot_lines.append(y) or snapshot_line(rft, y)))
+    label.text = 'second'
+    scene.render()
+    assert snapshot_lines == [1]
+
+    # a frame rendered the same keeps every line of the last frame, and writes no cell
+    scene.render()
+    assert snapshot_lines == [1]
+    assert frame_log.frames[-1] == '\033[0;39;49m\033[6;1H\033[J'
+
+
+def test_scene_update_after_transition_is_a_diff():
+    screen, frame_log = create_screen()
+    scene, label = create_scene()
+    # output written before the transition is covered by its full redraw
+    Screen.notify_external_output()
+    screen.transition_into_scene(scene, transitions.direct, 0)
+
+    label.text = 'second'
+    scene.render()
+    assert '\033[2J' not in frame_log.frames[-1]
+    assert 'second' in frame_log.frames[-1]
+
+
+def test_external_output_redraws_the_whole_screen():
+    screen, frame_log = create_screen()
+    scene, label = create_scene()
+    screen.transition_into_scene(scene, transitions.direct, 0)
+
+    Screen.notify_external_output()
+    label.text = 'second'
+    scene.render()
+    assert frame_log.frames[-1].startswith('\033[2J')
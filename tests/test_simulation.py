@@ -0,0 +1,29 @@
+"""
+Tests of the harness running simulated games across processes.
+"""
+
+import os
+import subprocess
+import sys
+
+from speed_slide.simulation import simulate
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_results_do_not_depend_on_processes():
+    assert simulate(6, 'greedy', max_levels=2, processes=2) == simulate(6, 'greedy', max_levels=2, processes=1)
+
+
+def test_spawned_workers_write_nothing():
+    # spawned workers import the speed_slide package, which must not draw on the terminal
+    result = subprocess.run([sys.executable, '-c',
+                             'import multiprocessing\n'
+                             'from speed_slide.simulation import simulate\n'
+                             'if __name__ == "__main__":\n'
+                             '    multiprocessing.set_start_method("spawn")\n'
+                             '    simulate(4, "greedy", max_levels=1, processes=2)\n'],
+                            cwd=ROOT, capture_output=True, timeout=120)
+    assert result.returncode == 0, result.stderr
+    assert b'\033' not in result.stdout
+    assert result.stdout == b''
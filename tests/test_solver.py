@@ -0,0 +1,80 @@
+"""
+Tests of the solver against a breadth-first search of every 3x3 board.
+"""
+
+import random
+
+import pytest
+
+from speed_slide import board_encoding
+from speed_slide.game_board import GameBoard
+from speed_slide.solver import ManhattanLinearConflict, Solver, is_solvable
+
+
+@pytest.fixture(scope='module')
+def distances() -> dict[int, int]:
+    """
+    The number of moves to solve every solvable 3x3 board, by its packed key.
+    """
+    goal = GameBoard(3)
+    neighbours = GameBoard.neighbours(3)
+    distances = {goal.key: 0}
+    frontier = [(goal.key, goal.empty_index)]
+    while frontier:
+        next_frontier = []
+        for key, empty in frontier:
+            for index in neighbours[empty]:
+                child = board_encoding.slide(key, 3, empty, index)
+                if child not in distances:
+                    distances[child] = distances[key] + 1
+                    next_frontier.append((child, index))
+        frontier = next_frontier
+    return distances
+
+
+def sample(distances: dict[int, int], count: int) -> list[int]:
+    return random.Random(0).sample(sorted(distances), count)
+
+
+def test_every_reachable_board_is_solvable(distances: dict[int, int]):
+    assert len(distances) == 181440
+    assert all(is_solvable(board_encoding.unpack(key, 3)) for key in sample(distances, 1000))
+    assert not is_solvable([2, 1, 3, 4, 5, 6, 7, 8, 0])
+
+
+def test_heuristic_is_admissible(distances: dict[int, int]):
+    heuristic = ManhattanLinearConflict(3)
+    for key in sample(distances, 5000):
+        assert heuristic.estimate(board_encoding.unpack(key, 3)) <= distances[key]
+
+
+def test_solutions_are_optimal(distances: dict[int, int]):
+    solver = Solver(3)
+    for key in sample(distances, 100):
+        board = GameBoard.from_key(key, 3)
+        solution = solver.solve(board)
+        assert solution.optimal
+        assert len(solution) == distances[key]
+        for number in solution.moves:
+            assert board.is_adjacent(number)
+            board.slide(number)
+        assert board.is_solved
+
+
+def test_weighted_solutions_are_bounded(distances: dict[int, int]):
+    solver = Solver(3, weight=2.0)
+    for key in sample(distances, 100):
+        board = GameBoard.from_key(key, 3)
+        solution = solver.solve(board)
+        assert not solution.optimal
+        assert len(solution) <= 2 * distances[key]
+        for number in solution.moves:
+            board.slide(number)
+        assert board.is_solved
+
+
+def test_solve_rejects_unsolvable_board():
+    with pytest.raises(ValueError):
+        Solver(3).solve(GameBoard.from_tiles([2, 1, 3, 4, 5, 6, 7, 8, 0]))
+    with pytest.raises(ValueError):
+        Solver(4).solve(GameBoard(3))
@@ -0,0 +1,153 @@
+"""
+Tests that the transitions, which generate their frames lazily, give the same frames as they did when they built
+lists of all frames, and that the scatter transition gives the same frames as revealing cells one by one.
+"""
+
+import random
+
+import pytest
+
+from tui import RichFormatText, Scene, transitions
+from tui.controls import TxtLabel
+from tui.controls.__rft_backends import BACKENDS
+from tui.text_formats import BackgroundColours, ForegroundColours, TextFormats
+
+
+# the transitions as they were when they returned lists, by name
+def wipe_up_to_down(from_rendered: list[str], to_rendered: list[str], *_) -> list[str]:
+    return ['\n'.join(to_rendered[:i + 1] + from_rendered[i + 1:]) for i in range(len(from_rendered))]
+
+def wipe_down_to_up(from_rendered: list[str], to_rendered: list[str], *_) -> list[str]:
+    return ['\n'.join(from_rendered[:i] + to_rendered[i:]) for i in range(len(from_rendered), -1, -1)]
+
+def slide_from_top(from_rendered: list[str], to_rendered: list[str], *_) -> list[str]:
+    height = len(from_rendered)
+    return ['\n'.join(to_rendered[-(i + 1):] + from_rendered[:height - i - 1]) for i in range(height)]
+
+def slide_from_bottom(from_rendered: list[str], to_rendered: list[str], *_) -> list[str]:
+    return ['\n'.join(from_rendered[i + 1:] + to_rendered[:i + 1]) for i in range(len(from_rendered))]
+
+def shifted_frames(from_rft: RichFormatText, to_rft: RichFormatText, offsets: list[tuple[int, int]]) -> list[str]:
+    """
+    The frames of the horizontal transitions: the old scene, then the new scene, pasted at offsets.
+    """
+    width, height = from_rft.get_size()
+    frames = []
+    for from_x, to_x in offsets:
+        frame = RichFormatText.create_by_size(width, height)
+        frame.copy_from(from_rft, 0, from_x)
+        frame.copy_from(to_rft, 0, to_x)
+        frames.append('\n'.join(frame.render()))
+    return frames
+
+def wipe_left_to_right(_, __, from_rft: RichFormatText, to_rft: RichFormatText) -> list[str]:
+    width = from_rft.get_size()[0]
+    offsets = [width if i + 4 > width else i for i in range(0, width, 4)]
+    return shifted_frames(from_rft, to_rft, [(0, i - width) for i in offsets])
+
+def wipe_right_to_left(_, __, from_rft: RichFormatText, to_rft: RichFormatText) -> list[str]:
+    width = from_rft.get_size()[0]
+    offsets = [0 if i - 4 < 0 else i for i in range(width - 1, -1, -4)]
+    return shifted_frames(from_rft, to_rft, [(0, i) for i in offsets])
+
+def slide_from_left(_, __, from_rft: RichFormatText, to_rft: RichFormatText) -> list[str]:
+    width = from_rft.get_size()[0]
+    offsets = [width if i + 4 > width else i for i in range(1, width, 4)]
+    return shifted_frames(from_rft, to_rft, [(i, i - width) for i in offsets])
+
+def slide_from_right(_, __, from_rft: RichFormatText, to_rft: RichFormatText) -> list[str]:
+    width = from_rft.get_size()[0]
+    offsets = [0 if i - 4 < 0 else i for i in range(width - 1, -1, -4)]
+    return shifted_frames(from_rft, to_rft, [(i - width, i) for i in offsets])
+
+def direct(_, to_rendered: list[str], *__) -> list[str]:
+    return ['\n'.join(to_rendered)]
+
+LIST_TRANSITIONS = {function.__name__: function for function in (
+    wipe_up_to_down, wipe_down_to_up, wipe_left_to_right, wipe_right_to_left,
+    slide_from_top, slide_from_bottom, slide_from_left, slide_from_right, direct)}
+
+
+def create_scene(seed: int, width: int = 23, height: int = 7) -> Scene:
+    """
+    Creates a scene of labels with random text, colours and transparent backgrounds.
+    """
+    rng = random.Random(seed)
+    scene = Scene(width, height, rng.choice('.:'))
+    scene.background_rft.set_format(rng.randrange(height), slice(2, 9), background=BackgroundColours.random(rng))
+    for i in range(5):
+        label = TxtLabel(f'lbl_{i}', rng.randint(3, 9), rng.randint(1, 3),
+                         text='\n'.join(''.join(rng.choice('xyz #') for _ in range(9)) for _ in range(3)))
+        label.formatted_text.set_format(0, slice(rng.randrange(9)), ForegroundColours.random(rng),
+                                        rng.choice([BackgroundColours.TRANSPARENT, BackgroundColours.random(rng)]),
+                                        rng.choice([TextFormats.DEFAULT, TextFormats.BOLD]))
+        scene.add_control_at(label, rng.randint(-2, width - 2), rng.randint(-1, height - 1))
+    return scene
+
+
+@pytest.mark.parametrize('backend', list(BACKENDS))
+@pytest.mark.parametrize('name', list(LIST_TRANSITIONS))
+@pytest.mark.parametrize('width', [23, 24])
+def test_frames_match_list_transitions(name: str, width: int, backend: str, monkeypatch):
+    monkeypatch.setattr(RichFormatText, 'default_backend', backend)
+    from_scene, to_scene = create_scene(0, width), create_scene(1, width)
+    expected = LIST_TRANSITIONS[name](from_scene.get_rendered(), to_scene.get_rendered(),
+                                      from_scene.get_rft(), to_scene.get_rft())
+    assert transitions.as_list(getattr(transitions, name))(from_scene, to_scene) == expected
+
+
+def test_frames_are_generated_lazily_from_the_scenes_at_the_start():
+    from_scene, to_scene = create_scene(0), create_scene(1)
+    expected = wipe_left_to_right(None, None, from_scene.get_rft(), to_scene.get_rft())
+
+    frames = transitions.wipe_left_to_right(from_scene, to_scene)
+    first = next(frames)
+    # the scenes change while the transition runs, e.g. the new scene is prepared, but the frames do not
+    to_scene.get_control('lbl_0').text = 'changed'
+    to_scene.render()
+    assert [first, *frames] == expected
+
+
+def test_scenes_must_be_of_the_same_size():
+    with pytest.raises(ValueError):
+        list(transitions.slide_from_left(create_scene(0, 23), create_scene(1, 24)))
+
+
+def scatter_cells(from_rft: RichFormatText, to_rft: RichFormatText, order: list[int], chars_per_frame: int) -> list[str]:
+    """
+    The frames of the scatter transition as it was, revealing the cells of the new scene one by one in the given
+    order by copying their text and formats onto a copy of the last frame.
+    """
+    width, height = to_rft.get_size()
+    frame = from_rft.copy()
+    frames = []
+    for f in range(width * height // chars_per_frame + 1):
+        frame = frame.copy()
+        for i in order[f * chars_per_frame:(f + 1) * chars_per_frame]:
+            x, y = i % width, i // width
+            frame[y] = frame[y][:x] + to_rft[y][x] + frame[y][x + 1:]
+            fg, bg, tf = to_rft.get_format(y, slice(x, x + 1))[0]
+            frame.set_format(y, slice(x, x + 1), fg, bg, tf)
+        frames.append('\n'.join(frame.render()))
+    return frames
+
+
+@pytest.mark.parametrize('backend', list(BACKENDS))
+@pytest.mark.parametrize('chars_per_frame', [1, 7, 40, 161, 200])
+def test_scatter_matches_revealing_cells_one_by_one(chars_per_frame: int, backend: str, monkeypatch):
+    monkeypatch.setattr(RichFormatText, 'default_backend', backend)
+    from_scene, to_scene = create_scene(0), create_scene(1)
+    order = list(range(from_scene.width * from_scene.height))
+    random.Random(8).shuffle(order) # the permutation the transition takes from the same seed
+    expected = scatter_cells(from_scene.get_rft(), to_scene.get_rft(), order, chars_per_frame)
+
+    previous = from_scene.get_rendered()
+    frames = []
+    for frame in transitions.scatter(chars_per_frame, random.Random(8))(from_scene, to_scene):
+        lines = frame.rft.render()
+        # the screen only writes the changed lines, so every line that differs must be listed
+        assert {y for y in range(len(lines)) if lines[y] != previous[y]} <= set(frame.changed_lines)
+        frames.append('\n'.join(lines))
+        previous = lines
+    assert frames == expected
+    assert frames[-1] == '\n'.join(to_scene.get_rendered())
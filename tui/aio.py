@@ -0,0 +1,201 @@
+"""
+Contains the asyncio variants of Scene and Screen. Animations are tasks, the keyboard is an async stream of key events,
+and the screen is flushed by a single render tick, so that several things can happen on the screen at the same time.
+Scenes with a synchronous play() run unchanged on the thread of the event loop, blocking it while they play.
+"""
+
+import asyncio
+import collections
+from typing import Iterable
+
+from tui.scene import Scene
+from tui.screen import Screen
+from tui.keyboard import KeyboardReader, KeyEvent, Keys
+import tui.transitions as transitions
+
+
+class AsyncScene(Scene):
+    """
+    The base class for a scene played with asyncio. Override play_async() rather than play().
+    Calling render() only marks the screen for the next render tick, so tasks may render as often as they like.
+    """
+
+    async def play_async(self):
+        """
+        The coroutine for starting the scene.
+        """
+        return None  # default scene output
+
+    def play(self):
+        """
+        Runs play_async() to completion, so that the scene can be played by a synchronous Screen as well.
+        """
+        return asyncio.run(self.play_async())
+
+
+class KeyStream(object):
+    """
+    An async stream of key presses, e.g. async for event in KeyStream(keyboard).
+    If no keyboard reader is given, lines are read with input() on a worker thread, and every line is streamed as its
+    characters followed by Enter.
+    """
+
+    # how often the keyboard reader is polled while waiting for a key press
+    poll_interval = 0.005
+
+    def __init__(self, keyboard: KeyboardReader | None = None):
+        """
+        Creates a KeyStream.
+        :param keyboard: The running keyboard reader, or None to read lines with input().
+        """
+        self.keyboard = keyboard
+        self.__pending: collections.deque[KeyEvent] = collections.deque() # the rest of a line read with input()
+
+    async def get(self) -> KeyEvent:
+        """
+        Waits for the next key press and takes it.
+        """
+        if self.keyboard is not None:
+            while (event := self.keyboard.poll()) is None:
+                await asyncio.sleep(KeyStream.poll_interval)
+            return event
+
+        if len(self.__pending) == 0:
+            line = await asyncio.to_thread(input) # note that a pending input() cannot be cancelled
+            Screen.notify_external_output()
+            self.__pending.extend(KeyEvent(Keys.CHAR, c) for c in line)
+            self.__pending.append(KeyEvent(Keys.ENTER))
+        return self.__pending.popleft()
+
+    def __aiter__(self) -> 'KeyStream':
+        return self
+
+    async def __anext__(self) -> KeyEvent:
+        return await self.get()
+
+
+class AsyncScreen(object):
+    """
+    Drives a Screen with asyncio. While it is running, scene updates only mark the screen as dirty, and a render tick
+    writes the current scene at most ticks_per_second times per second. Use it in an async with statement, or call
+    start() and stop().
+    """
+
+    def __init__(self, screen: Screen, ticks_per_second: float = 60):
+        """
+        Creates an AsyncScreen.
+        :param screen: The screen to write to.
+        :param ticks_per_second: The maximum number of times the current scene is written per second.
+        """
+        self.screen = screen
+        self.ticks_per_second = ticks_per_second
+
+        # statistics of the render tick
+        self.ticks = 0
+        self.frames_flushed = 0
+
+        self.__dirty = False
+        self.__transitions = 0 # the number of transitions running, which write their own frames
+        self.__tick_task: asyncio.Task | None = None
+
+    @property
+    def running(self) -> bool:
+        return self.__tick_task is not None
+
+    def start(self) -> 'AsyncScreen':
+        """
+        Starts the render tick. Must be called from a running event loop.
+        """
+        if self.__tick_task is None:
+            self.screen.current_scene.register_scene_update_hook(self.__mark_dirty)
+            self.__tick_task = asyncio.get_running_loop().create_task(self.__tick())
+        return self
+
+    async def stop(self):
+        """
+        Stops the render tick and writes the last update of the current scene. The scene updates are written
+        immediately again afterwards.
+        """
+        if self.__tick_task is None:
+            return
+        self.__tick_task.cancel()
+        try:
+            await self.__tick_task
+        except asyncio.CancelledError:
+            pass
+        self.__tick_task = None
+        self.flush()
+        self.screen.current_scene.register_scene_update_hook(self.screen.print_scene)
+
+    def flush(self):
+        """
+        Writes the current scene now if it has been updated since it was last written.
+        """
+        if not self.__dirty or self.__transitions > 0:
+            return
+        self.__dirty = False
+        self.screen.print_scene()
+        self.frames_flushed += 1
+
+    async def transition_into_scene(self, new_scene: Scene, transition: callable = transitions.direct,
+                                    time_per_frame: float = 0.1):
+        """
+        Transition into a new scene, letting other tasks run between the frames. The render tick is paused until the
+        transition finishes; updates of the new scene meanwhile are written afterwards.
+        """
+        self.__transitions += 1
+        try:
+            frames = self.screen._begin_transition(new_scene, transition)
+            new_scene.register_scene_update_hook(self.__mark_dirty)
+            async for frame in self.screen.frame_scheduler.pace_async(frames, time_per_frame,
+                                                                      self.screen._coalesce_frames):
+                self.screen._present_transition_frame(frame)
+            self.screen._end_transition(new_scene)
+        finally:
+            self.__transitions -= 1
+
+    async def play_scene(self):
+        """
+        Plays the current scene and returns its output. An AsyncScene is awaited; any other scene is played by calling
+        its play() on the thread of the event loop, with its updates written immediately as with Screen.play_scene().
+        Rendering is not thread-safe (e.g. the style table and the line caches of RichFormatText), so the scene is not
+        moved to a worker thread: the event loop, and with it the render tick and every other task, is blocked until
+        play() returns.
+        """
+        scene = self.screen.current_scene
+        if isinstance(scene, AsyncScene):
+            return await scene.play_async()
+
+        self.flush() # updates before the scene is played are written before its own
+        scene.register_scene_update_hook(self.screen.print_scene)
+        try:
+            return scene.play()
+        finally:
+            scene.register_scene_update_hook(self.__mark_dirty)
+
+    def animate(self, frames: Iterable, seconds_per_frame: float, apply: callable) -> asyncio.Task:
+        """
+        Starts an animation as a task. Frames are paced by the frame scheduler of the screen, and apply(frame) is
+        called for every frame presented, e.g. to move a control and render the scene.
+        :return: The task, which may be awaited or cancelled.
+        """
+        async def run_animation():
+            async for frame in self.screen.frame_scheduler.pace_async(frames, seconds_per_frame):
+                apply(frame)
+
+        return asyncio.get_running_loop().create_task(run_animation())
+
+    def __mark_dirty(self, _: Scene):
+        self.__dirty = True
+
+    async def __tick(self):
+        while True:
+            await asyncio.sleep(1 / self.ticks_per_second)
+            self.ticks += 1
+            self.flush()
+
+    async def __aenter__(self) -> 'AsyncScreen':
+        return self.start()
+
+    async def __aexit__(self, *_):
+        await self.stop()
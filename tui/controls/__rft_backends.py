@@ -0,0 +1,922 @@
+"""
+Storage backends of RichFormatText. A backend stores the glyphs and the formatting options of every line, while
+RichFormatText only exposes the public API on top of it.
+"""
+
+import re
+from array import array, typecodes
+from bisect import bisect_right
+from itertools import groupby
+from tui.text_formats import ForegroundColours as FColours, BackgroundColours as BColours, TextFormats as TFormats
+
+try:
+    import numpy
+except ImportError: # NumPy is optional, see NumpyBackend
+    numpy = None
+
+# 'u' is deprecated in favour of 'w' since Python 3.13
+GLYPH_TYPECODE = 'w' if 'w' in typecodes else 'u'
+
+
+class StyleTable:
+    """
+    Interns every distinct (fg, bg, tf) style to a small integer id, together with its SGR escape sequence. Ids are
+    shared by all objects and never reused, so comparing two styles is comparing two ints.
+    """
+
+    styles: list[tuple[int, int, int]] = [] # id -> style
+    transparent_ids: set[int] = set() # ids of the styles with a transparent background
+    __ids: dict[tuple[int, int, int], int] = {}
+    __escapes: list[str] = []
+    __escapes_default_bg = None # BColours.DEFAULT when the escapes were built, which replaces transparent backgrounds
+    __blended: dict[int, 'BlendedIds'] = {}
+    __blended_rows: dict[tuple[bytes, bytes], array] = {} # see blend_row()
+    __MAX_BLENDED_ROWS = 1024
+
+    @classmethod
+    def intern(cls, style: tuple[int, int, int]) -> int:
+        """
+        Gets the id of a style, registering it if it is new.
+        """
+        style_id = cls.__ids.get(style)
+        if style_id is None:
+            style = tuple(style)
+            style_id = cls.__ids[style] = len(cls.styles)
+            cls.styles.append(style)
+            cls.__escapes.append(cls.__escape(style))
+            if style[1] == BColours.TRANSPARENT:
+                cls.transparent_ids.add(style_id)
+        return style_id
+
+    @classmethod
+    def escapes(cls) -> list[str]:
+        """
+        Gets the SGR escape sequence of every style by id.
+        """
+        if cls.__escapes_default_bg != BColours.DEFAULT:
+            cls.__escapes_default_bg = BColours.DEFAULT
+            cls.__escapes[:] = [cls.__escape(style) for style in cls.styles]
+        return cls.__escapes
+
+    @classmethod
+    def blended_ids(cls, style_id: int) -> dict[int, int]:
+        """
+        Gets the ids of a style drawn over other styles, by the id of the style underneath, i.e. with the background
+        underneath if its own is transparent. New combinations are interned on lookup.
+        """
+        blended_ids = cls.__blended.get(style_id)
+        if blended_ids is None:
+            blended_ids = cls.__blended[style_id] = BlendedIds(style_id)
+        return blended_ids
+
+    @classmethod
+    def blend_row(cls, ids: array, under_ids: array) -> array:
+        """
+        Gets the ids of a row of styles drawn over another row of the same length, see blended_ids(). Rows are
+        memoised, so that blending the same layer over the same content again is a single lookup.
+        """
+        key = (ids.tobytes(), under_ids.tobytes())
+        blended_row = cls.__blended_rows.get(key)
+        if blended_row is not None:
+            return blended_row
+
+        blended_row = array('H')
+        x = 0
+        for style_id, run in groupby(ids):
+            run_stop = x + len(tuple(run))
+            if style_id in cls.transparent_ids:
+                blended_row.extend(map(cls.blended_ids(style_id).__getitem__, under_ids[x:run_stop]))
+            else:
+                blended_row.extend(array('H', [style_id]) * (run_stop - x))
+            x = run_stop
+        if len(cls.__blended_rows) >= cls.__MAX_BLENDED_ROWS:
+            cls.__blended_rows.clear()
+        cls.__blended_rows[key] = blended_row
+        return blended_row
+
+    @staticmethod
+    def __escape(style: tuple[int, int, int]) -> str:
+        fg, bg, tf = style
+        return f'\033[{tf};{fg};{bg if bg != BColours.TRANSPARENT else BColours.DEFAULT}m'
+
+
+class BlendedIds(dict):
+    """
+    The ids of a style drawn over other styles, by the id of the style underneath, see StyleTable.blended_ids().
+    """
+
+    def __init__(self, style_id: int):
+        super().__init__()
+        self.style_id = style_id
+
+    def __missing__(self, under_id: int) -> int:
+        style_id = self.style_id
+        if style_id in StyleTable.transparent_ids:
+            fg, _, tf = StyleTable.styles[style_id]
+            style_id = StyleTable.intern((fg, StyleTable.styles[under_id][1], tf))
+        self[under_id] = style_id
+        return style_id
+
+
+class ListBackend:
+    """
+    The original storage: one str per line and one (fg, bg, tf) tuple per character.
+    """
+
+    def __init__(self, lines: list[str]):
+        self.__DEFAULT_FORMAT = (FColours.DEFAULT, BColours.TRANSPARENT, TFormats.DEFAULT)
+
+        self.lines: list[str] = lines
+        self.format_options: list[list[tuple[int, int, int]]] = []
+        self.clear_formats()
+
+    def __len__(self) -> int:
+        return len(self.lines)
+
+    def copy(self) -> 'ListBackend':
+        backend = ListBackend(self.lines.copy())
+        backend.format_options = [line.copy() for line in self.format_options]
+        return backend
+
+    def get_line(self, index: int) -> str:
+        return self.lines[index]
+
+    def line_length(self, index: int) -> int:
+        return len(self.lines[index])
+
+    def set_line(self, index: int, item: str):
+        self.lines[index] = item
+
+        # adjusts formatting options
+        len_diff = len(item) - len(self.format_options[index])
+        if len_diff > 0: # longer than original text
+            self.format_options[index].extend(self.__DEFAULT_FORMAT for _ in range(len_diff + 1))
+        elif len_diff < 0: # shorter than original text
+            self.format_options[index] = self.format_options[index][:len_diff]
+
+    def append_line(self, text: str):
+        self.lines.append(text)
+        self.format_options.append([self.__DEFAULT_FORMAT for _ in range(len(text))])
+
+    def clear_formats(self):
+        self.format_options = []
+        for line in self.lines:
+            self.format_options.append([self.__DEFAULT_FORMAT for _ in range(len(line))])
+
+    def get_formats(self, line: int, get_range: slice) -> list[tuple[int, int, int]]:
+        return self.format_options[line][get_range]
+
+    def set_formats(self, line: int, format_range: slice, foreground, background, text_format):
+        for i in range(*format_range.indices(len(self.format_options[line]))):
+            # keep original format if not specified
+            foreground = self.format_options[line][i][0] if foreground is None else foreground
+            background = self.format_options[line][i][1] if background is None else background
+            text_format = self.format_options[line][i][2] if text_format is None else text_format
+
+            self.format_options[line][i] = (foreground, background, text_format)
+
+    def set_line_formats(self, line: int, formats: list[tuple[int, int, int]]):
+        self.format_options[line] = formats
+
+    def read_row(self, line: int, start: int, stop: int) -> tuple[str, list[tuple[int, int, int]]]:
+        return self.lines[line][start:stop], self.format_options[line][start:stop]
+
+    def blit_row(self, source, source_line: int, source_index: int, line: int, index: int, length: int,
+                 copy_text: bool, copy_formats: bool, blend_background: bool = True):
+        text, formats = source.read_row(source_line, source_index, source_index + length)
+        if copy_text:
+            self.set_line(line, self.lines[line][:index] + text + self.lines[line][index + length:])
+        if copy_formats:
+            row = self.format_options[line]
+            if blend_background: # handle transparent background
+                transparent = BColours.TRANSPARENT
+                formats = [option if option[1] != transparent else (option[0], under[1], option[2])
+                           for option, under in zip(formats, row[index:index + len(formats)])]
+            row[index:index + len(formats)] = formats
+
+    def blit_rows(self, source, rows: list[tuple[int, int, int, int, int]], copy_text: bool, copy_formats: bool,
+                  blend_background: bool = True):
+        """
+        Copies a rectangle given as rows of (source line, source index, line, index, length), see blit_row().
+        """
+        for source_line, source_index, line, index, length in rows:
+            self.blit_row(source, source_line, source_index, line, index, length, copy_text, copy_formats,
+                          blend_background)
+
+    def line_key(self, line: int) -> tuple:
+        """
+        Gets a hashable key of everything render_line() depends on, i.e. the text and the formats of its characters.
+        """
+        text = self.lines[line]
+        return text, tuple(self.format_options[line][:len(text)])
+
+    def render_line(self, line: int) -> str:
+        output_line = ''
+        for index, (char, option) in enumerate(list(zip(self.lines[line], self.format_options[line]))):
+            fg, bg, tf = option
+            if bg == BColours.TRANSPARENT:
+                bg = BColours.DEFAULT
+            if index > 0 and self.format_options[line][index - 1] == option:
+                output_line += char
+            else:
+                output_line += f'\033[{tf};{fg};{bg}m{char}'
+        output_line += '\033[0;39;49m' # ANSI code for resetting formats to default
+        return output_line
+
+
+class ArrayBackend:
+    """
+    A compact storage that keeps one array plane per line for each of glyphs, foregrounds, backgrounds and text
+    formats. No tuple is allocated per character.
+    """
+
+    # runs of transparent backgrounds in the bytes of a background plane: -1 is the only value with 0xff bytes, as
+    # backgrounds are otherwise SGR parameters
+    __TRANSPARENT_RUNS = re.compile(rb'(?:\xff\xff)+')
+
+    # text formats are not necessarily integers (e.g. TextFormats.UNDERLINE_AND_BOLD), hence stored as indices
+    __text_formats: list = []
+    __text_format_indices: dict = {}
+
+    def __init__(self, lines: list[str]):
+        self.glyphs: list[array] = [array(GLYPH_TYPECODE, line) for line in lines]
+        self.foregrounds: list[array] = []
+        self.backgrounds: list[array] = []
+        self.text_formats: list[array] = []
+        self.clear_formats()
+
+    @classmethod
+    def tf_index(cls, text_format) -> int:
+        index = cls.__text_format_indices.get(text_format)
+        if index is None:
+            index = cls.__text_format_indices[text_format] = len(cls.__text_formats)
+            cls.__text_formats.append(text_format)
+        return index
+
+    @classmethod
+    def tf_value(cls, index: int):
+        return cls.__text_formats[index]
+
+    def __len__(self) -> int:
+        return len(self.glyphs)
+
+    def __default_planes(self, length: int) -> tuple[array, array, array]:
+        return (array('h', [FColours.DEFAULT]) * length,
+                array('h', [BColours.TRANSPARENT]) * length,
+                array('B', [self.tf_index(TFormats.DEFAULT)]) * length)
+
+    def copy(self) -> 'ArrayBackend':
+        backend = ArrayBackend([])
+        backend.glyphs = [array(GLYPH_TYPECODE, line) for line in self.glyphs]
+        backend.foregrounds = [array('h', line) for line in self.foregrounds]
+        backend.backgrounds = [array('h', line) for line in self.backgrounds]
+        backend.text_formats = [array('B', line) for line in self.text_formats]
+        return backend
+
+    def get_line(self, index: int) -> str:
+        return self.glyphs[index].tounicode()
+
+    def line_length(self, index: int) -> int:
+        return len(self.glyphs[index])
+
+    def __resize_formats(self, index: int, length: int):
+        # same rules as ListBackend.set_line(), so that both backends index formats identically
+        len_diff = length - len(self.foregrounds[index])
+        if len_diff > 0:
+            fg, bg, tf = self.__default_planes(len_diff + 1)
+            self.foregrounds[index].extend(fg)
+            self.backgrounds[index].extend(bg)
+            self.text_formats[index].extend(tf)
+        elif len_diff < 0:
+            del self.foregrounds[index][len_diff:]
+            del self.backgrounds[index][len_diff:]
+            del self.text_formats[index][len_diff:]
+
+    def set_line(self, index: int, item: str):
+        self.glyphs[index] = array(GLYPH_TYPECODE, item)
+        self.__resize_formats(index, len(item))
+
+    def append_line(self, text: str):
+        self.glyphs.append(array(GLYPH_TYPECODE, text))
+        fg, bg, tf = self.__default_planes(len(text))
+        self.foregrounds.append(fg)
+        self.backgrounds.append(bg)
+        self.text_formats.append(tf)
+
+    def clear_formats(self):
+        self.foregrounds, self.backgrounds, self.text_formats = [], [], []
+        for line in self.glyphs:
+            fg, bg, tf = self.__default_planes(len(line))
+            self.foregrounds.append(fg)
+            self.backgrounds.append(bg)
+            self.text_formats.append(tf)
+
+    def get_formats(self, line: int, get_range: slice) -> list[tuple[int, int, int]]:
+        return list(zip(self.foregrounds[line][get_range], self.backgrounds[line][get_range],
+                        map(self.tf_value, self.text_formats[line][get_range])))
+
+    def set_formats(self, line: int, format_range: slice, foreground, background, text_format):
+        fg_plane, bg_plane, tf_plane = self.foregrounds[line], self.backgrounds[line], self.text_formats[line]
+        indices = range(*format_range.indices(len(fg_plane)))
+        if len(indices) == 0:
+            return
+        # unspecified options are taken from the first character in range, then applied to the whole range
+        first = indices[0]
+        foreground = fg_plane[first] if foreground is None else foreground
+        background = bg_plane[first] if background is None else background
+        tf = tf_plane[first] if text_format is None else self.tf_index(text_format)
+        if indices.step == 1:
+            fg_plane[indices.start:indices.stop] = array('h', [foreground]) * len(indices)
+            bg_plane[indices.start:indices.stop] = array('h', [background]) * len(indices)
+            tf_plane[indices.start:indices.stop] = array('B', [tf]) * len(indices)
+        else:
+            for i in indices:
+                fg_plane[i], bg_plane[i], tf_plane[i] = foreground, background, tf
+
+    def set_line_formats(self, line: int, formats: list[tuple[int, int, int]]):
+        self.foregrounds[line] = array('h', (fg for fg, _, _ in formats))
+        self.backgrounds[line] = array('h', (bg for _, bg, _ in formats))
+        self.text_formats[line] = array('B', (self.tf_index(tf) for _, _, tf in formats))
+
+    def read_row(self, line: int, start: int, stop: int) -> tuple[str, list[tuple[int, int, int]]]:
+        return self.glyphs[line][start:stop].tounicode(), self.get_formats(line, slice(start, stop))
+
+    def blit_row(self, source, source_line: int, source_index: int, line: int, index: int, length: int,
+                 copy_text: bool, copy_formats: bool, blend_background: bool = True):
+        stop, source_stop = index + length, source_index + length
+        if not isinstance(source, ArrayBackend):
+            text, formats = source.read_row(source_line, source_index, source_stop)
+            if copy_text:
+                self.glyphs[line][index:stop] = array(GLYPH_TYPECODE, text)
+                self.__resize_formats(line, len(self.glyphs[line]))
+            if copy_formats:
+                fg_plane, bg_plane, tf_plane = self.foregrounds[line], self.backgrounds[line], self.text_formats[line]
+                for x, (fg, bg, tf) in enumerate(formats, index):
+                    fg_plane[x] = fg
+                    if bg != BColours.TRANSPARENT or not blend_background:
+                        bg_plane[x] = bg
+                    tf_plane[x] = self.tf_index(tf)
+            return
+
+        if copy_text:
+            self.glyphs[line][index:stop] = source.glyphs[source_line][source_index:source_stop]
+            self.__resize_formats(line, len(self.glyphs[line]))
+        if copy_formats:
+            self.foregrounds[line][index:stop] = source.foregrounds[source_line][source_index:source_stop]
+            self.text_formats[line][index:stop] = source.text_formats[source_line][source_index:source_stop]
+            backgrounds = source.backgrounds[source_line][source_index:source_stop]
+            if not blend_background or BColours.TRANSPARENT not in backgrounds:
+                self.backgrounds[line][index:stop] = backgrounds
+            else: # handle transparent background, copying only what lies between runs of transparent backgrounds
+                bg_plane = self.backgrounds[line]
+                start = 0
+                for run in self.__TRANSPARENT_RUNS.finditer(backgrounds.tobytes()):
+                    run_start, run_stop = run.start() // backgrounds.itemsize, run.end() // backgrounds.itemsize
+                    bg_plane[index + start:index + run_start] = backgrounds[start:run_start]
+                    start = run_stop
+                bg_plane[index + start:stop] = backgrounds[start:]
+
+    def blit_rows(self, source, rows: list[tuple[int, int, int, int, int]], copy_text: bool, copy_formats: bool,
+                  blend_background: bool = True):
+        for source_line, source_index, line, index, length in rows:
+            self.blit_row(source, source_line, source_index, line, index, length, copy_text, copy_formats,
+                          blend_background)
+
+    def line_key(self, line: int) -> tuple:
+        length = len(self.glyphs[line])
+        return (self.glyphs[line].tounicode(), self.foregrounds[line][:length].tobytes(),
+                self.backgrounds[line][:length].tobytes(), self.text_formats[line][:length].tobytes())
+
+    def render_line(self, line: int) -> str:
+        output = []
+        previous = None
+        for char, fg, bg, tf in zip(self.glyphs[line], self.foregrounds[line], self.backgrounds[line],
+                                    self.text_formats[line]):
+            option = (fg, bg, tf)
+            if option == previous:
+                output.append(char)
+                continue
+            previous = option
+            output.append(f'\033[{self.tf_value(tf)};{fg};{bg if bg != BColours.TRANSPARENT else BColours.DEFAULT}m{char}')
+        output.append('\033[0;39;49m') # ANSI code for resetting formats to default
+        return ''.join(output)
+
+
+class SpansBackend:
+    """
+    A run-length encoded storage. Each line keeps its text as a str, and its formats as sorted runs, i.e. the start
+    index and the format of every run of identical formats. Adjacent runs never share the same format.
+    """
+
+    def __init__(self, lines: list[str]):
+        self.__DEFAULT_FORMAT = (FColours.DEFAULT, BColours.TRANSPARENT, TFormats.DEFAULT)
+
+        self.lines: list[str] = lines
+        self.format_lengths: list[int] = []
+        self.run_starts: list[list[int]] = []
+        self.run_formats: list[list[tuple[int, int, int]]] = []
+        self.clear_formats()
+
+    def __len__(self) -> int:
+        return len(self.lines)
+
+    def copy(self) -> 'SpansBackend':
+        backend = SpansBackend([])
+        backend.lines = self.lines.copy()
+        backend.format_lengths = self.format_lengths.copy()
+        backend.run_starts = [starts.copy() for starts in self.run_starts]
+        backend.run_formats = [formats.copy() for formats in self.run_formats]
+        return backend
+
+    def get_line(self, index: int) -> str:
+        return self.lines[index]
+
+    def line_length(self, index: int) -> int:
+        return len(self.lines[index])
+
+    def __resize_formats(self, index: int, length: int):
+        # same rules as ListBackend.set_line(), so that all backends index formats identically
+        len_diff = length - self.format_lengths[index]
+        starts, formats = self.run_starts[index], self.run_formats[index]
+        if len_diff > 0:
+            if len(formats) == 0 or formats[-1] != self.__DEFAULT_FORMAT:
+                starts.append(self.format_lengths[index])
+                formats.append(self.__DEFAULT_FORMAT)
+            self.format_lengths[index] += len_diff + 1
+        elif len_diff < 0:
+            self.format_lengths[index] += len_diff
+            keep = bisect_right(starts, self.format_lengths[index] - 1)
+            del starts[keep:], formats[keep:]
+
+    def set_line(self, index: int, item: str):
+        self.lines[index] = item
+        self.__resize_formats(index, len(item))
+
+    def append_line(self, text: str):
+        self.lines.append(text)
+        self.format_lengths.append(len(text))
+        self.run_starts.append([0] if len(text) > 0 else [])
+        self.run_formats.append([self.__DEFAULT_FORMAT] if len(text) > 0 else [])
+
+    def clear_formats(self):
+        lines = self.lines
+        self.lines, self.format_lengths, self.run_starts, self.run_formats = [], [], [], []
+        for line in lines:
+            self.append_line(line)
+
+    def read_runs(self, line: int, start: int, stop: int) -> list[tuple[int, int, tuple[int, int, int]]]:
+        """
+        Gets the runs within [start, stop) as (start, stop, format), clipped to the range.
+        """
+        starts, formats = self.run_starts[line], self.run_formats[line]
+        runs = []
+        for i in range(max(bisect_right(starts, start) - 1, 0), len(starts)):
+            if starts[i] >= stop:
+                break
+            run_stop = starts[i + 1] if i + 1 < len(starts) else self.format_lengths[line]
+            runs.append((max(starts[i], start), min(run_stop, stop), formats[i]))
+        return runs
+
+    def __replace_runs(self, line: int, start: int, stop: int, runs: list[tuple[int, tuple[int, int, int]]]):
+        """
+        Replaces the formats within [start, stop) by runs, given as (start, format) covering the whole range.
+        Runs are split and merged with the neighbouring ones.
+        """
+        starts, formats = self.run_starts[line], self.run_formats[line]
+        first = bisect_right(starts, start) - 1
+        last = bisect_right(starts, stop) - 1 if stop < self.format_lengths[line] else len(starts) - 1
+
+        new_starts, new_formats = [], []
+        if starts[first] < start: # keeps the head of the first run
+            new_starts.append(starts[first])
+            new_formats.append(formats[first])
+        for run_start, run_format in runs:
+            new_starts.append(run_start)
+            new_formats.append(run_format)
+        if stop < self.format_lengths[line]: # keeps the tail of the last run
+            new_starts.append(stop)
+            new_formats.append(formats[last])
+        starts[first:last + 1] = new_starts
+        formats[first:last + 1] = new_formats
+
+        # merges neighbouring runs with identical formats
+        for i in range(min(first + len(new_starts), len(starts) - 1), max(first, 1) - 1, -1):
+            if formats[i] == formats[i - 1]:
+                del starts[i], formats[i]
+
+    def get_formats(self, line: int, get_range: slice) -> list[tuple[int, int, int]]:
+        formats = []
+        for start, stop, option in self.read_runs(line, 0, self.format_lengths[line]):
+            formats.extend(option for _ in range(stop - start))
+        return formats[get_range]
+
+    def set_formats(self, line: int, format_range: slice, foreground, background, text_format):
+        indices = range(*format_range.indices(self.format_lengths[line]))
+        if len(indices) == 0:
+            return
+        # unspecified options are taken from the first character in range, then applied to the whole range
+        starts, formats = self.run_starts[line], self.run_formats[line]
+        original = formats[bisect_right(starts, indices[0]) - 1]
+        option = (original[0] if foreground is None else foreground,
+                  original[1] if background is None else background,
+                  original[2] if text_format is None else text_format)
+        if indices.step == 1:
+            self.__replace_runs(line, indices.start, indices.stop, [(indices.start, option)])
+        else:
+            for i in indices:
+                self.__replace_runs(line, i, i + 1, [(i, option)])
+
+    def set_line_formats(self, line: int, formats: list[tuple[int, int, int]]):
+        self.format_lengths[line] = len(formats)
+        self.run_starts[line], self.run_formats[line] = [], []
+        for i, option in enumerate(formats):
+            if i == 0 or option != formats[i - 1]:
+                self.run_starts[line].append(i)
+                self.run_formats[line].append(option)
+
+    def read_row(self, line: int, start: int, stop: int) -> tuple[str, list[tuple[int, int, int]]]:
+        formats = []
+        for run_start, run_stop, option in self.read_runs(line, start, stop):
+            formats.extend(option for _ in range(run_stop - run_start))
+        return self.lines[line][start:stop], formats
+
+    def blit_row(self, source, source_line: int, source_index: int, line: int, index: int, length: int,
+                 copy_text: bool, copy_formats: bool, blend_background: bool = True):
+        stop, offset = index + length, index - source_index
+        if copy_text:
+            text = source.get_line(source_line)[source_index:source_index + length]
+            self.set_line(line, self.lines[line][:index] + text + self.lines[line][stop:])
+        if not copy_formats:
+            return
+
+        if isinstance(source, SpansBackend):
+            source_runs = [(start + offset, run_stop + offset, option)
+                           for start, run_stop, option in source.read_runs(source_line, source_index,
+                                                                            source_index + length)]
+        else:
+            source_runs = []
+            for x, option in enumerate(source.read_row(source_line, source_index, source_index + length)[1], index):
+                if len(source_runs) > 0 and source_runs[-1][2] == option:
+                    source_runs[-1] = (source_runs[-1][0], x + 1, option)
+                else:
+                    source_runs.append((x, x + 1, option))
+
+        runs = []
+        for start, run_stop, (fg, bg, tf) in source_runs:
+            if bg != BColours.TRANSPARENT or not blend_background:
+                runs.append((start, (fg, bg, tf)))
+            else: # handle transparent background
+                runs.extend((target_start, (fg, target_bg, tf))
+                            for target_start, _, (_, target_bg, _) in self.read_runs(line, start, run_stop))
+        self.__replace_runs(line, index, stop, runs)
+
+    def blit_rows(self, source, rows: list[tuple[int, int, int, int, int]], copy_text: bool, copy_formats: bool,
+                  blend_background: bool = True):
+        for source_line, source_index, line, index, length in rows:
+            self.blit_row(source, source_line, source_index, line, index, length, copy_text, copy_formats,
+                          blend_background)
+
+    def line_key(self, line: int) -> tuple:
+        text = self.lines[line]
+        return text, tuple(self.read_runs(line, 0, len(text)))
+
+    def render_line(self, line: int) -> str:
+        text = self.lines[line]
+        output = []
+        for start, stop, (fg, bg, tf) in self.read_runs(line, 0, len(text)):
+            if bg == BColours.TRANSPARENT:
+                bg = BColours.DEFAULT
+            output.append(f'\033[{tf};{fg};{bg}m{text[start:stop]}')
+        output.append('\033[0;39;49m') # ANSI code for resetting formats to default
+        return ''.join(output)
+
+
+class StylesBackend:
+    """
+    One str per line and one interned style id (see StyleTable) per character, kept in an array, so that a character
+    takes two bytes of formats and rendering looks up prebuilt escape sequences.
+    """
+
+    def __init__(self, lines: list[str]):
+        self.__DEFAULT_ID = StyleTable.intern((FColours.DEFAULT, BColours.TRANSPARENT, TFormats.DEFAULT))
+
+        self.lines: list[str] = lines
+        self.style_ids: list[array] = []
+        self.clear_formats()
+
+    def __len__(self) -> int:
+        return len(self.lines)
+
+    def copy(self) -> 'StylesBackend':
+        backend = StylesBackend([])
+        backend.lines = self.lines.copy()
+        backend.style_ids = [array('H', line) for line in self.style_ids]
+        return backend
+
+    def get_line(self, index: int) -> str:
+        return self.lines[index]
+
+    def line_length(self, index: int) -> int:
+        return len(self.lines[index])
+
+    def __resize_formats(self, index: int, length: int):
+        # same rules as ListBackend.set_line(), so that all backends index formats identically
+        len_diff = length - len(self.style_ids[index])
+        if len_diff > 0:
+            self.style_ids[index].extend(array('H', [self.__DEFAULT_ID]) * (len_diff + 1))
+        elif len_diff < 0:
+            del self.style_ids[index][len_diff:]
+
+    def set_line(self, index: int, item: str):
+        self.lines[index] = item
+        self.__resize_formats(index, len(item))
+
+    def append_line(self, text: str):
+        self.lines.append(text)
+        self.style_ids.append(array('H', [self.__DEFAULT_ID]) * len(text))
+
+    def clear_formats(self):
+        self.style_ids = [array('H', [self.__DEFAULT_ID]) * len(line) for line in self.lines]
+
+    def get_formats(self, line: int, get_range: slice) -> list[tuple[int, int, int]]:
+        return list(map(StyleTable.styles.__getitem__, self.style_ids[line][get_range]))
+
+    def set_formats(self, line: int, format_range: slice, foreground, background, text_format):
+        ids = self.style_ids[line]
+        indices = range(*format_range.indices(len(ids)))
+        if len(indices) == 0:
+            return
+        # unspecified options are taken from the first character in range, then applied to the whole range
+        original = StyleTable.styles[ids[indices[0]]]
+        style_id = StyleTable.intern((original[0] if foreground is None else foreground,
+                                      original[1] if background is None else background,
+                                      original[2] if text_format is None else text_format))
+        if indices.step == 1:
+            ids[indices.start:indices.stop] = array('H', [style_id]) * len(indices)
+        else:
+            for i in indices:
+                ids[i] = style_id
+
+    def set_line_formats(self, line: int, formats: list[tuple[int, int, int]]):
+        self.style_ids[line] = array('H', map(StyleTable.intern, formats))
+
+    def read_row(self, line: int, start: int, stop: int) -> tuple[str, list[tuple[int, int, int]]]:
+        return self.lines[line][start:stop], self.get_formats(line, slice(start, stop))
+
+    def blit_row(self, source, source_line: int, source_index: int, line: int, index: int, length: int,
+                 copy_text: bool, copy_formats: bool, blend_background: bool = True):
+        stop, source_stop = index + length, source_index + length
+        if copy_text:
+            text = source.get_line(source_line)[source_index:source_stop]
+            self.set_line(line, self.lines[line][:index] + text + self.lines[line][stop:])
+        if not copy_formats:
+            return
+
+        if isinstance(source, StylesBackend):
+            source_ids = source.style_ids[source_line][source_index:source_stop]
+        else:
+            source_ids = array('H', map(StyleTable.intern, source.read_row(source_line, source_index, source_stop)[1]))
+        ids = self.style_ids[line]
+        if not blend_background or StyleTable.transparent_ids.isdisjoint(source_ids):
+            ids[index:stop] = source_ids
+            return
+        ids[index:stop] = StyleTable.blend_row(source_ids, ids[index:stop]) # handle transparent background
+
+    def blit_rows(self, source, rows: list[tuple[int, int, int, int, int]], copy_text: bool, copy_formats: bool,
+                  blend_background: bool = True):
+        for source_line, source_index, line, index, length in rows:
+            self.blit_row(source, source_line, source_index, line, index, length, copy_text, copy_formats,
+                          blend_background)
+
+    def line_key(self, line: int) -> tuple:
+        text = self.lines[line]
+        return text, self.style_ids[line][:len(text)].tobytes()
+
+    def render_line(self, line: int) -> str:
+        escapes = StyleTable.escapes()
+        output = []
+        previous = None
+        for char, style_id in zip(self.lines[line], self.style_ids[line]):
+            if style_id != previous:
+                previous = style_id
+                output.append(escapes[style_id])
+            output.append(char)
+        output.append('\033[0;39;49m') # ANSI code for resetting formats to default
+        return ''.join(output)
+
+
+class NumpyBackend:
+    """
+    Glyphs (as code points) and style ids (see StyleTable) in two 2-D NumPy arrays with one row per line, so that a
+    rectangle is copied, and its transparent backgrounds blended, as a few array operations. Rows are padded to the
+    width of the arrays, while the lengths of the text and of the formats of every line are kept aside.
+    Requires NumPy; if it is not installed, the 'numpy' backend is StylesBackend, which renders identically.
+    """
+
+    # lookup tables indexed by style id, see __blend()
+    __is_transparent = ()
+    __blended_id_tables: dict = {}
+
+    def __init__(self, lines: list[str]):
+        self.__DEFAULT_ID = StyleTable.intern((FColours.DEFAULT, BColours.TRANSPARENT, TFormats.DEFAULT))
+
+        self.text_lengths: list[int] = [len(line) for line in lines]
+        self.format_lengths: list[int] = self.text_lengths.copy()
+        width = max(self.text_lengths, default=0)
+        self.glyphs = numpy.zeros((len(lines), width), numpy.uint32)
+        for y, line in enumerate(lines):
+            self.glyphs[y, :len(line)] = self.__code_points(line)
+        self.style_ids = numpy.full((len(lines), width), self.__DEFAULT_ID, numpy.uint16)
+
+    @staticmethod
+    def __code_points(text: str):
+        return numpy.frombuffer(text.encode('utf-32-le', 'surrogatepass'), numpy.uint32)
+
+    @staticmethod
+    def __text(code_points) -> str:
+        return code_points.astype('<u4').tobytes().decode('utf-32-le', 'surrogatepass')
+
+    def __ensure_width(self, width: int):
+        if width > self.glyphs.shape[1]:
+            padding = ((0, 0), (0, max(width, 2 * self.glyphs.shape[1]) - self.glyphs.shape[1]))
+            self.glyphs = numpy.pad(self.glyphs, padding)
+            self.style_ids = numpy.pad(self.style_ids, padding, constant_values=self.__DEFAULT_ID)
+
+    def __len__(self) -> int:
+        return len(self.text_lengths)
+
+    def copy(self) -> 'NumpyBackend':
+        backend = NumpyBackend([])
+        backend.text_lengths = self.text_lengths.copy()
+        backend.format_lengths = self.format_lengths.copy()
+        backend.glyphs = self.glyphs.copy()
+        backend.style_ids = self.style_ids.copy()
+        return backend
+
+    def get_line(self, index: int) -> str:
+        return self.__text(self.glyphs[index, :self.text_lengths[index]])
+
+    def line_length(self, index: int) -> int:
+        return self.text_lengths[index]
+
+    def __resize_formats(self, index: int, length: int):
+        # same rules as ListBackend.set_line(), so that all backends index formats identically
+        len_diff = length - self.format_lengths[index]
+        if len_diff > 0:
+            self.__ensure_width(length + 1)
+            self.style_ids[index, self.format_lengths[index]:length + 1] = self.__DEFAULT_ID
+            self.format_lengths[index] = length + 1
+        elif len_diff < 0:
+            self.format_lengths[index] = length
+
+    def set_line(self, index: int, item: str):
+        self.__ensure_width(len(item))
+        self.glyphs[index, :len(item)] = self.__code_points(item)
+        self.text_lengths[index] = len(item)
+        self.__resize_formats(index, len(item))
+
+    def append_line(self, text: str):
+        self.__ensure_width(len(text))
+        self.glyphs = numpy.vstack((self.glyphs, numpy.zeros((1, self.glyphs.shape[1]), numpy.uint32)))
+        self.style_ids = numpy.vstack((self.style_ids,
+                                       numpy.full((1, self.style_ids.shape[1]), self.__DEFAULT_ID, numpy.uint16)))
+        self.glyphs[-1, :len(text)] = self.__code_points(text)
+        self.text_lengths.append(len(text))
+        self.format_lengths.append(len(text))
+
+    def clear_formats(self):
+        self.style_ids.fill(self.__DEFAULT_ID)
+        self.format_lengths = self.text_lengths.copy()
+
+    def get_formats(self, line: int, get_range: slice) -> list[tuple[int, int, int]]:
+        ids = self.style_ids[line, :self.format_lengths[line]][get_range]
+        return list(map(StyleTable.styles.__getitem__, ids.tolist()))
+
+    def set_formats(self, line: int, format_range: slice, foreground, background, text_format):
+        ids = self.style_ids[line, :self.format_lengths[line]]
+        indices = range(*format_range.indices(len(ids)))
+        if len(indices) == 0:
+            return
+        # unspecified options are taken from the first character in range, then applied to the whole range
+        original = StyleTable.styles[ids[indices[0]]]
+        style_id = StyleTable.intern((original[0] if foreground is None else foreground,
+                                      original[1] if background is None else background,
+                                      original[2] if text_format is None else text_format))
+        if indices.step == 1:
+            ids[indices.start:indices.stop] = style_id
+        else:
+            ids[numpy.arange(indices.start, indices.stop, indices.step)] = style_id
+
+    def set_line_formats(self, line: int, formats: list[tuple[int, int, int]]):
+        self.__ensure_width(len(formats))
+        self.style_ids[line, :len(formats)] = [StyleTable.intern(option) for option in formats]
+        self.format_lengths[line] = len(formats)
+
+    def read_row(self, line: int, start: int, stop: int) -> tuple[str, list[tuple[int, int, int]]]:
+        return self.get_line(line)[start:stop], self.get_formats(line, slice(start, stop))
+
+    def blit_row(self, source, source_line: int, source_index: int, line: int, index: int, length: int,
+                 copy_text: bool, copy_formats: bool, blend_background: bool = True):
+        self.blit_rows(source, [(source_line, source_index, line, index, length)], copy_text, copy_formats,
+                       blend_background)
+
+    def blit_rows(self, source, rows: list[tuple[int, int, int, int, int]], copy_text: bool, copy_formats: bool,
+                  blend_background: bool = True):
+        if not isinstance(source, NumpyBackend):
+            source = NumpyBackend.__from_rows(source, rows, copy_text, copy_formats)
+            rows = [(i, 0, line, index, length) for i, (_, _, line, index, length) in enumerate(rows)]
+
+        # consecutive rows with the same extent are copied as a block
+        first = 0
+        for i in range(1, len(rows) + 1):
+            if (i < len(rows) and rows[i][1] == rows[first][1] and rows[i][3:] == rows[first][3:]
+                    and rows[i][0] - rows[first][0] == rows[i][2] - rows[first][2] == i - first):
+                continue
+            source_line, source_index, line, index, length = rows[first]
+            source_block = (slice(source_line, source_line + i - first), slice(source_index, source_index + length))
+            block = (slice(line, line + i - first), slice(index, index + length))
+            if copy_text:
+                self.glyphs[block] = source.glyphs[source_block]
+                for y in range(line, line + i - first): # same rules as ListBackend.blit_row(), via set_line()
+                    self.__resize_formats(y, self.text_lengths[y])
+            if copy_formats:
+                ids = source.style_ids[source_block]
+                self.style_ids[block] = self.__blend(ids, self.style_ids[block]) if blend_background else ids
+            first = i
+
+    @staticmethod
+    def __from_rows(source, rows: list[tuple[int, int, int, int, int]], copy_text: bool, copy_formats: bool):
+        """
+        Converts the rows of another backend to a NumpyBackend with one line per row.
+        """
+        backend = NumpyBackend([])
+        texts = []
+        for i, (source_line, source_index, _, _, length) in enumerate(rows):
+            text, formats = source.read_row(source_line, source_index, source_index + length)
+            texts.append(text if copy_text else ' ' * length)
+            backend.append_line(texts[-1])
+            if copy_formats:
+                backend.set_line_formats(i, formats)
+        return backend
+
+    @classmethod
+    def __blend(cls, ids, under_ids):
+        """
+        Gets the ids of styles drawn over other styles, see StyleTable.blended_ids(), using lookup tables indexed by
+        style id.
+        """
+        if len(cls.__is_transparent) != len(StyleTable.styles): # new styles have been interned
+            cls.__is_transparent = numpy.zeros(len(StyleTable.styles), numpy.bool_)
+            cls.__is_transparent[list(StyleTable.transparent_ids)] = True
+        transparent = cls.__is_transparent[ids]
+        if not transparent.any():
+            return ids
+
+        transparent_ids, under_transparent_ids = ids[transparent], under_ids[transparent]
+        first, last = int(transparent_ids.min()), int(transparent_ids.max())
+        if first == last: # usually a layer has a single transparent style
+            blended_transparent_ids = cls.__blended_ids(first, under_transparent_ids)[under_transparent_ids]
+        else:
+            blended_transparent_ids = transparent_ids.copy()
+            for style_id in numpy.unique(transparent_ids).tolist():
+                cells = transparent_ids == style_id
+                under = under_transparent_ids[cells]
+                blended_transparent_ids[cells] = cls.__blended_ids(style_id, under)[under]
+        blended = ids.copy()
+        blended[transparent] = blended_transparent_ids
+        return blended
+
+    @classmethod
+    def __blended_ids(cls, style_id: int, under_ids):
+        """
+        Gets the lookup table of StyleTable.blended_ids(style_id), covering at least the given ids underneath.
+        """
+        blended_ids = cls.__blended_id_tables.get(style_id)
+        if blended_ids is None or len(blended_ids) <= under_ids.max():
+            blended_ids = cls.__blended_id_tables[style_id] = numpy.fromiter(
+                map(StyleTable.blended_ids(style_id).__getitem__, range(len(StyleTable.styles))), numpy.uint16)
+        return blended_ids
+
+    def line_key(self, line: int) -> tuple:
+        text = self.get_line(line)
+        return text, self.style_ids[line, :min(len(text), self.format_lengths[line])].tobytes()
+
+    def render_line(self, line: int) -> str:
+        escapes = StyleTable.escapes()
+        text = self.get_line(line)
+        ids = self.style_ids[line, :min(len(text), self.format_lengths[line])]
+        starts = [0, *(numpy.flatnonzero(ids[1:] != ids[:-1]) + 1).tolist()] if len(ids) > 0 else []
+        stops = starts[1:] + [len(ids)]
+        output = [escapes[style_id] + text[start:stop]
+                  for style_id, start, stop in zip(ids[starts].tolist(), starts, stops)]
+        output.append('\033[0;39;49m') # ANSI code for resetting formats to default
+        return ''.join(output)
+
+
+BACKENDS = {
+    'styles': StylesBackend,
+    'list': ListBackend,
+    'array': ArrayBackend,
+    'spans': SpansBackend,
+    'numpy': NumpyBackend if numpy is not None else StylesBackend,
+}
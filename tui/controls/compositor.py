@@ -0,0 +1,85 @@
+"""
+Contains the compositor that draws the layers of controls onto a canvas, recomposing only the damaged rectangles.
+"""
+
+from tui.controls.control import Control
+from tui.controls.rich_format_text import RichFormatText
+
+
+class Compositor(object):
+    """
+    Composes rendered controls on top of a base RichFormatText. The layer of every control (its RichFormatText,
+    version, position and size) is cached, so that only the rectangles where a layer changed are recomposed.
+    """
+
+    def __init__(self):
+        # the last composited layer of each control as (control, rft, version, x, y, width, height), in drawing order
+        self.__layers: list[tuple] = []
+
+    def compose(self, canvas: RichFormatText | None, base: RichFormatText, controls: list[Control],
+                ) -> tuple[RichFormatText, list[tuple[int, int, int, int]] | None, int]:
+        """
+        Composes the rendered controls onto the canvas.
+        :param canvas: The canvas composed last time, which is updated in place. If None, a new canvas is created.
+        :param base: What the canvas looks like without any control. It must be of the same size as the canvas.
+        :param controls: The rendered controls in drawing order.
+        :return: The canvas, the damaged rectangles (x, y, width, height) or None if the whole canvas is recomposed,
+                 and the number of cells recomposed.
+        """
+        layers = []
+        damaged = []
+        for control in controls:
+            rft = control.get_rft_object()
+            layers.append((control, rft, rft.version, control.x_coord, control.y_coord, *rft.get_size()))
+            damaged.append(control.pop_damaged_rects()) # always cleared, as the damage is only valid once
+
+        if canvas is None or [layer[0] for layer in layers] != [layer[0] for layer in self.__layers]:
+            # everything is recomposed when controls are added, removed or reordered
+            canvas = base.copy()
+            for _, rft, _, x, y, _, _ in layers:
+                canvas.copy_from(rft, y, x)
+            self.__layers = layers
+            width, height = canvas.get_size()
+            return canvas, None, width * height
+
+        rects = []
+        for layer, last_layer, control_rects in zip(layers, self.__layers, damaged):
+            if layer[1:] == last_layer[1:]:
+                continue
+            if layer[1] is last_layer[1] and layer[3:] == last_layer[3:] and control_rects is not None:
+                # the same RichFormatText at the same place, which the control has modified only within these rects
+                x, y = layer[3:5]
+                rects.extend((x + rect_x, y + rect_y, rect_width, rect_height)
+                             for rect_x, rect_y, rect_width, rect_height in control_rects)
+            else:
+                rects.extend((layer[3:], last_layer[3:]))
+        self.__layers = layers
+
+        rects = self.merge_rects(rects, *canvas.get_size())
+        for rect in rects:
+            canvas.copy_from(base, clip=rect, blend_background=False)
+            for _, rft, _, x, y, _, _ in layers:
+                canvas.copy_from(rft, y, x, clip=rect)
+        return canvas, rects, sum(width * height for _, _, width, height in rects)
+
+    @staticmethod
+    def merge_rects(rects: list[tuple[int, int, int, int]], width: int, height: int) -> list[tuple[int, int, int, int]]:
+        """
+        Clips rectangles (x, y, width, height) to the canvas and merges overlapping ones into their bounding boxes.
+        """
+        merged = []
+        for x, y, rect_width, rect_height in rects:
+            rect = max(x, 0), max(y, 0), min(x + rect_width, width), min(y + rect_height, height) # as (x1, y1, x2, y2)
+            if rect[0] >= rect[2] or rect[1] >= rect[3]:
+                continue
+            i = 0
+            while i < len(merged): # the merged rectangle may overlap rectangles that did not overlap before
+                other = merged[i]
+                if rect[0] < other[2] and other[0] < rect[2] and rect[1] < other[3] and other[1] < rect[3]:
+                    rect = min(rect[0], other[0]), min(rect[1], other[1]), max(rect[2], other[2]), max(rect[3], other[3])
+                    merged.pop(i)
+                    i = 0
+                else:
+                    i += 1
+            merged.append(rect)
+        return [(x1, y1, x2 - x1, y2 - y1) for x1, y1, x2, y2 in merged]
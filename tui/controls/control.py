@@ -18,6 +18,21 @@ class Control:
         # the base control class does not render anything
         pass
 
+    def is_dirty(self) -> bool:
+        """
+        Whether the control has to be rendered again because it has been modified since its last render().
+        The base class does not track modifications, so it is always dirty.
+        """
+        return True
+
+    def pop_damaged_rects(self) -> list[tuple[int, int, int, int]] | None:
+        """
+        Gets and forgets the rectangles (x, y, width, height) of the RichFormatText object of the control that have
+        changed since the last call, if it is still the same object. Meant to be used internally by the parent.
+        The base class always returns None, i.e. the whole control may have changed.
+        """
+        return None
+
     def get_rft_object(self) -> RichFormatText:
         """
         Gets the RichFormatText object that contains rendering information about the control.
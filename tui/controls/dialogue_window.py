@@ -1,6 +1,7 @@
 from tui.controls import Control
 from tui.controls.__border_tools import DoubleBorders
 from tui.controls.rich_format_text import RichFormatText
+from tui.controls.compositor import Compositor
 from tui.text_formats import ForegroundColours as FColours, BackgroundColours as BColours
 import time
 
@@ -15,24 +16,73 @@ class DialogueWindow(Control):
         self.title = title
         self.border_colour = kwargs.get('border_colour', FColours.DEFAULT)
 
+        self.__rendered_state: tuple | None = None # state of the window and its child layers at the last render
+        self.__rendered_version = 0 # version of the RichFormatText object at the last render
+        self.__blank_rft: RichFormatText | None = None # what the window looks like without controls and borders
+        self.__compositor = Compositor()
+        # rectangles changed since the last pop_damaged_rects(), None if the whole window may have changed
+        self.__damaged_rects: list[tuple[int, int, int, int]] | None = None
+
 
     def render(self):
         """
-        Renders the dialogue window.
+        Renders the dialogue window. Only dirty child controls are rendered again, and if the window itself has not
+        changed, only the rectangles where the child layers changed are recomposed.
         """
-        self._internal_rft = RichFormatText.create_by_size(self.width, self.height)
-        # always adjust width to be even
-        if (self.width % 2) != 0:
-            self.width += 1
+        if (self._internal_rft is None or self.__rendered_state is None
+                or self.__rendered_state[:4] != (self.width, self.height, self.title, self.border_colour)
+                or self._internal_rft.version != self.__rendered_version
+                or self.__blank_rft.get_size() != (self.width, self.height)):
+            # renders the whole window
+            self._internal_rft = None
+            self.__blank_rft = RichFormatText.create_by_size(self.width, self.height)
+            # always adjust width to be even
+            if (self.width % 2) != 0:
+                self.width += 1
 
         # draw controls
         # sort controls, like in Scene
         self.controls.sort(key=lambda c: (c.z_coord, c.y_coord, c.x_coord))
         # render and draw controls
         for control in self.controls:
-            control.render()
-            self._internal_rft.copy_from(control.get_rft_object(), control.y_coord, control.x_coord)
+            if control.is_dirty():
+                control.render()
+        self._internal_rft, rects, _ = self.__compositor.compose(self._internal_rft, self.__blank_rft, self.controls)
+
+        if rects is None:
+            self.__draw_borders(range(self.height))
+            self.__damaged_rects = None
+        else:
+            lines = set()
+            for x, y, width, height in list(rects):
+                lines.update(range(y, y + height))
+                # the formats of the top and the bottom border depend on their first cell
+                if x == 0 and y == 0:
+                    rects.append((0, 0, self.width, 1))
+                if x == 0 and y + height == self.height:
+                    rects.append((0, self.height - 1, self.width, 1))
+            self.__draw_borders(sorted(lines))
+            if self.__damaged_rects is not None:
+                self.__damaged_rects.extend(rects)
 
+        self.__rendered_state = self.__get_state()
+        self.__rendered_version = self._internal_rft.version
+
+    def pop_damaged_rects(self) -> list[tuple[int, int, int, int]] | None:
+        """
+        Gets and forgets the rectangles (x, y, width, height) of the dialogue window that have changed since the
+        last call. Returns None if the whole dialogue window may have changed.
+        """
+        rects = self.__damaged_rects
+        if self._internal_rft is not None and self._internal_rft.version != self.__rendered_version:
+            rects = None # modified by something other than render()
+        self.__damaged_rects = []
+        return rects
+
+    def __draw_borders(self, lines):
+        """
+        Draws the title and the borders onto the given lines, on top of the child controls.
+        """
         # handles title
         max_title_len = self.width - 6
         temp_title = self.title
@@ -43,22 +93,43 @@ class DialogueWindow(Control):
                 temp_title += ' '
             temp_title = f'[{temp_title:^{len(temp_title)}}]'
 
-        self._internal_rft[0] = (DoubleBorders.UPPER_LEFT + DoubleBorders.UPPER_LOWER * ((self.width - 2 - len(temp_title)) // 2)
-                     + temp_title
-                     + DoubleBorders.UPPER_LOWER * ((self.width - 2 - len(temp_title)) // 2) + DoubleBorders.UPPER_RIGHT)
+        if 0 in lines:
+            self._internal_rft[0] = (DoubleBorders.UPPER_LEFT + DoubleBorders.UPPER_LOWER * ((self.width - 2 - len(temp_title)) // 2)
+                         + temp_title
+                         + DoubleBorders.UPPER_LOWER * ((self.width - 2 - len(temp_title)) // 2) + DoubleBorders.UPPER_RIGHT)
 
         # draw borders
-        for i in range(1, self.height-1):
+        middle_lines = [i for i in lines if 1 <= i < self.height - 1]
+        for i in middle_lines:
             self._internal_rft[i] = DoubleBorders.LEFT_RIGHT + self._internal_rft[i][1:-1] + DoubleBorders.LEFT_RIGHT
-        self._internal_rft[-1] = DoubleBorders.LOWER_LEFT + DoubleBorders.UPPER_LOWER * (self.width - 2) + DoubleBorders.LOWER_RIGHT
+        if self.height - 1 in lines:
+            self._internal_rft[-1] = DoubleBorders.LOWER_LEFT + DoubleBorders.UPPER_LOWER * (self.width - 2) + DoubleBorders.LOWER_RIGHT
 
         # applies formatting for borders
-        (self._internal_rft.set_format(0, slice(self.width), foreground=self.border_colour, background=BColours.DEFAULT)
-         .set_format(-1, slice(self.width), foreground=self.border_colour))
-        for i in range(1, self.height-1):
+        if 0 in lines:
+            self._internal_rft.set_format(0, slice(self.width), foreground=self.border_colour, background=BColours.DEFAULT)
+        if self.height - 1 in lines:
+            self._internal_rft.set_format(-1, slice(self.width), foreground=self.border_colour)
+        for i in middle_lines:
             (self._internal_rft.set_format(i, slice(1), foreground=self.border_colour, background=BColours.DEFAULT)
              .set_format(i, slice(-1, self.width), foreground=self.border_colour, background=BColours.DEFAULT))
 
+    def is_dirty(self) -> bool:
+        """
+        Whether the dialogue window has to be rendered again, i.e. its size, title, border colour, or any of its
+        child controls changed since its last render().
+        """
+        return (self.__rendered_state is None or any(control.is_dirty() for control in self.controls)
+                or self.__get_state() != self.__rendered_state)
+
+    def __get_state(self) -> tuple:
+        """
+        Gets everything that the rendered dialogue window depends on, except the contents of dirty child controls.
+        """
+        layers = tuple((control, control.get_rft_object(), control.get_rft_object().version if control.get_rft_object() is not None else None,
+                        control.x_coord, control.y_coord, control.z_coord) for control in self.controls)
+        return self.width, self.height, self.title, self.border_colour, layers
+
     def get_control(self, control_id: str) -> Control:
         """
         Gets the control with the specified control_id.
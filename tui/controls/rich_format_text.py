@@ -1,4 +1,7 @@
+import random
+from collections import OrderedDict
 from tui.text_formats import ForegroundColours as FColours, BackgroundColours as BColours, TextFormats as TFormats
+from tui.controls.__rft_backends import BACKENDS
 
 
 class RichFormatText(object):
@@ -6,39 +9,64 @@ class RichFormatText(object):
     A class for providing support for multi-line coloured text and other effects.
     """
 
-    def __init__(self, text: str):
+    # name of the storage backend used when none is specified at construction, see __rft_backends.BACKENDS
+    default_backend = 'styles'
+
+    # maximum number of rendered lines kept in the LRU cache shared by all objects, 0 to disable it
+    shared_cache_size = 0
+    shared_cache_hits = 0
+    shared_cache_misses = 0
+    __shared_cache: OrderedDict = OrderedDict() # (backend, line key) -> rendered line
+
+    def __init__(self, text: str, backend: str | None = None):
         """
         Creates a RichFormatText object. Line breaks are automatically converted to '\n', then handled automatically.
+        :param text: The initial text.
+        :param backend: The storage backend, 'styles' (default, interned style ids), 'list' (format tuples), 'array'
+                        (compact planes) or 'spans' (run-length encoded).
         """
-        # constants
-        self.__DEFAULT_FORMAT = (FColours.DEFAULT, BColours.TRANSPARENT, TFormats.DEFAULT)
+        self.backend = backend if backend is not None else RichFormatText.default_backend
+        if self.backend not in BACKENDS:
+            raise ValueError(f'Unknown RichFormatText backend \'{self.backend}\'.')
+
+        self.__storage = BACKENDS[self.backend](text.replace('\r\n', '\n').split('\n'))
+        self.__version = 0 # incremented on every modification
 
-        self.__lines: list[str] = text.replace('\r\n', '\n').split('\n')
-        self.__format_options: list[list[tuple[int, int, int]]] = []
-        self.clear_formats()
+        # rendered lines of this object, None if the line has been modified since it was last rendered
+        self.__rendered_lines: list[str | None] = [None] * len(self.__storage)
+        self.render_cache_hits = 0
+        self.render_cache_misses = 0
 
     @classmethod
-    def create_by_size(cls, width: int, height: int, char: str = ' ') -> 'RichFormatText':
+    def create_by_size(cls, width: int, height: int, char: str = ' ', backend: str | None = None) -> 'RichFormatText':
         """
         Creates a RichFormatText object with a blank canvas.
         """
-        return RichFormatText('\n'.join([char * width for _ in range(height)]))
+        return RichFormatText('\n'.join([char * width for _ in range(height)]), backend)
 
     def __len__(self) -> int:
-        return len(self.__lines)
+        return len(self.__storage)
+
+    @property
+    def version(self) -> int:
+        """
+        A counter incremented every time the text or the formats are modified.
+        """
+        return self.__version
+
+    def get_size(self) -> tuple[int, int]:
+        """
+        Gets the size as (length of the longest line, number of lines).
+        """
+        return max((self.__storage.line_length(i) for i in range(len(self))), default=0), len(self)
 
     def __getitem__(self, index: int) -> str:
-        return self.__lines[index]
+        return self.__storage.get_line(index)
 
     def __setitem__(self, index: int, item: str):
-        self.__lines[index] = item
-
-        # adjusts formatting options
-        len_diff = len(item) - len(self.__format_options[index])
-        if len_diff > 0: # longer than original text
-            self.__format_options[index].extend(self.__DEFAULT_FORMAT for _ in range(len_diff + 1))
-        elif len_diff < 0: # shorter than original text
-            self.__format_options[index] = self.__format_options[index][:len_diff]
+        self.__storage.set_line(index, item)
+        self.__rendered_lines[index] = None
+        self.__version += 1
 
     def __str__(self) -> str:
         return '\n'.join(self.render())
@@ -47,8 +75,9 @@ class RichFormatText(object):
         """
         Appends a line to the end.
         """
-        self.__lines.append(text)
-        self.__format_options.append([self.__DEFAULT_FORMAT for _ in range(len(text))])
+        self.__storage.append_line(text)
+        self.__rendered_lines.append(None)
+        self.__version += 1
         return self
 
     def extend(self, lines: list[str]) -> 'RichFormatText':
@@ -61,10 +90,12 @@ class RichFormatText(object):
 
     def copy(self) -> 'RichFormatText':
         """
-        Returns a copy of the current RichFormatText object.
+        Returns a copy of the current RichFormatText object, with the same version and rendered lines.
         """
-        rft = RichFormatText('\n'.join(self.__lines))
-        rft.__format_options = [line.copy() for line in self.__format_options]
+        rft = RichFormatText('', self.backend)
+        rft.__storage = self.__storage.copy()
+        rft.__rendered_lines = self.__rendered_lines.copy()
+        rft.__version = self.__version # the rendered lines are valid for this version of the copy as well
         return rft
 
     def set_format(self, line: int, format_range: slice,
@@ -74,14 +105,9 @@ class RichFormatText(object):
         """
         Sets the format options for a given range of text.
         """
-
-        for i in range(*format_range.indices(len(self.__format_options[line]))):
-            # keep original format if not specified
-            foreground = self.__format_options[line][i][0] if foreground is None else foreground
-            background = self.__format_options[line][i][1] if background is None else background
-            text_format = self.__format_options[line][i][2] if text_format is None else text_format
-
-            self.__format_options[line][i] = (foreground, background, text_format)
+        self.__storage.set_formats(line, format_range, foreground, background, text_format)
+        self.__rendered_lines[line] = None
+        self.__version += 1
         return self
 
     def set_random_colours_to_all(self,
@@ -89,51 +115,58 @@ class RichFormatText(object):
                                   except_foreground: list[int] | None = None,
                                   random_background: bool = False,
                                   except_background: list[int] | None = None,
-                                  avoid_colour_conflicts: bool = True) -> 'RichFormatText':
+                                  avoid_colour_conflicts: bool = True,
+                                  rng: random.Random | None = None) -> 'RichFormatText':
         """
         Sets random colours to all text.
+        :param rng: The random number generator of the colours. Default is None, which uses the random module.
         """
         except_foreground = except_foreground if except_foreground is not None else []
         except_background = except_background if except_background is not None else []
 
-        for i in range(len(self.__lines)):
-            for j in range(len(self.__lines[i])):
+        for i in range(len(self)):
+            formats = self.__storage.get_formats(i, slice(None))
+            for j in range(len(self[i])):
                 avoid_conflict = avoid_colour_conflicts
-                original_fg, original_bg, original_tf = self.__format_options[i][j]
+                original_fg, original_bg, original_tf = formats[j]
                 if original_bg == original_bg: # disable conflict avoidance if the original colours are already the same
                     avoid_conflict = False
 
                 new_fg, new_bg = original_fg, original_bg
                 while True and random_foreground:
-                    new_fg = FColours.random()
+                    new_fg = FColours.random(rng)
                     if new_fg not in except_foreground:
                         break
 
                 while True and random_background:
-                    new_bg = BColours.random()
+                    new_bg = BColours.random(rng)
                     if avoid_conflict and new_bg != new_fg and new_bg not in except_foreground:
                         break
 
-                self.__format_options[i][j] = (new_fg, new_bg, original_tf)
+                formats[j] = (new_fg, new_bg, original_tf)
+            self.__storage.set_line_formats(i, formats)
+        self.__rendered_lines = [None] * len(self)
+        self.__version += 1
         return self
 
     def clear_formats(self) -> 'RichFormatText':
         """
         Resets all format options to default.
         """
-        self.__format_options = []
-        for line in self.__lines:
-            self.__format_options.append([self.__DEFAULT_FORMAT for _ in range(len(line))])
+        self.__storage.clear_formats()
+        self.__rendered_lines = [None] * len(self)
+        self.__version += 1
         return self
 
     def get_format(self, line: int, get_range: slice) -> list[tuple[int, int, int]]:
         """
         Gets the formatting options of a specific line in a specific range.
         """
-        return self.__format_options[line][get_range]
+        return self.__storage.get_formats(line, get_range)
 
     def copy_from(self, other: 'RichFormatText', target_line: int = 0, target_index: int = 0,
-                  copy_text = True, copy_formats = True) -> 'RichFormatText':
+                  copy_text = True, copy_formats = True,
+                  clip: tuple[int, int, int, int] | None = None, blend_background: bool = True) -> 'RichFormatText':
         """
         Copies the text and/or formatting options from another RichFormatText object and paste onto the current one.
         This does not change the dimensions of the original RichFormatText, i.e., anything outside the original
@@ -143,43 +176,84 @@ class RichFormatText(object):
         :param target_index: The horizontal index to start pasting.
         :param copy_text: Whether to copy text from the other RichFormatText.
         :param copy_formats: Whether to copy formatting options from the other RichFormatText.
+        :param clip: Only paste within this rectangle (x, y, width, height) of the current RichFormatText.
+        :param blend_background: Whether transparent backgrounds keep the backgrounds underneath. If False,
+                                 transparent backgrounds are copied as is.
         """
         if not copy_text and not copy_formats:
             return self
-        if target_line >= len(self.__lines):
+        if target_line >= len(self):
             return self
 
-        for y in range(max(0, target_line), min(len(self), target_line + len(other))):
-            r = range(max(0, target_index), min(len(self[y]), target_index + len(other[y - target_line])))
-            if len(r) == 0:
+        lines = range(max(0, target_line), min(len(self), target_line + len(other)))
+        start, stop = max(0, target_index), None
+        if clip is not None:
+            lines = range(max(lines.start, clip[1]), min(lines.stop, clip[1] + clip[3]))
+            start, stop = max(start, clip[0]), clip[0] + clip[2]
+
+        # the rectangle is handed to the storage at once, as rows that are each a single bulk copy
+        storage, other_storage, rendered_lines = self.__storage, other.__storage, self.__rendered_lines
+        rows = []
+        for y in lines:
+            row_stop = min(storage.line_length(y), target_index + other_storage.line_length(y - target_line))
+            if stop is not None and stop < row_stop:
+                row_stop = stop
+            if row_stop <= start:
                 continue
-            start_index, end_index = r.start, r.stop
-            if copy_text:
-                self[y] = self[y][:start_index] + other[y - target_line][start_index - target_index:end_index - target_index] + self[y][end_index:]
-            if copy_formats:
-                for x in r:
-                    fg, bg, tf = other.__format_options[y - target_line][x - target_index]
-                    if bg == BColours.TRANSPARENT: # handle transparent background
-                        bg = self.__format_options[y][x][1]
-                    self.set_format(y, slice(x, x + 1), fg, bg, tf)
+            rows.append((y - target_line, start - target_index, y, start, row_stop - start))
+            rendered_lines[y] = None
+        if len(rows) > 0:
+            storage.blit_rows(other_storage, rows, copy_text, copy_formats, blend_background)
+            self.__version += 1
 
         return self
 
     def render(self) -> list[str]:
         """
         Renders texts with ANSI control codes into list[str].
+        Lines are rendered again only if they have been modified since the last call, see render_cache_hits and
+        render_cache_misses. Lines missing from this cache are looked up in the shared cache if it is enabled by
+        shared_cache_size.
+        """
+        rendered_lines = self.__rendered_lines
+        for i, rendered_line in enumerate(rendered_lines):
+            if rendered_line is not None:
+                self.render_cache_hits += 1
+                continue
+            self.render_cache_misses += 1
+            rendered_lines[i] = self.__render_line(i)
+        return rendered_lines.copy()
+
+    def __render_line(self, line: int) -> str:
+        if RichFormatText.shared_cache_size <= 0:
+            return self.__storage.render_line(line)
+
+        cache = RichFormatText.__shared_cache
+        key = self.line_key(line)
+        rendered_line = cache.get(key)
+        if rendered_line is not None:
+            RichFormatText.shared_cache_hits += 1
+            cache.move_to_end(key)
+            return rendered_line
+
+        RichFormatText.shared_cache_misses += 1
+        rendered_line = cache[key] = self.__storage.render_line(line)
+        while len(cache) > RichFormatText.shared_cache_size:
+            cache.popitem(last=False)
+        return rendered_line
+
+    def line_key(self, line: int) -> tuple:
+        """
+        Gets a hashable key of everything a rendered line depends on, i.e. the backend, the text and the formats of its
+        characters. Lines with equal keys are rendered the same.
+        """
+        return self.backend, self.__storage.line_key(line)
+
+    @classmethod
+    def clear_shared_cache(cls):
+        """
+        Empties the shared cache of rendered lines and resets its counters.
         """
-        output = []
-        for i in range(len(self.__lines)):
-            output_line = ''
-            for index, (char, option) in enumerate(list(zip(self.__lines[i], self.__format_options[i]))):
-                fg, bg, tf = option
-                if bg == BColours.TRANSPARENT:
-                    bg = BColours.DEFAULT
-                if index > 0 and self.__format_options[i][index - 1] == option:
-                    output_line += char
-                else:
-                    output_line += f'\033[{tf};{fg};{bg}m{char}'
-            output_line += '\033[0;39;49m' # ANSI code for resetting formats to default
-            output.append(output_line)
-        return output
+        RichFormatText.__shared_cache.clear()
+        RichFormatText.shared_cache_hits = 0
+        RichFormatText.shared_cache_misses = 0
@@ -14,6 +14,7 @@ class TxtLabel(Control):
         super().__init__(control_name, width, height, x, y, z)
 
         self.__is_content_modified = True
+        self.__rendered_state: tuple | None = None # (width, height, formatted text, its version) of the last render
 
         self.__padding_left = kwargs.get('padding_left', 0)
         self.__padding_right = kwargs.get('padding_right', 0)
@@ -149,6 +150,17 @@ class TxtLabel(Control):
         # apply original formats
         self.__formatted_text.copy_from(old_formats, 0, 0, copy_text=False)
 
+    def is_dirty(self) -> bool:
+        """
+        Whether the label has to be rendered again, i.e. its contents, size, or formatted text changed since its last
+        render().
+        """
+        if self.__is_content_modified or self.__rendered_state is None:
+            return True
+        width, height, formatted_text, version = self.__rendered_state
+        return (width != self.width or height != self.height
+                or formatted_text is not self.__formatted_text or version != self.__formatted_text.version)
+
     def render(self):
         self.__process_text()
         self._internal_rft = RichFormatText.create_by_size(self.width, self.height)
@@ -170,3 +182,6 @@ class TxtLabel(Control):
             for i in range(1, self.height - 1):
                 (self._internal_rft.set_format(i, slice(0, 1), self.border_colour)
                  .set_format(i, slice(self.width - 1, self.width), self.border_colour))
+
+        self.__is_content_modified = False
+        self.__rendered_state = (self.width, self.height, self.__formatted_text, self.__formatted_text.version)
@@ -0,0 +1,140 @@
+"""
+Contains the scheduler that paces the frames of animations against wall-clock deadlines.
+"""
+
+import asyncio
+import time
+from typing import AsyncIterator, Iterable, Iterator
+
+
+class FrameScheduler(object):
+    """
+    Paces the frames of animations. Frame k of an animation is due k * seconds_per_frame after the animation starts,
+    no matter how long rendering takes. Frames are dropped (or coalesced) when rendering overruns, or when they are
+    due faster than the target FPS, but the last frame of an animation is always presented.
+    """
+
+    # a frame later than this is treated as a pause rather than an overrun, e.g. an input or a nested animation,
+    # so the timeline restarts from now instead of dropping every frame that was due meanwhile
+    __MAX_LAG = 0.25
+
+    default: 'FrameScheduler' # the scheduler used by the animations of Screen and of the scenes, see below
+
+    def __init__(self, target_fps: float | None = None):
+        """
+        Creates a FrameScheduler.
+        :param target_fps: The maximum number of frames presented per second. If None, every frame that is on time
+                           is presented.
+        """
+        self.target_fps = target_fps
+
+        # statistics of all animations
+        self.frames_presented = 0
+        self.frames_dropped = 0
+        self.deadlines_missed = 0 # frames that were still being rendered when the next frame was due
+        self.seconds_presenting = 0.0
+
+    @property
+    def achieved_fps(self) -> float:
+        """
+        The number of frames presented per second of animation.
+        """
+        return self.frames_presented / self.seconds_presenting if self.seconds_presenting > 0 else 0.0
+
+    def reset_stats(self):
+        """
+        Resets the statistics.
+        """
+        self.frames_presented = 0
+        self.frames_dropped = 0
+        self.deadlines_missed = 0
+        self.seconds_presenting = 0.0
+
+    def pace(self, frames: Iterable, seconds_per_frame: float, coalesce: callable = None,
+             hold: float = 0.0) -> Iterator:
+        """
+        Yields the frames of an animation on their deadlines, sleeping as needed. The caller presents (e.g. renders)
+        each yielded frame before asking for the next one. Frames are taken from the iterable lazily.
+        :param frames: The frames of the animation, e.g. positions of a control or rendered frames of a transition.
+        :param seconds_per_frame: The time between the deadlines of two consecutive frames.
+        :param coalesce: The function that merges a dropped frame into the next frame, taking both and returning the
+                         frame to present. If None, dropped frames are discarded.
+        :param hold: The time from the deadline of the last frame until the animation ends, e.g. seconds_per_frame to
+                     show the last frame as long as the others. The time taken to present it is included.
+        """
+        for item in self.__schedule(frames, seconds_per_frame, coalesce, hold):
+            if isinstance(item, _Wait):
+                time.sleep(item.seconds)
+            else:
+                yield item
+
+    async def pace_async(self, frames: Iterable, seconds_per_frame: float, coalesce: callable = None,
+                         hold: float = 0.0) -> AsyncIterator:
+        """
+        The same as pace(), but waits with asyncio.sleep(), so that other tasks run while waiting for a deadline,
+        e.g. async for x in scheduler.pace_async(...).
+        """
+        for item in self.__schedule(frames, seconds_per_frame, coalesce, hold):
+            if isinstance(item, _Wait):
+                await asyncio.sleep(item.seconds)
+            else:
+                yield item
+
+    def __schedule(self, frames: Iterable, seconds_per_frame: float, coalesce: callable, hold: float) -> Iterator:
+        """
+        Yields a _Wait before every frame to present, then the frame. The caller waits for as long as told, so that
+        pace() and pace_async() share the schedule.
+        """
+        interval = max(seconds_per_frame, 1 / self.target_fps if self.target_fps else 0)
+        start = time.perf_counter()
+        iterator = iter(frames)
+        frame = next(iterator, self)
+        index = 0
+        last_presented_deadline = last_presented_at = None
+        while frame is not self: # the scheduler itself marks the end of the frames
+            deadline = start + index * seconds_per_frame
+            lag = time.perf_counter() - deadline
+            if lag > self.__MAX_LAG:
+                start += lag # restarts the timeline
+                deadline += lag
+                last_presented_at = None # the pause does not count as animation
+
+            if ((seconds_per_frame > 0 and time.perf_counter() > deadline + seconds_per_frame) # the next one is due
+                    or (last_presented_deadline is not None and deadline - last_presented_deadline < interval - 1e-9)):
+                next_frame = next(iterator, self)
+                if next_frame is not self:
+                    frame = coalesce(frame, next_frame) if coalesce is not None else next_frame
+                    index += 1
+                    self.frames_dropped += 1
+                    continue
+                # the last frame is presented anyway
+
+            yield _Wait(max(0.0, deadline - time.perf_counter()))
+            presented_at = time.perf_counter()
+            if last_presented_at is not None:
+                self.seconds_presenting += presented_at - last_presented_at
+            yield frame
+            if time.perf_counter() > deadline + interval:
+                self.deadlines_missed += 1
+            self.frames_presented += 1
+            last_presented_deadline, last_presented_at = deadline, presented_at
+
+            frame = next(iterator, self)
+            index += 1
+
+        if last_presented_at is not None: # the last frame is shown for at least one interval
+            self.seconds_presenting += max(time.perf_counter() - last_presented_at, interval)
+        if last_presented_deadline is not None and hold > 0:
+            yield _Wait(max(0.0, last_presented_deadline + hold - time.perf_counter()))
+
+
+class _Wait(object):
+    """
+    Tells the caller of FrameScheduler.__schedule() to wait before presenting the next frame.
+    """
+
+    def __init__(self, seconds: float):
+        self.seconds = seconds
+
+
+FrameScheduler.default = FrameScheduler()
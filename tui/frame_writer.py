@@ -0,0 +1,92 @@
+"""
+Contains the writer that pushes whole frames to the terminal.
+"""
+
+import io
+import os
+import sys
+
+
+class FrameWriter(object):
+    """
+    Assembles a whole frame in a reusable buffer and writes it to the terminal with a single os.write().
+    """
+
+    # terminals supporting synchronized updates hold the display until the end of the frame, which avoids tearing
+    SYNC_UPDATE_BEGIN = b'\033[?2026h'
+    SYNC_UPDATE_END = b'\033[?2026l'
+
+    def __init__(self, fd: int | None = None, synchronized_update: bool = False, initial_capacity: int = 64 * 1024):
+        """
+        Creates a FrameWriter.
+        :param fd: The file descriptor to write to. If None, the file descriptor of sys.stdout is used at every frame.
+        :param synchronized_update: Whether to wrap every frame with the escape sequences of synchronized updates.
+        :param initial_capacity: The initial size of the buffer in bytes. The buffer grows when a frame is larger.
+        """
+        self.fd = fd
+        self.synchronized_update = synchronized_update
+
+        self.__buffer = bytearray(initial_capacity)
+        self.__length = 0
+
+    def begin_frame(self):
+        """
+        Starts a new frame. Anything written but not flushed is discarded.
+        """
+        self.__length = 0
+        if self.synchronized_update:
+            self.__append(self.SYNC_UPDATE_BEGIN)
+
+    def write(self, text: str):
+        """
+        Appends text to the current frame.
+        """
+        self.__append(text.encode())
+
+    def end_frame(self) -> int:
+        """
+        Writes the current frame to the terminal.
+        :return: The number of bytes written.
+        """
+        if self.synchronized_update:
+            self.__append(self.SYNC_UPDATE_END)
+
+        with memoryview(self.__buffer) as buffer_view, buffer_view[:self.__length] as frame:
+            self.present(frame)
+        return self.__length
+
+    def present(self, frame: memoryview):
+        """
+        Sends a whole frame to the terminal. Render targets other than the terminal override this method, see
+        tui.render_targets.
+        :param frame: The bytes of the frame, only valid during the call.
+        """
+        sys.stdout.flush() # keeps the order with anything printed before
+        fd = self.__get_fd()
+        if fd is None and hasattr(sys.stdout, 'buffer'):
+            sys.stdout.buffer.write(frame)
+            sys.stdout.buffer.flush()
+        elif fd is None: # e.g. sys.stdout is replaced by io.StringIO
+            sys.stdout.write(frame.tobytes().decode())
+            sys.stdout.flush()
+        else:
+            written = 0
+            while written < len(frame): # os.write() may write only part of a large frame
+                written += os.write(fd, frame[written:])
+
+    def __append(self, data: bytes):
+        end = self.__length + len(data)
+        if end > len(self.__buffer): # at least doubles the buffer
+            self.__buffer.extend(bytes(max(end - len(self.__buffer), len(self.__buffer))))
+        self.__buffer[self.__length:end] = data
+        self.__length = end
+
+    def __get_fd(self) -> int | None:
+        if self.fd is not None:
+            return self.fd
+        if os.name == 'nt': # the console requires sys.stdout to convert the encoding
+            return None
+        try:
+            return sys.stdout.fileno()
+        except (AttributeError, OSError, io.UnsupportedOperation):
+            return None
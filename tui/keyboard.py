@@ -0,0 +1,247 @@
+"""
+Contains the raw-mode keyboard reader, which decodes key presses into a queue of events on a background thread, so
+that the caller may keep rendering while waiting for input. Linux (termios) only.
+"""
+
+import codecs
+import os
+import queue
+import re
+import select
+import sys
+import threading
+
+try:
+    import termios
+    import tty
+except ImportError: # e.g. Windows
+    termios = tty = None
+
+
+class Keys:
+    """
+    The names of the keys that are not text. Text is reported as Keys.CHAR with the character.
+    """
+
+    BACKSPACE = 'backspace'
+    CHAR = 'char'
+    DELETE = 'delete'
+    DOWN = 'down'
+    END = 'end'
+    ENTER = 'enter'
+    ESCAPE = 'escape'
+    HOME = 'home'
+    LEFT = 'left'
+    RIGHT = 'right'
+    TAB = 'tab'
+    UP = 'up'
+
+
+class KeyEvent(object):
+    """
+    A key press.
+    """
+
+    def __init__(self, key: str, char: str = ''):
+        """
+        Creates a KeyEvent.
+        :param key: The name of the key, see Keys.
+        :param char: The character typed if key is Keys.CHAR, otherwise ''.
+        """
+        self.key = key
+        self.char = char
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, KeyEvent) and (self.key, self.char) == (other.key, other.char)
+
+    def __repr__(self) -> str:
+        return f'KeyEvent({self.key!r}, {self.char!r})' if self.char else f'KeyEvent({self.key!r})'
+
+
+class KeyDecoder(object):
+    """
+    Decodes the bytes read from a terminal in raw mode into key events. Bytes may be fed in any pieces, e.g. an escape
+    sequence split across two reads.
+    """
+
+    # final characters of CSI (ESC [) and SS3 (ESC O) sequences, and parameters of CSI ... ~ sequences
+    __FINALS = {'A': Keys.UP, 'B': Keys.DOWN, 'C': Keys.RIGHT, 'D': Keys.LEFT, 'H': Keys.HOME, 'F': Keys.END}
+    __TILDES = {'1': Keys.HOME, '3': Keys.DELETE, '4': Keys.END, '7': Keys.HOME, '8': Keys.END}
+    __CONTROLS = {'\r': Keys.ENTER, '\n': Keys.ENTER, '\t': Keys.TAB, '\x7f': Keys.BACKSPACE, '\x08': Keys.BACKSPACE}
+    __SEQUENCE = re.compile(r'\033(?:\[([0-9;]*)([\x40-\x7e])|O([\x40-\x7e]))')
+    __INCOMPLETE_SEQUENCE = re.compile(r'\033(?:\[[0-9;]*|O)?$')
+
+    def __init__(self):
+        self.__decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+        self.__pending = '' # the start of an escape sequence, waiting for the rest of it
+
+    @property
+    def pending(self) -> bool:
+        """
+        Whether the start of an escape sequence is waiting for the rest of it, see flush().
+        """
+        return self.__pending != ''
+
+    def feed(self, data: bytes) -> list[KeyEvent]:
+        """
+        Decodes bytes into key events. An incomplete escape sequence at the end is kept until the next call.
+        """
+        text = self.__pending + self.__decoder.decode(data)
+        self.__pending = ''
+        events = []
+        index = 0
+        while index < len(text):
+            char = text[index]
+            if char == '\033':
+                match = KeyDecoder.__SEQUENCE.match(text, index)
+                if match is None:
+                    if KeyDecoder.__INCOMPLETE_SEQUENCE.match(text, index):
+                        self.__pending = text[index:]
+                        break
+                    events.append(KeyEvent(Keys.ESCAPE)) # e.g. Esc followed by a character
+                    index += 1
+                    continue
+                index = match.end()
+                parameters, final, ss3_final = match.groups()
+                if ss3_final is not None:
+                    key = KeyDecoder.__FINALS.get(ss3_final)
+                elif final == '~':
+                    key = KeyDecoder.__TILDES.get(parameters.partition(';')[0])
+                else:
+                    key = KeyDecoder.__FINALS.get(final)
+                if key is not None: # other sequences, e.g. function keys, are ignored
+                    events.append(KeyEvent(key))
+            elif char in KeyDecoder.__CONTROLS:
+                events.append(KeyEvent(KeyDecoder.__CONTROLS[char]))
+                if char == '\r' and text.startswith('\n', index + 1): # CR LF is a single Enter
+                    index += 1
+                index += 1
+            else:
+                if char >= ' ': # other control characters are ignored
+                    events.append(KeyEvent(Keys.CHAR, char))
+                index += 1
+        return events
+
+    def flush(self) -> list[KeyEvent]:
+        """
+        Decodes what is waiting for the rest of an escape sequence as it is, i.e. a lone Esc press, as no more bytes
+        have arrived.
+        """
+        pending, self.__pending = self.__pending, ''
+        if pending == '':
+            return []
+        return [KeyEvent(Keys.ESCAPE)] + self.feed(pending[1:].encode())
+
+
+class KeyboardReader(object):
+    """
+    Reads the keyboard in raw mode on a background thread, and queues the key presses as KeyEvents. Echoing and line
+    buffering of the terminal are turned off while it is running; Ctrl+C still interrupts.
+    Use it in a with statement, or call start() and stop().
+    """
+
+    # how long the rest of an escape sequence is waited for before a lone Esc press is reported
+    escape_timeout = 0.03
+
+    def __init__(self, fd: int | None = None):
+        """
+        Creates a KeyboardReader.
+        :param fd: The file descriptor of the terminal. Default is None, which uses the file descriptor of sys.stdin.
+        """
+        self.fd = fd if fd is not None else sys.stdin.fileno()
+        self.events: queue.Queue[KeyEvent] = queue.Queue()
+        self.events_read = 0
+
+        self.__decoder = KeyDecoder()
+        self.__thread: threading.Thread | None = None
+        self.__stopping = threading.Event()
+        self.__original_attributes = None
+
+    @classmethod
+    def is_supported(cls, fd: int | None = None) -> bool:
+        """
+        Whether the keyboard can be read in raw mode, i.e. termios is available and the file descriptor is a terminal.
+        """
+        try:
+            return termios is not None and os.isatty(fd if fd is not None else sys.stdin.fileno())
+        except (OSError, ValueError): # e.g. sys.stdin has been replaced
+            return False
+
+    @property
+    def running(self) -> bool:
+        return self.__thread is not None
+
+    def start(self) -> 'KeyboardReader':
+        """
+        Puts the terminal into raw mode and starts reading it.
+        """
+        if self.__thread is not None:
+            return self
+        if not KeyboardReader.is_supported(self.fd):
+            raise ValueError('The keyboard cannot be read in raw mode, as termios is unavailable or the input is not '
+                             'a terminal.')
+        self.__original_attributes = termios.tcgetattr(self.fd)
+        tty.setcbreak(self.fd, termios.TCSANOW)
+        self.__stopping.clear()
+        self.__thread = threading.Thread(target=self.__read, name='KeyboardReader', daemon=True)
+        self.__thread.start()
+        return self
+
+    def stop(self):
+        """
+        Stops reading and restores the terminal. Events not taken yet stay in the queue.
+        """
+        if self.__thread is None:
+            return
+        self.__stopping.set()
+        self.__thread.join()
+        self.__thread = None
+        termios.tcsetattr(self.fd, termios.TCSADRAIN, self.__original_attributes)
+
+    def get(self, timeout: float | None = None) -> KeyEvent | None:
+        """
+        Takes the next key press, waiting for it.
+        :param timeout: The maximum number of seconds to wait. If None, waits until a key is pressed.
+        :return: The key press, or None if no key was pressed in time.
+        """
+        try:
+            return self.events.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def poll(self) -> KeyEvent | None:
+        """
+        Takes the next key press if there is one, without waiting.
+        """
+        try:
+            return self.events.get_nowait()
+        except queue.Empty:
+            return None
+
+    def discard_pending(self):
+        """
+        Discards the key presses not taken yet, e.g. keys pressed during an animation.
+        """
+        while self.poll() is not None:
+            pass
+
+    def __read(self):
+        while not self.__stopping.is_set():
+            timeout = KeyboardReader.escape_timeout if self.__decoder.pending else 0.05
+            ready, _, _ = select.select([self.fd], [], [], timeout)
+            if ready:
+                data = os.read(self.fd, 64)
+                if data == b'': # end of file
+                    break
+                events = self.__decoder.feed(data)
+            else:
+                events = self.__decoder.flush()
+            for event in events:
+                self.events_read += 1
+                self.events.put(event)
+
+    def __enter__(self) -> 'KeyboardReader':
+        return self.start()
+
+    def __exit__(self, *_):
+        self.stop()
@@ -0,0 +1,194 @@
+"""
+Contains render targets other than the terminal, which a Screen can write its frames to instead, e.g. for running
+scenes headless, inspecting what is on the screen, or recording a session.
+"""
+
+import json
+import re
+import time
+
+from tui.frame_writer import FrameWriter
+
+
+class NullTarget(FrameWriter):
+    """
+    A render target that discards every frame. Frames are still assembled, so that the cost of rendering is kept.
+    """
+
+    def present(self, frame: memoryview):
+        pass
+
+
+class CellBuffer(FrameWriter):
+    """
+    A render target that keeps the screen in memory as cells, by interpreting the escape sequences written by Screen:
+    cursor positioning, erasing, and cumulative SGR parameters. Styles are (attributes, foreground, background), the
+    same as the styles Screen compares frames with.
+    """
+
+    __BLANK_STYLE = ((), 39, 49)
+    __ESCAPE_SEQUENCE = re.compile(r'\033\[(\??)([0-9;]*)([A-Za-z])')
+
+    def __init__(self, width: int, height: int):
+        """
+        Creates a CellBuffer.
+        :param width: The number of columns. Characters beyond the last column are discarded.
+        :param height: The number of rows. A line break on the last row scrolls the buffer up.
+        """
+        super().__init__()
+        self.width = width
+        self.height = height
+
+        self.cells: list[list[tuple[str, tuple]]] = []
+        self.cursor = (0, 0) # (column, row)
+        self.style = CellBuffer.__BLANK_STYLE
+        self.frames_presented = 0
+        self.__erase_rows(0, height)
+
+    def get_text(self) -> list[str]:
+        """
+        Gets the text of every row, without trailing spaces.
+        """
+        return [''.join(char for char, _ in row).rstrip() for row in self.cells]
+
+    def get_cell(self, x: int, y: int) -> tuple[str, tuple]:
+        """
+        Gets the character and the style of a cell.
+        """
+        return self.cells[y][x]
+
+    def present(self, frame: memoryview):
+        self.feed(bytes(frame).decode())
+        self.frames_presented += 1
+
+    def feed(self, text: str):
+        """
+        Interprets text written to the terminal.
+        """
+        x, y = self.cursor
+        index = 0
+        while index < len(text):
+            char = text[index]
+            if char == '\033':
+                match = CellBuffer.__ESCAPE_SEQUENCE.match(text, index)
+                if match is None:
+                    raise ValueError(f'Unsupported escape sequence {text[index:index + 8]!r}.')
+                index = match.end()
+                private, parameters, command = match.groups()
+                if private: # e.g. synchronized updates
+                    continue
+                if command == 'm':
+                    self.style = self.__apply_sgr(self.style, parameters)
+                elif command == 'H':
+                    row, _, column = parameters.partition(';')
+                    x, y = int(column or 1) - 1, min(int(row or 1), self.height) - 1
+                elif command == 'J':
+                    if parameters == '2':
+                        self.__erase_rows(0, self.height)
+                    else:
+                        self.__erase_line(x, y)
+                        self.__erase_rows(y + 1, self.height)
+                elif command == 'K':
+                    self.__erase_line(x, y)
+                else:
+                    raise ValueError(f'Unsupported escape sequence {match.group()!r}.')
+                continue
+
+            if char == '\n':
+                x, y = 0, y + 1
+                if y == self.height: # scrolls up
+                    del self.cells[0]
+                    self.cells.append([(' ', CellBuffer.__BLANK_STYLE)] * self.width)
+                    y -= 1
+            elif char == '\r':
+                x = 0
+            elif char >= ' ':
+                if x < self.width:
+                    self.cells[y][x] = (char, self.style)
+                x += 1
+            index += 1
+        self.cursor = (x, y)
+
+    def __erase_rows(self, start: int, stop: int):
+        self.cells[start:stop] = [[(' ', CellBuffer.__BLANK_STYLE)] * self.width for _ in range(start, stop)]
+
+    def __erase_line(self, x: int, y: int):
+        self.cells[y][x:] = [(' ', CellBuffer.__BLANK_STYLE)] * max(0, self.width - x)
+
+    @staticmethod
+    def __apply_sgr(style: tuple, parameters: str) -> tuple:
+        # same rules as Screen.__apply_formats()
+        attributes, fg, bg = style
+        attributes = set(attributes)
+        for parameter in parameters.split(';'):
+            parameter = int(parameter) if parameter != '' else 0
+            if parameter == 0:
+                attributes, fg, bg = set(), 39, 49
+            elif 1 <= parameter <= 9:
+                attributes.add(parameter)
+            elif parameter == 22:
+                attributes -= {1, 2}
+            elif 23 <= parameter <= 29:
+                attributes.discard(parameter - 20)
+            elif 30 <= parameter <= 39 or 90 <= parameter <= 97:
+                fg = parameter
+            elif 40 <= parameter <= 49 or 100 <= parameter <= 107:
+                bg = parameter
+        return tuple(sorted(attributes)), fg, bg
+
+
+class FrameRecorder(FrameWriter):
+    """
+    A render target that records every frame with its timestamp as an asciicast v2 file, which can be replayed with
+    asciinema, and optionally passes frames on to another render target, e.g. the terminal.
+    It also keeps the cost of every frame: how long the Screen took to build it, and how long presenting it took.
+    """
+
+    def __init__(self, path: str | None, width: int, height: int, target: FrameWriter | None = None):
+        """
+        Creates a FrameRecorder.
+        :param path: The path of the asciicast file. If None, frames are not recorded, but their costs still are.
+        :param width: The width of the terminal in the recording.
+        :param height: The height of the terminal in the recording.
+        :param target: The render target frames are passed on to. If None, frames are not presented anywhere else.
+        """
+        super().__init__()
+        self.target = target
+
+        # (seconds since the start, seconds building the frame, seconds presenting the frame, bytes) of every frame
+        self.frame_stats: list[tuple[float, float, float, int]] = []
+
+        self.__file = open(path, 'w', encoding='utf-8') if path is not None else None
+        self.__start = time.perf_counter()
+        self.__frame_started_at = self.__start
+        if self.__file is not None:
+            self.__file.write(json.dumps({'version': 2, 'width': width, 'height': height,
+                                          'timestamp': int(time.time())}) + '\n')
+
+    def begin_frame(self):
+        self.__frame_started_at = time.perf_counter()
+        super().begin_frame()
+
+    def present(self, frame: memoryview):
+        presented_at = time.perf_counter()
+        if self.target is not None:
+            self.target.present(frame)
+        elapsed = presented_at - self.__start
+        self.frame_stats.append((elapsed, presented_at - self.__frame_started_at, time.perf_counter() - presented_at,
+                                 len(frame)))
+        if self.__file is not None:
+            self.__file.write(json.dumps([round(elapsed, 6), 'o', bytes(frame).decode()], ensure_ascii=False) + '\n')
+
+    def close(self):
+        """
+        Closes the asciicast file.
+        """
+        if self.__file is not None:
+            self.__file.close()
+            self.__file = None
+
+    def __enter__(self) -> 'FrameRecorder':
+        return self
+
+    def __exit__(self, *_):
+        self.close()
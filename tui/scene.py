@@ -1,5 +1,6 @@
 from tui.controls import Control
 from tui.controls import DialogueWindow
+from tui.controls.compositor import Compositor
 from tui.controls.rich_format_text import RichFormatText
 from tui.text_formats import BackgroundColours
 
@@ -21,6 +22,18 @@ class Scene:
         self.on_scene_update: callable = None
         self.exit_transition = exit_transition
 
+        # statistics of the last render() and of all renders
+        self.controls_rendered_last_frame = 0
+        self.cells_recomposed_last_frame = 0
+        self.controls_rendered_total = 0
+        self.cells_recomposed_total = 0
+        self.frames_rendered = 0
+
+        # the background without controls, and its state (background, background_rft, its version, width, height)
+        self.__base_rft: RichFormatText | None = None
+        self.__base_state: tuple | None = None
+        self.__compositor = Compositor()
+
     def register_scene_update_hook(self, func: callable):
         """
         Register a function to be called when the scene is updated.
@@ -50,16 +63,31 @@ class Scene:
 
     def render(self, suppress_hook: bool = False):
         """
-        Render the scene.
+        Render the scene. Only dirty controls are rendered again, and only the rectangles where the layers of the
+        controls changed are recomposed.
         """
-        self._internal_rft = RichFormatText.create_by_size(self.width, self.height, self.background)
-        self._internal_rft.copy_from(self.background_rft)
-
         # sort controls by z-index, lowest first, then by y-coordinate, and then by x-coordinate
         self.controls.sort(key=lambda c: (c.z_coord, c.y_coord, c.x_coord))
+
+        self.controls_rendered_last_frame = 0
         for control in self.controls:
-            control.render()
-            self._internal_rft.copy_from(control.get_rft_object(), control.y_coord, control.x_coord)
+            if control.is_dirty():
+                control.render()
+                self.controls_rendered_last_frame += 1
+
+        base_state = (self.background, self.background_rft, self.background_rft.version, self.width, self.height)
+        if self.__base_state != base_state:
+            self.__base_rft = RichFormatText.create_by_size(self.width, self.height, self.background)
+            self.__base_rft.copy_from(self.background_rft)
+            self.__base_state = base_state
+            self._internal_rft = None
+
+        self._internal_rft, _, self.cells_recomposed_last_frame = self.__compositor.compose(
+            self._internal_rft, self.__base_rft, self.controls)
+
+        self.controls_rendered_total += self.controls_rendered_last_frame
+        self.cells_recomposed_total += self.cells_recomposed_last_frame
+        self.frames_rendered += 1
 
         if self.on_scene_update is not None and not suppress_hook:
             self.on_scene_update(self)
@@ -1,13 +1,50 @@
 from tui import Scene
+from tui.controls.rich_format_text import RichFormatText
+from tui.text_formats import BackgroundColours as BColours
+from tui.frame_writer import FrameWriter
+from tui.frame_scheduler import FrameScheduler
 import tui.transitions as transitions
-import time
-import os
+from typing import Iterable
+
+
+class OutputModes:
+    """
+    Enum shortcuts for the ways a Screen outputs scene updates.
+    """
+    DIFF = 'diff' # only changed cells are written, with cursor movements
+    FULL_REDRAW = 'full' # the terminal is cleared and every line is reprinted
 
 
 class Screen(object):
-    def __init__(self, screen_width: int, screen_height: int):
+    # changed cells separated by no more than this many unchanged cells are written together,
+    # as a cursor movement costs about as many bytes
+    __DIFF_MERGE_GAP = 8
+
+    # terminal style after '\033[0m', and the cache of Screen.__apply_formats()
+    __RESET_STATE = ((), 39, 49)
+    __applied_formats: dict[tuple, tuple] = {}
+
+    # incremented whenever something other than a Screen writes to the terminal, see notify_external_output()
+    __external_output_count = 0
+
+    def __init__(self, screen_width: int, screen_height: int, output_mode: str = OutputModes.DIFF,
+                 frame_writer: FrameWriter | None = None, frame_scheduler: FrameScheduler | None = None):
         self.screen_width = screen_width
         self.screen_height = screen_height
+        self.output_mode = output_mode
+        self.frame_writer = frame_writer if frame_writer is not None else FrameWriter()
+        self.frame_scheduler = frame_scheduler if frame_scheduler is not None else FrameScheduler.default
+
+        # statistics of the bytes written to the terminal
+        self.bytes_written_last_frame = 0
+        self.bytes_written_total = 0
+        self.frames_written = 0
+
+        # cells of the last frame on the terminal as (text, styles) per line, None if unknown, and the line keys of the
+        # RichFormatText they were taken from, see RichFormatText.line_key()
+        self.__last_frame: list[tuple[str, list[tuple]]] | None = None
+        self.__last_line_keys: list[tuple] | None = None
+        self.__seen_external_output_count = Screen.__external_output_count
 
         self.__blank_scene = Scene(screen_width, screen_height)
         self.__current_scene = self.__blank_scene
@@ -18,23 +55,58 @@ class Screen(object):
     def transition_into_scene(self, new_scene: Scene, transition: callable = transitions.direct, time_per_frame: float = 0.1):
         """
         Transition into a new scene.
+        Frames are taken from the transition one at a time, and generating a frame overlaps the time per frame of
+        the previous one. Transitions may return lists of frames as well as generators.
+        """
+        frames = self._begin_transition(new_scene, transition)
+        # frames are paced by the scheduler, which may coalesce frames if generating or writing them overruns
+        for frame in self.frame_scheduler.pace(frames, time_per_frame, self._coalesce_frames):
+            self._present_transition_frame(frame)
+        self._end_transition(new_scene)
+
+    @property
+    def current_scene(self) -> Scene:
+        """
+        The scene currently shown, i.e. the scene of the last transition.
+        """
+        return self.__current_scene
+
+    def _begin_transition(self, new_scene: Scene, transition: callable) -> Iterable:
+        """
+        Moves the scene update hook to the new scene and gets the frames of the transition, which are generated
+        lazily. Used by transition_into_scene() and by tui.aio.AsyncScreen.
         """
         self.__current_scene.remove_scene_update_hook()
         new_scene.register_scene_update_hook(self.print_scene)
-        frames = None
         if self.__current_scene.exit_transition is not None:
             # overrides transition if exit_transition is specified
-            frames = self.__current_scene.exit_transition(self.__current_scene, new_scene)
+            return self.__current_scene.exit_transition(self.__current_scene, new_scene)
+        return transition(self.__current_scene, new_scene)
+
+    def _present_transition_frame(self, frame):
+        """
+        Writes a frame of a transition, given as a transitions.Frame or as a rendered string.
+        """
+        if isinstance(frame, transitions.Frame):
+            self.__write_rft(frame.rft, frame.changed_lines)
         else:
-            frames = transition(self.__current_scene, new_scene)
-        if len(frames) == 1:
-            time_per_frame = 0
-        for frame in frames:
-            time.sleep(time_per_frame)
-            self.clear_screen()
-            print(frame)
+            self.frame_writer.begin_frame()
+            self.frame_writer.write('\033[2J\033[H\n')
+            self.frame_writer.write(frame)
+            self.frame_writer.write('\n')
+            self.__end_frame()
+            self.__last_frame = None
+
+    def _end_transition(self, new_scene: Scene):
+        """
+        Makes the new scene the current scene after the last frame of its transition.
+        """
         self.__current_scene = new_scene
 
+        # the last frame of a transition shows the new scene, whatever was written to the terminal before it
+        self.__last_frame, self.__last_line_keys = self.__snapshot(new_scene.get_rft(suppress_hook=True))
+        self.__seen_external_output_count = Screen.__external_output_count
+
     def transition_into_blank_scene(self, transition: callable = transitions.direct, time_per_frame: float = 0.1):
         """
         Transition into a blank scene.
@@ -43,14 +115,11 @@ class Screen(object):
 
     def print_scene(self, scene: Scene = None):
         """
-        Prints the current scene.
+        Prints the current scene. In OutputModes.DIFF, only the cells changed since the last frame are written.
         """
         if scene is None:
             scene = self.__current_scene
-        self.clear_screen()
-        rendered = scene.get_rendered(suppress_hook=False)
-        for line in rendered:
-            print(line)
+        self.__write_rft(scene.get_rft(suppress_hook=False))
 
     def play_scene(self):
         """
@@ -59,9 +128,156 @@ class Screen(object):
         """
         return self.__current_scene.play()
 
+    def invalidate(self):
+        """
+        Forgets the last frame, so that the next scene update redraws the whole screen.
+        """
+        self.__last_frame = None
+
+    @staticmethod
+    def _coalesce_frames(dropped_frame, frame):
+        """
+        Merges a dropped frame of a transition into the next frame, so that the lines changed by both are written.
+        """
+        if isinstance(dropped_frame, transitions.Frame) and isinstance(frame, transitions.Frame):
+            if dropped_frame.changed_lines is None or frame.changed_lines is None:
+                return transitions.Frame(frame.rft)
+            return transitions.Frame(frame.rft, sorted({*dropped_frame.changed_lines, *frame.changed_lines}))
+        return frame
+
+    @classmethod
+    def notify_external_output(cls):
+        """
+        Tells all screens that something else has written to the terminal (e.g. a prompt and the user's input),
+        which may have scrolled it. The next scene update of every screen redraws the whole screen.
+        """
+        cls.__external_output_count += 1
+
     @staticmethod
     def clear_screen():
         """
         Clear the screen.
         """
-        print('\033[2J\033[H')
\ No newline at end of file
+        print('\033[2J\033[H')
+
+    def __write_rft(self, rft: RichFormatText, changed_lines: Iterable[int] | None = None):
+        """
+        Writes a frame given as a RichFormatText. In OutputModes.DIFF, only the cells changed since the last frame are
+        written, looking only at changed_lines if given.
+        """
+        if self.__seen_external_output_count != Screen.__external_output_count:
+            self.__seen_external_output_count = Screen.__external_output_count
+            self.__last_frame = None # the terminal may have scrolled
+
+        self.frame_writer.begin_frame()
+        if self.output_mode == OutputModes.DIFF and self.__last_frame is not None and len(self.__last_frame) == len(rft):
+            frame, line_keys = list(self.__last_frame), list(self.__last_line_keys)
+            snapshot_lines = []
+            for y in range(len(rft)) if changed_lines is None else changed_lines:
+                line_key = rft.line_key(y)
+                if line_key != line_keys[y]: # lines rendered the same keep the cells of the last frame
+                    frame[y], line_keys[y] = self.__snapshot_line(rft, y), line_key
+                    snapshot_lines.append(y)
+            self.__write_diff(frame, snapshot_lines)
+        else:
+            self.frame_writer.write('\033[2J\033[H\n')
+            for line in rft.render():
+                self.frame_writer.write(line)
+                self.frame_writer.write('\n')
+            frame, line_keys = self.__snapshot(rft) if self.output_mode == OutputModes.DIFF else (None, None)
+        self.__end_frame()
+        self.__last_frame, self.__last_line_keys = frame, line_keys
+
+    @classmethod
+    def __snapshot(cls, rft: RichFormatText) -> tuple[list[tuple[str, list[tuple]]], list[tuple]]:
+        """
+        Gets the text and the effective terminal style of every character of the rendered RichFormatText, and the keys
+        of its lines.
+        """
+        return [cls.__snapshot_line(rft, y) for y in range(len(rft))], [rft.line_key(y) for y in range(len(rft))]
+
+    @classmethod
+    def __snapshot_line(cls, rft: RichFormatText, y: int) -> tuple[str, list[tuple]]:
+        """
+        Gets the text and the effective terminal style of every character of a rendered line.
+        """
+        text = rft[y]
+        styles = []
+        state, previous = cls.__RESET_STATE, None
+        for option in rft.get_format(y, slice(len(text))):
+            if option != previous: # an escape sequence is rendered only when the formats change
+                state = cls.__apply_formats(state, option)
+                previous = option
+            styles.append(state)
+        return text, styles
+
+    @classmethod
+    def __apply_formats(cls, state: tuple, option: tuple) -> tuple:
+        """
+        Applies the escape sequence of a format option to a terminal style (attributes, foreground, background).
+        SGR parameters are cumulative, e.g. bold does not cancel an underline set earlier on the same line.
+        """
+        key = (state, option)
+        if key not in cls.__applied_formats:
+            attributes, fg, bg = state
+            attributes = set(attributes)
+            option_fg, option_bg, tf = option
+            option_bg = BColours.DEFAULT if option_bg == BColours.TRANSPARENT else option_bg
+            for parameter in f'{tf};{option_fg};{option_bg}'.split(';'):
+                parameter = int(parameter) if parameter != '' else 0
+                if parameter == 0:
+                    attributes, fg, bg = set(), 39, 49
+                elif 1 <= parameter <= 9:
+                    attributes.add(parameter)
+                elif parameter == 22:
+                    attributes -= {1, 2}
+                elif 23 <= parameter <= 29:
+                    attributes.discard(parameter - 20)
+                elif 30 <= parameter <= 39 or 90 <= parameter <= 97:
+                    fg = parameter
+                elif 40 <= parameter <= 49 or 100 <= parameter <= 107:
+                    bg = parameter
+            cls.__applied_formats[key] = (tuple(sorted(attributes)), fg, bg)
+        return cls.__applied_formats[key]
+
+    def __write_diff(self, frame: list[tuple[str, list[tuple]]], lines: Iterable[int]):
+        """
+        Writes the output that turns the given lines of the last frame into the new frame: cursor movements followed
+        by changed cells. The cursor is left where a full redraw would leave it, and everything below the frame is
+        cleared.
+        """
+        output = []
+        for y in lines:
+            text, styles = frame[y]
+            last_text, last_styles = self.__last_frame[y]
+            if text == last_text and styles == last_styles:
+                continue
+
+            # find runs of changed cells
+            changed_runs: list[list[int]] = []
+            for x in range(len(text)):
+                if x < len(last_text) and text[x] == last_text[x] and styles[x] == last_styles[x]:
+                    continue
+                if len(changed_runs) > 0 and x - changed_runs[-1][1] <= self.__DIFF_MERGE_GAP:
+                    changed_runs[-1][1] = x + 1
+                else:
+                    changed_runs.append([x, x + 1])
+
+            # rows start from 2 as a full redraw prints a line break after clearing the screen
+            for start, stop in changed_runs:
+                output.append(f'\033[{y + 2};{start + 1}H')
+                previous = None
+                for x in range(start, stop):
+                    if styles[x] != previous:
+                        previous = attributes, fg, bg = styles[x]
+                        output.append(f'\033[{";".join(str(a) for a in (0, *attributes, fg, bg))}m')
+                    output.append(text[x])
+            if len(text) < len(last_text): # erases the rest of the old line
+                output.append(f'\033[0;39;49m\033[{y + 2};{len(text) + 1}H\033[K')
+        output.append(f'\033[0;39;49m\033[{len(frame) + 2};1H\033[J')
+        self.frame_writer.write(''.join(output))
+
+    def __end_frame(self):
+        self.bytes_written_last_frame = self.frame_writer.end_frame()
+        self.bytes_written_total += self.bytes_written_last_frame
+        self.frames_written += 1
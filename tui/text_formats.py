@@ -15,12 +15,15 @@ class ForegroundColours:
     DEFAULT = 39
 
     @classmethod
-    def random(cls):
-        return random.randint(30, 37)
+    def random(cls, rng: 'random.Random | None' = None): # quoted, as random is this method in the class body
+        """
+        :param rng: The random number generator. Default is None, which uses the random module.
+        """
+        return (rng if rng is not None else random).randint(30, 37)
 
     @classmethod
-    def random_except(cls, *exceptions):
-        return random.choice([x for x in range(30, 38) if x not in exceptions])
+    def random_except(cls, *exceptions, rng: 'random.Random | None' = None):
+        return (rng if rng is not None else random).choice([x for x in range(30, 38) if x not in exceptions])
 
     @classmethod
     def override_default_as(cls, colour: int):
@@ -42,12 +45,15 @@ class BackgroundColours:
     DEFAULT = 49
 
     @classmethod
-    def random(cls):
-        return random.randint(40, 47)
+    def random(cls, rng: 'random.Random | None' = None):
+        """
+        :param rng: The random number generator. Default is None, which uses the random module.
+        """
+        return (rng if rng is not None else random).randint(40, 47)
 
     @classmethod
-    def random_except(cls, *exceptions):
-        return random.choice([x for x in range(40, 48) if x not in exceptions])
+    def random_except(cls, *exceptions, rng: 'random.Random | None' = None):
+        return (rng if rng is not None else random).choice([x for x in range(40, 48) if x not in exceptions])
 
     @classmethod
     def override_default_as(cls, colour: int):
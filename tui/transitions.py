@@ -4,9 +4,30 @@ Contains generators of frames of transitions between two scenes.
 
 from tui import Scene
 from tui.controls.rich_format_text import RichFormatText
+from typing import Iterable, Iterator
 import random
 
 
+class Frame(object):
+    """
+    A frame of a transition given as a RichFormatText object rather than a rendered string, so that the screen can
+    write only what has changed since the previous frame.
+    The RichFormatText object may be updated in place for the next frame, so it is only valid until then.
+    """
+
+    def __init__(self, rft: RichFormatText, changed_lines: Iterable[int] | None = None):
+        """
+        Creates a Frame.
+        :param rft: The contents of the frame.
+        :param changed_lines: The lines changed since the previous frame. If None, any line may have changed.
+        """
+        self.rft = rft
+        self.changed_lines = changed_lines
+
+    def __str__(self) -> str:
+        return '\n'.join(self.rft.render())
+
+
 def __ensure_same_size(from_scene: Scene, to_scene: Scene):
     if from_scene.width != to_scene.width or from_scene.height != to_scene.height:
         raise ValueError('Scenes must be of the same size.')
@@ -17,195 +38,181 @@ def __get_rendered_tuple(s1: Scene, s2: Scene) -> tuple[list[str], list[str]]:
 
 def __get_rendered_rft_tuple(s1: Scene, s2: Scene) -> tuple[RichFormatText, RichFormatText]:
     # New transitions should be implemented using this function instead of __get_rendered_tuple()
-    return s1.get_rft(suppress_hook=True), s2.get_rft(suppress_hook=True)
+    # copies are returned as scenes update their RichFormatText objects in place, while frames are generated lazily
+    return s1.get_rft(suppress_hook=True).copy(), s2.get_rft(suppress_hook=True).copy()
+
+def as_list(transition: callable) -> callable:
+    """
+    Adapts a transition generator function into a function that returns a list of all frames, as transitions did
+    before they became generators.
+    :param transition: The transition generator function
+    :return: The function that returns all frames of the transition in a list
+    """
+    def inner_as_list(from_scene: Scene, to_scene: Scene) -> list[str]:
+        return [str(frame) for frame in transition(from_scene, to_scene)]
 
-def wipe_up_to_down(from_scene: Scene, to_scene: Scene) -> list[str]:
+    return inner_as_list
+
+def wipe_up_to_down(from_scene: Scene, to_scene: Scene) -> Iterator[str]:
     """
     Generates frames of a transition where the old scene is wiped from up to down by the new scene.
     :param from_scene: The old scene
     :param to_scene: The new scene
-    :return: all frames of the transition
+    :return: a generator of the frames of the transition
     """
     from_scene_rendered, to_scene_rendered = __get_rendered_tuple(from_scene, to_scene)
-    frames = []
     __ensure_same_size(from_scene, to_scene)
     for i in range(from_scene.height):
-        frames.append('\n'.join(to_scene_rendered[:i + 1] + from_scene_rendered[i + 1:]))
-    return frames
+        yield '\n'.join(to_scene_rendered[:i + 1] + from_scene_rendered[i + 1:])
 
-def wipe_down_to_up(from_scene: Scene, to_scene: Scene) -> list[str]:
+def wipe_down_to_up(from_scene: Scene, to_scene: Scene) -> Iterator[str]:
     """
     Generates frames of a transition where the old scene is wiped from down to up by the new scene.
     :param from_scene: The old scene
     :param to_scene: The new scene
-    :return: all frames of the transition
+    :return: a generator of the frames of the transition
     """
     from_scene_rendered, to_scene_rendered = __get_rendered_tuple(from_scene, to_scene)
-    frames = []
     __ensure_same_size(from_scene, to_scene)
     for i in range(from_scene.height, -1, -1):
-        frames.append('\n'.join(from_scene_rendered[:i] + to_scene_rendered[i:]))
-    return frames
+        yield '\n'.join(from_scene_rendered[:i] + to_scene_rendered[i:])
 
-def wipe_left_to_right(from_scene: Scene, to_scene: Scene) -> list[str]:
+def wipe_left_to_right(from_scene: Scene, to_scene: Scene) -> Iterator[str]:
     """
     Generates frames of a transition where the old scene is wiped from left to right by the new scene.
     :param from_scene: The old scene
     :param to_scene: The new scene
-    :return: all frames of the transition
+    :return: a generator of the frames of the transition
     """
     from_scene_rft, to_scene_rft = __get_rendered_rft_tuple(from_scene, to_scene)
     __ensure_same_size(from_scene, to_scene)
 
-    rft_frames = []
-
     for i in range(0, from_scene.width, 4):
         i = from_scene.width if i + 4 > from_scene.width else i
         frame = RichFormatText.create_by_size(from_scene.width, from_scene.height)
         frame.copy_from(from_scene_rft, 0, 0)
         frame.copy_from(to_scene_rft, 0, i - from_scene.width)
-        rft_frames.append(frame)
+        yield '\n'.join(frame.render())
 
-    return ['\n'.join(rft.render()) for rft in rft_frames]
-
-def wipe_right_to_left(from_scene: Scene, to_scene: Scene) -> list[str]:
+def wipe_right_to_left(from_scene: Scene, to_scene: Scene) -> Iterator[str]:
     """
     Generates frames of a transition where the old scene is wiped from right to left by the new scene.
     :param from_scene: The old scene
     :param to_scene: The new scene
-    :return: all frames of the transition
+    :return: a generator of the frames of the transition
     """
     from_scene_rft, to_scene_rft = __get_rendered_rft_tuple(from_scene, to_scene)
     __ensure_same_size(from_scene, to_scene)
 
-    rft_frames = []
-
     for i in range(from_scene.width - 1, -1, -4):
         i = 0 if i - 4 < 0 else i
         frame = RichFormatText.create_by_size(from_scene.width, from_scene.height)
         frame.copy_from(from_scene_rft, 0, 0)
         frame.copy_from(to_scene_rft, 0, i)
-        rft_frames.append(frame)
-
-    return ['\n'.join(rft.render()) for rft in rft_frames]
+        yield '\n'.join(frame.render())
 
-def slide_from_top(from_scene: Scene, to_scene: Scene) -> list[str]:
+def slide_from_top(from_scene: Scene, to_scene: Scene) -> Iterator[str]:
     """
     Generates frames of a transition where the new scene slides from the top to the bottom.
     :param from_scene: The old scene
     :param to_scene: The new scene
-    :return: all frames of the transition
+    :return: a generator of the frames of the transition
     """
     from_scene_rendered, to_scene_rendered = __get_rendered_tuple(from_scene, to_scene)
-    frames = []
     __ensure_same_size(from_scene, to_scene)
     for i in range(to_scene.height):
-        frames.append('\n'.join(to_scene_rendered[-(i + 1):] + from_scene_rendered[:from_scene.height - i - 1]))
-    return frames
+        yield '\n'.join(to_scene_rendered[-(i + 1):] + from_scene_rendered[:from_scene.height - i - 1])
 
-def slide_from_bottom(from_scene: Scene, to_scene: Scene) -> list[str]:
+def slide_from_bottom(from_scene: Scene, to_scene: Scene) -> Iterator[str]:
     """
     Generates frames of a transition where the new scene slides from the bottom to the top.
     :param from_scene: The old scene
     :param to_scene: The new scene
-    :return: all frames of the transition
+    :return: a generator of the frames of the transition
     """
     from_scene_rendered, to_scene_rendered = __get_rendered_tuple(from_scene, to_scene)
-    frames = []
     __ensure_same_size(from_scene, to_scene)
     for i in range(to_scene.height):
-        frames.append('\n'.join(from_scene_rendered[i + 1:] + to_scene_rendered[:i + 1]))
-    return frames
+        yield '\n'.join(from_scene_rendered[i + 1:] + to_scene_rendered[:i + 1])
 
-def slide_from_left(from_scene: Scene, to_scene: Scene) -> list[str]:
+def slide_from_left(from_scene: Scene, to_scene: Scene) -> Iterator[str]:
     """
     Generates frames of a transition where the new scene slides from the left to the right.
     :param from_scene: The old scene
     :param to_scene: The new scene
-    :return: All frames of the transition
+    :return: A generator of the frames of the transition
     """
     from_scene_rft, to_scene_rft = __get_rendered_rft_tuple(from_scene, to_scene)
     __ensure_same_size(from_scene, to_scene)
 
-    rft_frames = []
-
     for i in range(1, to_scene.width, 4):
         i = to_scene.width if i + 4 > to_scene.width else i
         frame = RichFormatText.create_by_size(to_scene.width, to_scene.height)
         frame.copy_from(from_scene_rft, 0, i)
         frame.copy_from(to_scene_rft, 0, i - to_scene.width)
-        rft_frames.append(frame)
-
-    return ['\n'.join(rft.render()) for rft in rft_frames]
+        yield '\n'.join(frame.render())
 
-def slide_from_right(from_scene: Scene, to_scene: Scene) -> list[str]:
+def slide_from_right(from_scene: Scene, to_scene: Scene) -> Iterator[str]:
     """
     Generates frames of a transition where the new scene slides from the right to the left.
     :param from_scene: The old scene
     :param to_scene: The new scene
-    :return: All frames of the transition
+    :return: A generator of the frames of the transition
     """
     from_scene_rft, to_scene_rft = __get_rendered_rft_tuple(from_scene, to_scene)
     __ensure_same_size(from_scene, to_scene)
 
-    rft_frames = []
-
     for i in range(to_scene.width - 1, -1, -4):
         i = 0 if i - 4 < 0 else i
         frame = RichFormatText.create_by_size(to_scene.width, to_scene.height)
         frame.copy_from(from_scene_rft, 0, i - to_scene.width)
         frame.copy_from(to_scene_rft, 0, i)
-        rft_frames.append(frame)
-
-    return ['\n'.join(rft.render()) for rft in rft_frames]
+        yield '\n'.join(frame.render())
 
-def scatter(chars_per_frame: int = 100) -> callable:
+def scatter(chars_per_frame: int = 100, rng: random.Random | None = None) -> callable:
     """
     Constructs a scatter transition generator.
     :param chars_per_frame: Number of characters to scatter per frame.
+    :param rng: The random number generator of the order of the characters. Default is None, which uses the random
+                module.
     :return: The constructed scatter transition generator.
     """
 
-    def inner_scatter(from_scene: Scene, to_scene: Scene) -> list[str]:
-        from_scene_rft, to_scene_rft = __get_rendered_rft_tuple(from_scene, to_scene)
+    def inner_scatter(from_scene: Scene, to_scene: Scene) -> Iterator[Frame]:
+        # the copy of the old scene is the working buffer, onto which the cells of the new scene are revealed in place
+        rft_frame, to_scene_rft = __get_rendered_rft_tuple(from_scene, to_scene)
         __ensure_same_size(from_scene, to_scene)
 
-        rft_frames = [from_scene_rft]
-
-        indices = set(range(to_scene.height * to_scene.width))
+        # the order in which the cells are revealed
+        indices = list(range(to_scene.height * to_scene.width))
+        (rng if rng is not None else random).shuffle(indices)
         for f in range(to_scene.height * to_scene.width // chars_per_frame + 1):
-            rft_frame = rft_frames[f].copy()
-
-            chosen_indices = random.sample(sorted(indices), min(chars_per_frame, len(indices)))
-            indices -= set(chosen_indices)
-            for i in chosen_indices:
+            changed_lines = set()
+            for i in indices[f * chars_per_frame:(f + 1) * chars_per_frame]:
                 x, y = i % to_scene.width, i // to_scene.width
-                rft_frame[y] = rft_frame[y][:x] + to_scene_rft[y][x] + rft_frame[y][x + 1:]
-                fg, bg, tf = to_scene_rft.get_format(y, slice(x, x + 1))[0]
-                rft_frame.set_format(y, slice(x, x + 1), fg, bg, tf)
-            rft_frames.append(rft_frame)
-
-        del rft_frames[0]
-        return ['\n'.join(rft.render()) for rft in rft_frames]
+                rft_frame.copy_from(to_scene_rft, clip=(x, y, 1, 1), blend_background=False)
+                changed_lines.add(y)
+            yield Frame(rft_frame, sorted(changed_lines))
 
     return inner_scatter
 
-def direct(_: Scene, to_scene: Scene) -> list[str]:
+def direct(_: Scene, to_scene: Scene) -> Iterator[str]:
     """
     Generates frames of a transition where the new scene is directly shown without any transition.
     :param _: The old scene (discarded)
     :param to_scene: The new scene
-    :return: all frames of the transition
+    :return: a generator of the frames of the transition
     """
-    return ['\n'.join(to_scene.get_rendered(suppress_hook=True))]
+    yield '\n'.join(to_scene.get_rendered(suppress_hook=True))
 
-def get_random(scatter_cpf: int = 100) -> callable:
+def get_all(scatter_cpf: int = 100, rng: random.Random | None = None) -> tuple[callable, ...]:
     """
-    Gets a random transition generator function.
-    :param scatter_cpf: Number of characters to scatter per frame if scatter transition is chosen.
+    Gets all transition generator functions that get_random() chooses from.
+    :param scatter_cpf: Number of characters to scatter per frame for the scatter transition.
+    :param rng: The random number generator of the scatter transition. Default is None, which uses the random module.
     """
-    return random.choice((
-        scatter(scatter_cpf),
+    return (
+        scatter(scatter_cpf, rng),
         wipe_up_to_down,
         wipe_down_to_up,
         wipe_left_to_right,
@@ -214,4 +221,13 @@ def get_random(scatter_cpf: int = 100) -> callable:
         slide_from_bottom,
         slide_from_left,
         slide_from_right,
-    ))
+    )
+
+def get_random(scatter_cpf: int = 100, rng: random.Random | None = None) -> callable:
+    """
+    Gets a random transition generator function.
+    :param scatter_cpf: Number of characters to scatter per frame if scatter transition is chosen.
+    :param rng: The random number generator choosing the transition, and of the scatter transition. Default is None,
+                which uses the random module.
+    """
+    return (rng if rng is not None else random).choice(get_all(scatter_cpf, rng))